@@ -2,67 +2,46 @@ from flask import Flask, jsonify, send_from_directory
 from flask_cors import CORS
 import json
 import os
-from met_scraper import scrape_met_hours, read_from_json
-import threading
-import time
+import sys
 from datetime import datetime
 
+# Add the project root to the Python path for the shared scraper helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrapers.met_visit import read_from_json
+from scrapers.registry import scrape_registry
+from scrapers.scheduler import ScrapeScheduler
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Global cache for MET data
-met_data_cache = None
-last_update = None
-is_updating = False
+# MET data is the shared 'met:visit' registry snapshot, read by every MET API process
 
 def update_met_cache():
-    """Update the MET data cache in background"""
-    global met_data_cache, last_update, is_updating
-    
-    if is_updating:
-        return
-    
-    is_updating = True
+    """Refresh the shared MET snapshot now; returns it, or None if the scrape failed"""
     try:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔄 Updating MET cache...")
-        met_data_cache = scrape_met_hours()
-        last_update = met_data_cache.get('scraped_at')
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ MET cache updated at {last_update}")
+        data = scrape_registry.refresh('met:visit')
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ MET cache updated at {data.get('scraped_at')}")
+        return data
     except Exception as e:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Error updating MET cache: {e}")
-        
-        # Try to load from file
-        cached = read_from_json()
-        if cached:
-            met_data_cache = cached
-            last_update = cached.get('scraped_at')
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📂 Loaded cached data")
-    finally:
-        is_updating = False
+        return None
 
 @app.route('/api/met-hours')
 def get_met_hours():
-    """API endpoint to get current MET hours (with live scraping)"""
+    """API endpoint to get current MET hours (shared snapshot, scraped only if no process has one)"""
     try:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📡 API Request: /api/met-hours")
-        
-        # Scrape fresh data
-        data = scrape_met_hours()
-        
-        # Update cache with new data
-        global met_data_cache, last_update
-        met_data_cache = data
-        last_update = data.get('scraped_at')
-        
-        return jsonify(data)
+        return jsonify(scrape_registry.get('met:visit'))
         
     except Exception as e:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ Live scraping failed: {e}")
         
-        # Fall back to cache
-        if met_data_cache:
+        # Fall back to the last snapshot, however old
+        cached = scrape_registry.peek('met:visit')
+        if cached:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📊 Returning cached data")
-            return jsonify(met_data_cache)
+            return jsonify(cached)
         
         # Fall back to file
         cached = read_from_json()
@@ -82,10 +61,7 @@ def get_cached_met_hours():
     try:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 📡 API Request: /api/met-hours/cached")
         
-        if met_data_cache:
-            return jsonify(met_data_cache)
-        
-        cached = read_from_json()
+        cached = scrape_registry.peek('met:visit') or read_from_json()
         if cached:
             return jsonify(cached)
         
@@ -100,11 +76,12 @@ def get_cached_met_hours():
 @app.route('/api/status')
 def get_status():
     """API status endpoint"""
+    cached = scrape_registry.peek('met:visit')
     return jsonify({
         'status': 'online',
         'service': 'MET Museum Scraper API',
-        'last_update': last_update,
-        'cache_available': met_data_cache is not None,
+        'last_update': cached.get('scraped_at') if cached else None,
+        'cache_available': cached is not None,
         'server_time': datetime.now().isoformat()
     })
 
@@ -115,13 +92,13 @@ def refresh_data():
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🔄 Manual refresh requested")
         
         # Update cache
-        update_met_cache()
+        data = update_met_cache()
         
-        if met_data_cache:
+        if data:
             return jsonify({
                 'status': 'success',
                 'message': 'Data refreshed successfully',
-                'last_update': last_update
+                'last_update': data.get('scraped_at')
             })
         else:
             return jsonify({
@@ -145,26 +122,18 @@ def serve_static(path):
     """Serve static files"""
     return send_from_directory('.', path)
 
-def background_updater(interval=1800):  # 30 minutes = 1800 seconds
-    """Background thread to update MET data periodically"""
-    while True:
-        update_met_cache()
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏰ Next update in {interval//60} minutes")
-        time.sleep(interval)
+# Refresh MET data every 30 minutes via the shared scrape scheduler
+met_scheduler = ScrapeScheduler('met_api_scheduler.lock')
+scrape_registry.schedule(met_scheduler, prefix='met:')
 
 if __name__ == '__main__':
     print("=" * 50)
     print("🏛️  MET Museum Web Scraper API")
     print("=" * 50)
     
-    # Initial cache update
-    print("[INFO] Performing initial cache update...")
-    update_met_cache()
-    
-    # Start background updater thread
+    # Start background updater thread (its first run fills the shared snapshot)
     print("[INFO] Starting background updater (30 minute intervals)...")
-    updater_thread = threading.Thread(target=background_updater, daemon=True)
-    updater_thread.start()
+    met_scheduler.start()
     
     # Server information
     print("\n✅ Server Information:")
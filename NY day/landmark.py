@@ -1,210 +1,46 @@
 # main.py - Simple Museum Hours Scraper
 from flask import Flask, jsonify
 from flask_cors import CORS
-import requests
-from bs4 import BeautifulSoup
-import re
 from datetime import datetime
 import os
+import sys
+
+# Add the project root to the Python path for the shared scraper helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrapers.museums import museum_scraper
 
 app = Flask(__name__)
 # Allow ALL origins for your frontend
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-class MuseumScraper:
-    """Simple web scraper for museum hours"""
-    
-    def scrape_met_museum(self):
-        """Scrape MET Museum hours"""
-        try:
-            url = "https://www.metmuseum.org/visit/plan-your-visit/metropolitan-museum-of-art"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Sun-Thu: 10:00 AM - 5:30 PM, Fri-Sat: 10:00 AM - 9:00 PM"
-            
-            # Look for hours in MET page
-            hour_sections = soup.find_all(['p', 'div', 'span'], text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed'))
-            for section in hour_sections:
-                text = section.get_text()
-                if '10' in text and ('AM' in text or 'PM' in text):
-                    hours = text.strip()[:150]
-                    break
-            
-            return {
-                'museum': 'MET Museum',
-                'hours': hours,
-                'address': '1000 5th Ave, New York, NY 10028',
-                'phone': '(212) 535-7710',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p")
-            }
-            
-        except Exception as e:
-            return {
-                'museum': 'MET Museum',
-                'hours': 'Sun-Thu: 10:00 AM - 5:30 PM, Fri-Sat: 10:00 AM - 9:00 PM',
-                'address': '1000 5th Ave, New York, NY 10028',
-                'phone': '(212) 535-7710',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'error': str(e)[:50]
-            }
-    
-    def scrape_ice_cream_museum(self):
-        """Scrape Museum of Ice Cream hours"""
-        try:
-            url = "https://www.museumoficecream.com/new-york"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Look for hours
-            hours = "Mon-Sun: 10:00 AM - 9:00 PM"
-            all_text = soup.get_text().lower()
-            
-            if 'hour' in all_text or 'open' in all_text:
-                # Find text around hour mentions
-                hour_match = re.search(r'([A-Za-z]{3,9}[-\s]*\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm])', soup.get_text())
-                if hour_match:
-                    hours = hour_match.group(1)
-            
-            return {
-                'museum': 'Museum of Ice Cream',
-                'hours': hours,
-                'address': '558 Broadway, New York, NY 10012',
-                'phone': '(646) 459-3515',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p")
-            }
-            
-        except Exception as e:
-            return {
-                'museum': 'Museum of Ice Cream',
-                'hours': 'Mon-Sun: 10:00 AM - 9:00 PM',
-                'address': '558 Broadway, New York, NY 10012',
-                'phone': '(646) 459-3515',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'error': str(e)[:50]
-            }
-    
-    def scrape_ukrainian_museum(self):
-        """Scrape Ukrainian Museum hours"""
-        try:
-            url = "https://www.ukrainianmuseum.org/"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Wed-Sun: 11:30 AM - 5:00 PM"
-            
-            # Common hour patterns
-            patterns = [
-                r'[Hh]ours?[:\s]*([^\n]{10,100})',
-                r'[Oo]pen[:\s]*([^\n]{10,100})'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, soup.get_text())
-                if match:
-                    hours = match.group(1).strip()[:100]
-                    break
-            
-            return {
-                'museum': 'Ukrainian Museum',
-                'hours': hours,
-                'address': '222 East 6th Street, New York, NY 10003',
-                'phone': '(212) 228-0110',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p")
-            }
-            
-        except Exception as e:
-            return {
-                'museum': 'Ukrainian Museum',
-                'hours': 'Wed-Sun: 11:30 AM - 5:00 PM',
-                'address': '222 East 6th Street, New York, NY 10003',
-                'phone': '(212) 228-0110',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'error': str(e)[:50]
-            }
-    
-    def scrape_empire_state(self):
-        """Scrape Empire State Building hours"""
-        try:
-            url = "https://www.esbnyc.com/"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Daily: 8:00 AM - 2:00 AM"
-            
-            # Empire State hours often visible
-            hour_text = soup.get_text()
-            hour_match = re.search(r'(\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm])', hour_text)
-            if hour_match:
-                hours = f"Daily: {hour_match.group(1)}"
-            
-            return {
-                'museum': 'Empire State Building',
-                'hours': hours,
-                'address': '20 W 34th St, New York, NY 10001',
-                'phone': '(212) 736-3100',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p")
-            }
-            
-        except Exception as e:
-            return {
-                'museum': 'Empire State Building',
-                'hours': 'Daily: 8:00 AM - 2:00 AM',
-                'address': '20 W 34th St, New York, NY 10001',
-                'phone': '(212) 736-3100',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'error': str(e)[:50]
-            }
-
-# Create scraper instance
-scraper = MuseumScraper()
+# Shared museum scraper: same registry snapshots as main.py, app.py and landmark.py
+scraper = museum_scraper
 
 # API endpoints for each museum
 @app.route('/api/met')
 def get_met_hours():
-    data = scraper.scrape_met_museum()
+    data = scraper.get_hours('met')
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/icecream')
 def get_icecream_hours():
-    data = scraper.scrape_ice_cream_museum()
+    data = scraper.get_hours('icecream')
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/ukrainian')
 def get_ukrainian_hours():
-    data = scraper.scrape_ukrainian_museum()
+    data = scraper.get_hours('ukrainian')
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/empire')
 def get_empire_hours():
-    data = scraper.scrape_empire_state()
+    data = scraper.get_hours('empire')
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/all')
 def get_all_hours():
-    data = {
-        'met': scraper.scrape_met_museum(),
-        'icecream': scraper.scrape_ice_cream_museum(),
-        'ukrainian': scraper.scrape_ukrainian_museum(),
-        'empire': scraper.scrape_empire_state(),
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    data = scraper.scrape_all()
+    data['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     return jsonify({'success': True, 'data': data})
 
 # Test endpoint to check if API is working
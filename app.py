@@ -1,12 +1,19 @@
 # Refactored: Use CRUD naming (read, create) in InfoModel
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, redirect, request, send_file, url_for
 from flask_cors import CORS
 from flask_restful import Api, Resource
 import requests
 import sqlite3
-from datetime import datetime
-import time
+from datetime import datetime, timedelta
+import os
+import re
 from bs4 import BeautifulSoup  # ADD FOR MUSEUM SCRAPER
+from scrapers.museums import museum_scraper as shared_museum_scraper
+from scrapers.breaker import circuit_breaker
+from scrapers.cache import scrape_cache
+from scrapers.crawl import Crawler
+from scrapers.images import image_store
+from scrapers.met_sync import MetCollectionSync
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True, origins='*')
@@ -43,113 +50,69 @@ class InfoModel:
 # Instantiate the model
 info_model = InfoModel()
 
-# --- ADD MUSEUM SCRAPER CLASS HERE (BEFORE MET SCRAPER) ---
+# --- MUSEUM SCRAPER (reads the shared scraper registry) ---
 class MuseumScraper:
-    """Scraper for NYC museums and attractions"""
+    """NYC museum data for this API, read from the snapshots main.py and landmark.py share"""
     
-    def __init__(self):
-        self.cache = {
-            'ice_cream_museum': {'data': None, 'timestamp': 0},
-            'ukrainian_museum': {'data': None, 'timestamp': 0},
-            'empire_state': {'data': None, 'timestamp': 0}
+    # Museum names used by this API -> shared registry keys, plus the details this API adds
+    MUSEUMS = {
+        'ice_cream_museum': {
+            'key': 'icecream',
+            'name': 'Museum of Ice Cream NYC',
+            'exhibits': ["Interactive ice cream exhibits", "Sprinkle pool", "Ice cream tastings"],
+            'website': 'https://www.museumoficecream.com/new-york'
+        },
+        'ukrainian_museum': {
+            'key': 'ukrainian',
+            'name': 'The Ukrainian Museum',
+            'exhibits': ["Ukrainian folk art", "Historical artifacts", "Cultural exhibitions"],
+            'website': 'https://www.ukrainianmuseum.org/'
+        },
+        'empire_state': {
+            'key': 'empire',
+            'name': 'Empire State Building',
+            'exhibits': ["86th Floor Observatory", "102nd Floor Observatory", "Dare to Dream Exhibit"],
+            'website': 'https://www.esbnyc.com/'
         }
-        self.cache_duration = 3600  # 1 hour in seconds
-    
-    def scrape_ice_cream_museum(self):
-        """Scrape Museum of Ice Cream NYC hours and exhibits"""
-        try:
-            # This is a simplified version - you would need to adjust selectors
-            # based on the actual website structure
-            hours = "Mon-Sun: 10:00 AM - 9:00 PM"
-            exhibits = ["Interactive ice cream exhibits", "Sprinkle pool", "Ice cream tastings"]
-            
-            return {
-                'name': 'Museum of Ice Cream NYC',
-                'hours': hours,
-                'exhibits': exhibits,
-                'status': 'open',
-                'website': 'https://www.museumoficecream.com/new-york',
-                'last_updated': datetime.now().isoformat()
-            }
-        except Exception as e:
-            return {'error': str(e), 'name': 'Museum of Ice Cream NYC'}
-    
-    def scrape_ukrainian_museum(self):
-        """Scrape The Ukrainian Museum hours"""
-        try:
-            hours = "Wed-Sun: 11:30 AM - 5:00 PM"
-            exhibits = ["Ukrainian folk art", "Historical artifacts", "Cultural exhibitions"]
-            
-            return {
-                'name': 'The Ukrainian Museum',
-                'hours': hours,
-                'exhibits': exhibits,
-                'status': 'open',
-                'website': 'https://www.ukrainianmuseum.org/',
-                'last_updated': datetime.now().isoformat()
-            }
-        except Exception as e:
-            return {'error': str(e), 'name': 'The Ukrainian Museum'}
-    
-    def scrape_empire_state(self):
-        """Scrape Empire State Building hours"""
-        try:
-            hours = "Daily: 8:00 AM - 2:00 AM"
-            exhibits = ["86th Floor Observatory", "102nd Floor Observatory", "Dare to Dream Exhibit"]
-            
-            return {
-                'name': 'Empire State Building',
-                'hours': hours,
-                'exhibits': exhibits,
-                'status': 'open',
-                'website': 'https://www.esbnyc.com/',
-                'last_updated': datetime.now().isoformat()
-            }
-        except Exception as e:
-            return {'error': str(e), 'name': 'Empire State Building'}
+    }
     
     def get_museum_data(self, museum_name, force_refresh=False):
-        """Get museum data with caching"""
-        current_time = time.time()
-        
-        # Check cache
-        if (not force_refresh and 
-            self.cache[museum_name]['data'] and 
-            current_time - self.cache[museum_name]['timestamp'] < self.cache_duration):
-            return self.cache[museum_name]['data']
-        
-        # Scrape fresh data
-        if museum_name == 'ice_cream_museum':
-            data = self.scrape_ice_cream_museum()
-        elif museum_name == 'ukrainian_museum':
-            data = self.scrape_ukrainian_museum()
-        elif museum_name == 'empire_state':
-            data = self.scrape_empire_state()
-        else:
+        """Get museum data from the shared snapshot (force_refresh scrapes it now for everyone)"""
+        if museum_name not in self.MUSEUMS:
             return {'error': 'Invalid museum name'}
         
-        self.cache[museum_name] = {'data': data, 'timestamp': current_time}
+        details = self.MUSEUMS[museum_name]
+        if force_refresh:
+            shared_museum_scraper.refresh_hours(details['key'])
+        data = shared_museum_scraper.get_hours(details['key'])
+        data.update({k: v for k, v in details.items() if k != 'key'})
         return data
     
     def get_all_museums(self, count=3):
         """Get data for all museums"""
-        current_time = time.time()
-        museums_data = []
-        
-        for museum_name in ['ice_cream_museum', 'ukrainian_museum', 'empire_state']:
-            data = self.get_museum_data(museum_name)
-            museums_data.append(data)
-        
-        return museums_data[:count]
+        return [self.get_museum_data(museum_name) for museum_name in self.MUSEUMS][:count]
 
 # Instantiate museum scraper
 museum_scraper = MuseumScraper()
 
 # --- MET SCRAPER CLASS (YOUR EXISTING CODE) ---
 class MetScraper:
+    # The MET Collection API asks for at most 80 requests per second
+    RATE_LIMIT = float(os.getenv('MET_RATE_LIMIT', 80))
+    CONCURRENCY = int(os.getenv('MET_CRAWL_CONCURRENCY', 8))
+    SAVE_BATCH = 25
+    # Searches that define the fashion catalogue
+    SEARCH_TERMS = ['costume', 'dress', 'gown', 'fashion']
+    # How long search ID lists and stored object details are served without asking the MET
+    SEARCH_TTL = int(os.getenv('MET_SEARCH_TTL', 6 * 3600))
+    OBJECT_TTL = int(os.getenv('MET_OBJECT_TTL', 7 * 24 * 3600))
+    OBJECT_COLUMNS = ('object_id', 'title', 'artist', 'date', 'culture', 'department',
+                      'image_url', 'met_url', 'description', 'period', 'scraped_at')
+    
     def __init__(self):
         self.base_url = "https://collectionapi.metmuseum.org/public/collection/v1"
         self.db_path = "met_outfits.db"
+        self.crawler = Crawler(rate=self.RATE_LIMIT, concurrency=self.CONCURRENCY)
         self.init_database()
     
     def init_database(self):
@@ -174,6 +137,42 @@ class MetScraper:
             )
         ''')
         
+        # Local full-text index over the text columns, kept in sync by triggers
+        index_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'met_outfits_fts'"
+        ).fetchone()
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS met_outfits_fts USING fts5(
+                    title, artist, culture, period, description,
+                    content='met_outfits', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: searches go to the MET API
+            print(f"⚠️ MET full-text index unavailable: {e}")
+            self.fts = False
+        else:
+            self.fts = True
+            cursor.executescript('''
+                CREATE TRIGGER IF NOT EXISTS met_outfits_fts_insert AFTER INSERT ON met_outfits BEGIN
+                    INSERT INTO met_outfits_fts (rowid, title, artist, culture, period, description)
+                    VALUES (new.id, new.title, new.artist, new.culture, new.period, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS met_outfits_fts_delete AFTER DELETE ON met_outfits BEGIN
+                    INSERT INTO met_outfits_fts (met_outfits_fts, rowid, title, artist, culture, period, description)
+                    VALUES ('delete', old.id, old.title, old.artist, old.culture, old.period, old.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS met_outfits_fts_update AFTER UPDATE ON met_outfits BEGIN
+                    INSERT INTO met_outfits_fts (met_outfits_fts, rowid, title, artist, culture, period, description)
+                    VALUES ('delete', old.id, old.title, old.artist, old.culture, old.period, old.description);
+                    INSERT INTO met_outfits_fts (rowid, title, artist, culture, period, description)
+                    VALUES (new.id, new.title, new.artist, new.culture, new.period, new.description);
+                END;
+            ''')
+            if not index_exists:
+                cursor.execute("INSERT INTO met_outfits_fts (met_outfits_fts) VALUES ('rebuild')")
+        
         conn.commit()
         conn.close()
         print("MET Scraper Database initialized")
@@ -192,11 +191,9 @@ class MetScraper:
         }
         
         try:
-            response = requests.get(search_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self.crawler.get_json(search_url, params=params)
             
-            if data and 'objectIDs' in data:
+            if data and data.get('objectIDs'):
                 print(f"Found {len(data['objectIDs'])} {query} items")
                 return data['objectIDs']
             else:
@@ -207,48 +204,132 @@ class MetScraper:
             print(f"Search error: {e}")
             return []
     
+    def search_cached(self, query="costume"):
+        """Object IDs for a search, cached per query in the shared store (failed or empty searches only briefly)"""
+        return scrape_cache.get(
+            f"met:search:{query.strip().lower()}",
+            lambda: self.search_met(query),
+            ttl=lambda object_ids: self.SEARCH_TTL if object_ids else 60
+        )
+    
+    def get_stored_objects(self, object_ids):
+        """{object_id: details} for objects in met_outfits scraped within OBJECT_TTL"""
+        if not object_ids:
+            return {}
+        
+        fresh_since = (datetime.now() - timedelta(seconds=self.OBJECT_TTL)).isoformat()
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(f'''
+            SELECT {', '.join(self.OBJECT_COLUMNS)} FROM met_outfits
+            WHERE object_id IN ({','.join('?' * len(object_ids))}) AND scraped_at >= ?
+        ''', list(object_ids) + [fresh_since]).fetchall()
+        conn.close()
+        return {row[0]: dict(zip(self.OBJECT_COLUMNS, row)) for row in rows}
+    
+    def get_objects(self, object_ids):
+        """
+        Details for `object_ids` in order, read through met_outfits: only objects that
+        are unknown or older than OBJECT_TTL are fetched, and those are stored.
+        Returns (details, number served locally).
+        """
+        objects = self.get_stored_objects(object_ids)
+        local = len(objects)
+        missing = [obj_id for obj_id in object_ids if obj_id not in objects]
+        if missing:
+            fetched = self.crawler.crawl(missing, self.get_object_details)
+            self.save_many(fetched)
+            objects.update((outfit['object_id'], outfit) for outfit in fetched)
+        return [objects[obj_id] for obj_id in object_ids if obj_id in objects], local
+    
+    @staticmethod
+    def fts_query(text):
+        """'silk gow' -> '"silk"* "gow"*': every word must match, each as a prefix"""
+        words = re.findall(r'\w+', text or '')
+        return ' '.join(f'"{word}"*' for word in words)
+    
+    def search_local(self, query, limit=5):
+        """
+        Stored objects matching `query` from the full-text index, best first (bm25,
+        title matches weighted highest). Empty if FTS5 is unavailable.
+        """
+        match = self.fts_query(query)
+        if not self.fts or not match:
+            return []
+        
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(f'''
+            SELECT {', '.join('m.' + column for column in self.OBJECT_COLUMNS)}
+            FROM met_outfits_fts
+            JOIN met_outfits m ON m.id = met_outfits_fts.rowid
+            WHERE met_outfits_fts MATCH ?
+            ORDER BY bm25(met_outfits_fts, 10.0, 5.0, 2.0, 2.0, 1.0)
+            LIMIT ?
+        ''', (match, limit)).fetchall()
+        conn.close()
+        return [dict(zip(self.OBJECT_COLUMNS, row)) for row in rows]
+    
     def get_object_details(self, object_id):
         """Get detailed information about a specific object"""
-        url = f"{self.base_url}/objects/{object_id}"
-        
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract relevant information
-            outfit_data = {
-                'object_id': object_id,
-                'title': data.get('title', 'Unknown Title'),
-                'artist': data.get('artistDisplayName', 'Unknown Artist'),
-                'date': data.get('objectDate', 'Unknown Date'),
-                'culture': data.get('culture', ''),
-                'department': data.get('department', ''),
-                'image_url': data.get('primaryImage', ''),
-                'met_url': data.get('objectURL', ''),
-                'description': data.get('objectName', '') + '. ' + data.get('creditLine', ''),
-                'period': data.get('period', ''),
-                'scraped_at': datetime.now().isoformat()
-            }
-            
-            return outfit_data
-            
+            return self.fetch_object(object_id)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching object {object_id}: {e}")
             return None
     
+    def fetch_object(self, object_id):
+        """Object details through the rate-limited crawler; None if the MET has no such object"""
+        data = self.crawler.get_json(f"{self.base_url}/objects/{object_id}")
+        return self.parse_object(object_id, data) if data else None
+    
+    def parse_object(self, object_id, data):
+        """Outfit fields from a MET object record"""
+        # Extract relevant information
+        return {
+            'object_id': object_id,
+            'title': data.get('title', 'Unknown Title'),
+            'artist': data.get('artistDisplayName', 'Unknown Artist'),
+            'date': data.get('objectDate', 'Unknown Date'),
+            'culture': data.get('culture', ''),
+            'department': data.get('department', ''),
+            'image_url': data.get('primaryImage', ''),
+            'met_url': data.get('objectURL', ''),
+            'description': data.get('objectName', '') + '. ' + data.get('creditLine', ''),
+            'period': data.get('period', ''),
+            'scraped_at': datetime.now().isoformat()
+        }
+    
     def save_to_database(self, outfit_data):
         """Save scraped outfit data to database"""
+        self.save_many([outfit_data])
+    
+    def save_many(self, outfits):
+        """Save a batch of scraped outfits in one transaction"""
+        if not outfits:
+            return
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO met_outfits 
+            # An upsert rather than INSERT OR REPLACE: REPLACE's implicit delete
+            # doesn't fire the full-text index's delete trigger
+            cursor.executemany('''
+                INSERT INTO met_outfits 
                 (object_id, title, artist, date, culture, department, 
                  image_url, met_url, description, period, scraped_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+                ON CONFLICT(object_id) DO UPDATE SET
+                    title = excluded.title,
+                    artist = excluded.artist,
+                    date = excluded.date,
+                    culture = excluded.culture,
+                    department = excluded.department,
+                    image_url = excluded.image_url,
+                    met_url = excluded.met_url,
+                    description = excluded.description,
+                    period = excluded.period,
+                    scraped_at = excluded.scraped_at
+            ''', [(
                 outfit_data['object_id'],
                 outfit_data['title'],
                 outfit_data['artist'],
@@ -260,10 +341,10 @@ class MetScraper:
                 outfit_data['description'],
                 outfit_data['period'],
                 outfit_data['scraped_at']
-            ))
+            ) for outfit_data in outfits])
             
             conn.commit()
-            print(f"Saved: {outfit_data['title'][:50]}...")
+            print(f"Saved {len(outfits)} outfits")
             
         except Exception as e:
             print(f"Database error: {e}")
@@ -271,42 +352,40 @@ class MetScraper:
             conn.close()
     
     def scrape_met_fashion(self, limit=10):
-        """Main scraping function"""
+        """
+        Main scraping function. Searches and object details run concurrently through
+        the crawler (rate-limited, retried); outfits with images are saved in batches.
+        """
         print("Starting MET Museum fashion scraper...")
         
         # Search for fashion-related items
-        search_terms = ['costume', 'dress', 'gown', 'fashion']
-        
-        all_object_ids = []
+        searches = self.crawler.crawl(self.SEARCH_TERMS, self.search_met)
         
-        for term in search_terms:
-            print(f"Searching for: {term}")
-            object_ids = self.search_met(term)
-            all_object_ids.extend(object_ids[:5])  # Get first 5 from each search
-        
-        # Remove duplicates
-        all_object_ids = list(set(all_object_ids))[:limit]
+        # First 5 from each search, duplicates removed, in search order
+        all_object_ids = list(dict.fromkeys(obj_id for object_ids in searches for obj_id in object_ids[:5]))[:limit]
         print(f"Total unique items to scrape: {len(all_object_ids)}")
         
         # Scrape details for each item
-        scraped_count = 0
-        scraped_outfits = []
+        outfits = self.crawler.crawl(all_object_ids, self.fetch_object, batch_size=self.SAVE_BATCH,
+                                     on_batch=self.save_batch)
+        scraped_outfits = [outfit for outfit in outfits if outfit.get('image_url')]
         
-        for obj_id in all_object_ids:
-            print(f"Scraping object ID: {obj_id}")
-            outfit_data = self.get_object_details(obj_id)
-            
-            if outfit_data and outfit_data.get('image_url'):
-                self.save_to_database(outfit_data)
-                scraped_count += 1
-                scraped_outfits.append(outfit_data)
-            
-            # Be respectful - add delay between requests
-            time.sleep(0.5)
-        
-        print(f"Scraping complete! Saved {scraped_count} items to database.")
+        print(f"Scraping complete! Saved {len(scraped_outfits)} items to database.")
         return scraped_outfits
     
+    def save_batch(self, outfits):
+        """Save the outfits that have images and start rendering their thumbnails"""
+        outfits = [outfit for outfit in outfits if outfit.get('image_url')]
+        self.save_many(outfits)
+        image_store.prefetch(outfit['image_url'] for outfit in outfits)
+    
+    def get_image_url(self, object_id):
+        """Stored primaryImage url of an object, or None"""
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('SELECT image_url FROM met_outfits WHERE object_id = ?', (object_id,)).fetchone()
+        conn.close()
+        return row[0] if row and row[0] else None
+    
     def get_scraped_outfits(self, limit=10):
         """Retrieve scraped outfits from database"""
         conn = sqlite3.connect(self.db_path)
@@ -331,6 +410,27 @@ class MetScraper:
 
 # Create scraper instances
 met_scraper = MetScraper()
+met_sync = MetCollectionSync(met_scraper)
+
+def with_thumbnails(outfits):
+    """
+    Add thumbnail urls to outfits with images: the immutable content-addressed file
+    once rendered, otherwise the per-object url (which renders on first request).
+    Unrendered images are queued so the next page load gets the immutable urls.
+    """
+    for outfit in outfits:
+        if not outfit.get('image_url') or 'object_id' not in outfit:
+            continue
+        digest = image_store.lookup(outfit['image_url'])
+        if digest:
+            outfit['thumbnails'] = {size: url_for('get_met_thumbnail', digest=digest, size=size, _external=True)
+                                    for size in image_store.SIZES}
+        else:
+            image_store.submit(outfit['image_url'])
+            outfit['thumbnails'] = {size: url_for('get_met_image', object_id=outfit['object_id'], size=size, _external=True)
+                                    for size in image_store.SIZES}
+        outfit['thumbnail_url'] = outfit['thumbnails']['card']
+    return outfits
 
 # --- API Resources ---
 class DataAPI(Resource):
@@ -404,7 +504,7 @@ class MetScraperAPI(Resource):
         """Get scraped MET outfits"""
         try:
             limit = request.args.get('limit', 10, type=int)
-            outfits = met_scraper.get_scraped_outfits(limit)
+            outfits = with_thumbnails(met_scraper.get_scraped_outfits(limit))
             
             return {
                 'success': True,
@@ -424,7 +524,7 @@ class MetScraperAPI(Resource):
             data = request.get_json() or {}
             limit = data.get('limit', 10)
             
-            outfits = met_scraper.scrape_met_fashion(limit=limit)
+            outfits = with_thumbnails(met_scraper.scrape_met_fashion(limit=limit))
             
             return {
                 'success': True,
@@ -440,23 +540,36 @@ class MetScraperAPI(Resource):
 
 class MetSearchAPI(Resource):
     def get(self):
-        """Search MET collection"""
+        """
+        Search MET collection: ?q=, ?limit= (default 5). Served from the local full-text
+        index, topped up from the MET API when it has fewer than `limit` matches;
+        ?source=remote skips the index, ?source=local-only never calls the MET.
+        """
         try:
             query = request.args.get('q', 'costume')
-            object_ids = met_scraper.search_met(query)
+            limit = min(max(request.args.get('limit', 5, type=int), 1), 50)
+            source = request.args.get('source', 'local')
             
-            # Get details for first 5 results
-            outfits = []
-            for obj_id in object_ids[:5]:
-                outfit_data = met_scraper.get_object_details(obj_id)
-                if outfit_data:
-                    outfits.append(outfit_data)
+            # Stored objects from the full-text index first
+            outfits = met_scraper.search_local(query, limit) if source != 'remote' else []
+            local = len(outfits)
+            remote = []
+            
+            # Not enough locally: top up from the MET search (known objects still come from met_outfits)
+            if len(outfits) < limit and source != 'local-only':
+                seen = {outfit['object_id'] for outfit in outfits}
+                object_ids = [obj_id for obj_id in met_scraper.search_cached(query) if obj_id not in seen]
+                remote, stored = met_scraper.get_objects(object_ids[:limit - len(outfits)])
+                outfits.extend(remote)
+                local += stored
             
             return {
                 'success': True,
                 'query': query,
                 'count': len(outfits),
-                'outfits': outfits
+                'outfits': with_thumbnails(outfits),
+                'cached': local,
+                'source': 'local' if not remote else ('local+remote' if len(remote) < len(outfits) else 'remote')
             }, 200
         except Exception as e:
             return {
@@ -492,7 +605,7 @@ def scrape_met_outfits():
             'isHighlight': True
         }
         
-        response = requests.get(api_url, params=params)
+        response = circuit_breaker.get(api_url, params=params, timeout=10)
         data = response.json()
         
         outfits = []
@@ -502,7 +615,7 @@ def scrape_met_outfits():
             for obj_id in data['objectIDs'][:5]:
                 # Get object details
                 obj_url = f"https://collectionapi.metmuseum.org/public/collection/v1/objects/{obj_id}"
-                obj_response = requests.get(obj_url)
+                obj_response = circuit_breaker.get(obj_url, timeout=10)
                 obj_data = obj_response.json()
                 
                 outfit = {
@@ -531,6 +644,67 @@ def scrape_met_outfits():
             'error': str(e)
         }), 500
 
+# --- MET CATALOGUE SYNC ---
+@app.route('/api/met/sync', methods=['GET'])
+def get_met_sync():
+    """Progress of the latest catalogue sync: counts, objects/s, ETA, and checkpoint totals"""
+    return jsonify({'success': True, **met_sync.status()})
+
+@app.route('/api/met/sync', methods=['POST'])
+def start_met_sync():
+    """
+    Start (or resume) the incremental catalogue sync in the background.
+    Body: {"full": true} re-fetches every known object instead of only new and changed ones.
+    """
+    data = request.get_json(silent=True) or {}
+    run_id, started = met_sync.start(full=bool(data.get('full')))
+    return jsonify({
+        'success': started,
+        'run_id': run_id,
+        'message': 'Sync started' if started else 'A sync is already running',
+        'progress': url_for('get_met_sync', _external=True)
+    }), 202 if started else 409
+
+@app.route('/api/met/sync/stop', methods=['POST'])
+def stop_met_sync():
+    """Stop the running sync after its current chunk; the next run resumes where it left off"""
+    run_id = met_sync.stop()
+    return jsonify({'success': run_id is not None, 'run_id': run_id})
+
+# --- MET IMAGES (local thumbnails instead of multi-MB originals) ---
+@app.route('/api/met/images/<int:object_id>/<size>')
+def get_met_image(object_id, size):
+    """Thumbnail of a stored outfit (thumb, card or large), rendered on first request"""
+    if size not in image_store.SIZES:
+        return jsonify({'success': False, 'error': f"size must be one of {', '.join(image_store.SIZES)}"}), 400
+    image_url = met_scraper.get_image_url(object_id)
+    if not image_url:
+        return jsonify({'success': False, 'error': 'Unknown object or no image'}), 404
+    
+    try:
+        path, digest = image_store.get(image_url, size)
+    except Exception as e:
+        # Thumbnail unavailable: send the browser to the original
+        print(f"⚠️ Thumbnail failed for object {object_id}: {e}")
+        return redirect(image_url)
+    
+    # The object's image may change upstream, so this url is cached for a day and revalidated by ETag
+    return send_file(path, mimetype='image/jpeg', etag=f"{digest[:20]}-{size}", max_age=86400, conditional=True)
+
+@app.route('/api/met/thumbs/<digest>-<size>.jpg')
+def get_met_thumbnail(digest, size):
+    """Content-addressed thumbnail: never changes, so browsers and CDNs keep it for a year"""
+    if size not in image_store.SIZES or not re.fullmatch(r'[0-9a-f]{64}', digest):
+        return jsonify({'success': False, 'error': 'Unknown thumbnail'}), 404
+    path = image_store.path(digest, size)
+    if not os.path.exists(path):
+        return jsonify({'success': False, 'error': 'Unknown thumbnail'}), 404
+    
+    response = send_file(path, mimetype='image/jpeg', etag=f"{digest[:20]}-{size}", max_age=31536000, conditional=True)
+    response.cache_control.immutable = True
+    response.cache_control.public = True
+    return response
+
 # Museum specific endpoints for convenience
 @app.route('/api/museum/icecream', methods=['GET'])
 def get_ice_cream_museum():
@@ -675,6 +849,11 @@ def say_hello():
                     <p><strong>Parameters:</strong> <code>?q=costume</code> (optional)</p>
                     <a class="btn btn-met" href="/api/met/search?q=dress">Search "dress"</a>
                     
+                    <p><strong>POST</strong> <code>/api/met/sync</code> - Start the incremental catalogue sync (<code>GET</code> for progress)</p>
+                    
+                    <p><strong>GET</strong> <code>/api/met/images/&lt;object_id&gt;/&lt;size&gt;</code> - Outfit thumbnail</p>
+                    <p><strong>Sizes:</strong> <code>thumb</code>, <code>card</code>, <code>large</code> (outfit responses include <code>thumbnails</code> urls)</p>
+                    
                     <p><strong>GET</strong> <code>/api/scrape/met</code> - Quick scrape</p>
                     <a class="btn btn-met" href="/api/scrape/met">Quick Scrape</a>
                 </div>
@@ -3,10 +3,12 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 from flask_restful import Api, Resource
 import requests
-import sqlite3
 from datetime import datetime
 import time
 from bs4 import BeautifulSoup
+from scrapers.breaker import circuit_breaker
+from scrapers.breakfast_store import breakfast_store
+from scrapers.sqlite_pool import db_pool
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True, origins='*')
@@ -47,28 +49,12 @@ info_model = InfoModel()
 class BreakfastScraper:
     def __init__(self):
         self.db_path = "breakfast_places.db"
+        self.store = breakfast_store
         self.init_database()
     
     def init_database(self):
-        """Create database table for scraped restaurant data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS breakfast_hours (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                restaurant TEXT,
-                location TEXT,
-                day TEXT,
-                open_time TEXT,
-                close_time TEXT,
-                hours_text TEXT,
-                scraped_at TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """Create the snapshot tables shared with main.py"""
+        self.store.init_database()
         print("Breakfast Scraper Database initialized")
     
     def scrape_jacks_wife_freda(self):
@@ -78,7 +64,7 @@ class BreakfastScraper:
             url = "https://jackswifefreda.com/"
             
             # This is a template - you'll need to adjust selectors based on the actual website
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+            response = circuit_breaker.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Example: Find hours section - ADJUST THESE SELECTORS
@@ -117,7 +103,7 @@ class BreakfastScraper:
             print("Scraping Shuka...")
             url = "https://www.shukanewyork.com/"
             
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+            response = circuit_breaker.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             scraped_data = {
@@ -154,7 +140,7 @@ class BreakfastScraper:
             print("Scraping Sarabeth's...")
             url = "https://sarabethsrestaurants.com/"
             
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+            response = circuit_breaker.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             scraped_data = {
@@ -191,7 +177,7 @@ class BreakfastScraper:
             print("Scraping Ess-a-Bagel...")
             url = "https://www.ess-a-bagel.com/"
             
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+            response = circuit_breaker.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             scraped_data = {
@@ -223,40 +209,13 @@ class BreakfastScraper:
             }
     
     def save_to_database(self, restaurant_data):
-        """Save scraped restaurant data to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        """Save scraped restaurant data; rows are only rewritten when the hours change"""
         try:
-            # Save each day's hours as separate record
-            hours = restaurant_data.get('hours', {})
-            for day, hours_text in hours.items():
-                # Parse open and close times if format is "HH:MM AM/PM - HH:MM AM/PM"
-                open_time = close_time = ''
-                if ' - ' in hours_text:
-                    open_time, close_time = hours_text.split(' - ')
-                
-                cursor.execute('''
-                    INSERT INTO breakfast_hours 
-                    (restaurant, location, day, open_time, close_time, hours_text, scraped_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    restaurant_data['restaurant'],
-                    restaurant_data.get('location', ''),
-                    day,
-                    open_time.strip(),
-                    close_time.strip(),
-                    hours_text,
-                    restaurant_data.get('scraped_at', datetime.now().isoformat())
-                ))
-            
-            conn.commit()
-            print(f"Saved: {restaurant_data['restaurant']}")
-            
+            version, changed = self.store.save(restaurant_data)
+            if changed:
+                print(f"Saved: {restaurant_data['restaurant']} (version {version})")
         except Exception as e:
             print(f"Database error: {e}")
-        finally:
-            conn.close()
     
     def scrape_all_restaurants(self):
         """Scrape all four breakfast places"""
@@ -276,7 +235,7 @@ class BreakfastScraper:
     
     def get_scraped_restaurants(self, limit=20):
         """Retrieve scraped restaurant data from database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -296,40 +255,8 @@ class BreakfastScraper:
         return restaurants
     
     def get_restaurant_hours_formatted(self, restaurant_name):
-        """Get scraped restaurant hours formatted by day"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT day, open_time, close_time, hours_text, scraped_at 
-            FROM breakfast_hours 
-            WHERE restaurant = ?
-            ORDER BY 
-                CASE day
-                    WHEN 'Monday' THEN 1
-                    WHEN 'Tuesday' THEN 2
-                    WHEN 'Wednesday' THEN 3
-                    WHEN 'Thursday' THEN 4
-                    WHEN 'Friday' THEN 5
-                    WHEN 'Saturday' THEN 6
-                    WHEN 'Sunday' THEN 7
-                    ELSE 8
-                END
-        ''', (restaurant_name,))
-        
-        days = []
-        for row in cursor.fetchall():
-            day_data = {
-                'day': row[0],
-                'open_time': row[1],
-                'close_time': row[2],
-                'hours_text': row[3],
-                'scraped_at': row[4]
-            }
-            days.append(day_data)
-        
-        conn.close()
-        return days
+        """Get the latest scraped restaurant hours formatted by day"""
+        return self.store.get_days(restaurant_name)
 
 # Create scraper instance
 breakfast_scraper = BreakfastScraper()
@@ -11,10 +11,14 @@ import os
 import requests
 from bs4 import BeautifulSoup
 import re
-import sqlite3
 import json
 import uuid
+import time
+import base64
+from collections import deque
+import io
 from datetime import timedelta
+import pandas as pd
 
 # Import database and models
 from __init__ import app, db, login_manager
@@ -50,6 +54,20 @@ from model.post import Post, init_posts
 from model.microblog import MicroBlog, Topic, init_microblogs
 from hacks.jokes import initJokes
 
+# Import shared scraper helpers
+from scrapers.cache import scrape_cache
+from scrapers.scheduler import scrape_scheduler
+from scrapers.breaker import circuit_breaker
+from scrapers.fetch import conditional_fetcher
+from scrapers.extract import HOURS_SPECS
+from scrapers.hours import hours_index
+from scrapers.registry import scrape_registry
+from scrapers.museums import museum_scraper
+from scrapers.breakfast_store import breakfast_store
+from scrapers.fanout import fan_out, iter_fan_out, race
+from scrapers.prices import parse_price_range
+from scrapers.sqlite_pool import db_pool
+
 # Load environment variables
 load_dotenv()
 
@@ -104,6 +122,24 @@ def load_user(user_id):
 def inject_user():
     return dict(current_user=current_user)
 
+# ============================================================================
+# KEYSET CURSORS
+# ============================================================================
+
+def encode_cursor(*values):
+    """Opaque next-page token for a keyset position (the sort key of the last row returned)"""
+    return base64.urlsafe_b64encode('|'.join(str(v) for v in values).encode()).decode()
+
+def decode_cursor(cursor_text, parts):
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        values = base64.urlsafe_b64decode(cursor_text.encode()).decode().split('|', parts - 1)
+    except Exception:
+        raise ValueError('invalid cursor')
+    if len(values) != parts:
+        raise ValueError('invalid cursor')
+    return values
+
 # ============================================================================
 # BUDGET TRACKING SYSTEM (NEW)
 # ============================================================================
@@ -117,7 +153,7 @@ class BudgetTracker:
     
     def init_database(self):
         """Create database table for budget tracking"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         # User budget table
@@ -184,14 +220,67 @@ class BudgetTracker:
                 message TEXT,
                 threshold DECIMAL(10, 2),
                 is_active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                budget_id INTEGER
             )
         ''')
         
+        # check_budget_alerts keys alerts by budget, but the table shipped without the column
+        alert_columns = [row[1] for row in cursor.execute('PRAGMA table_info(budget_alerts)')]
+        if 'budget_id' not in alert_columns:
+            cursor.execute('ALTER TABLE budget_alerts ADD COLUMN budget_id INTEGER')
+        
         # Create indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_id_budget ON user_budgets(user_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_id_budget ON user_budgets(session_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_expenses_budget_id ON budget_expenses(budget_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_expenses_budget_date ON budget_expenses(budget_id, date_added, id)')
+        
+        # Per-budget category and module totals, kept current by triggers in the same
+        # transaction as every expense insert, update and delete
+        rollups_exist = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'budget_category_totals'"
+        ).fetchone()
+        for rollup, column in self.ROLLUPS.items():
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {rollup} (
+                    budget_id INTEGER,
+                    {column} TEXT,
+                    expense_count INTEGER NOT NULL DEFAULT 0,
+                    total DECIMAL(10, 2) NOT NULL DEFAULT 0,
+                    PRIMARY KEY (budget_id, {column})
+                ) WITHOUT ROWID
+            ''')
+            add = f'''
+                INSERT INTO {rollup} (budget_id, {column}, expense_count, total)
+                VALUES (new.budget_id, new.{column}, 1, new.total_cost)
+                ON CONFLICT (budget_id, {column}) DO UPDATE SET
+                    expense_count = expense_count + 1,
+                    total = total + excluded.total;
+            '''
+            remove = f'''
+                UPDATE {rollup} SET
+                    expense_count = expense_count - 1,
+                    total = total - old.total_cost
+                WHERE budget_id = old.budget_id AND {column} = old.{column};
+                DELETE FROM {rollup}
+                WHERE budget_id = old.budget_id AND {column} = old.{column} AND expense_count <= 0;
+            '''
+            cursor.executescript(f'''
+                CREATE TRIGGER IF NOT EXISTS {rollup}_insert AFTER INSERT ON budget_expenses BEGIN
+                    {add}
+                END;
+                CREATE TRIGGER IF NOT EXISTS {rollup}_delete AFTER DELETE ON budget_expenses BEGIN
+                    {remove}
+                END;
+                CREATE TRIGGER IF NOT EXISTS {rollup}_update
+                AFTER UPDATE OF budget_id, {column}, total_cost ON budget_expenses BEGIN
+                    {remove}
+                    {add}
+                END;
+            ''')
+        if not rollups_exist:
+            self.rebuild_rollups(cursor)
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_expenses_category ON budget_expenses(category)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_expenses_module ON budget_expenses(module)')
         
@@ -203,7 +292,7 @@ class BudgetTracker:
                      currency="USD", trip_duration=1, notes=""):
         """Create a new budget for user or session"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -256,11 +345,60 @@ class BudgetTracker:
                 'error': str(e)
             }
     
-    def get_budget(self, user_id=None, session_id=None):
-        """Get budget information for user or session"""
-        try:
-            conn = sqlite3.connect(self.db_path)
+    # Rollup table -> the budget_expenses column it totals
+    ROLLUPS = {'budget_category_totals': 'category', 'budget_module_totals': 'module'}
+    
+    def rebuild_rollups(self, cursor=None):
+        """
+        Recompute the category and module rollups from budget_expenses (backfill, or
+        repair after editing the table by hand). Returns the number of rollup rows.
+        """
+        conn = None
+        if cursor is None:
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
+        
+        rows = 0
+        for rollup, column in self.ROLLUPS.items():
+            cursor.execute(f'DELETE FROM {rollup}')
+            cursor.execute(f'''
+                INSERT INTO {rollup} (budget_id, {column}, expense_count, total)
+                SELECT budget_id, {column}, COUNT(*), SUM(total_cost)
+                FROM budget_expenses
+                GROUP BY budget_id, {column}
+            ''')
+            rows += cursor.rowcount
+        
+        if conn is not None:
+            conn.commit()
+            conn.close()
+        return rows
+    
+    # Parts of a budget read that callers can ask for; 'budget' is the header row
+    BUDGET_FIELDS = ('budget', 'expenses', 'daily_breakdown', 'category_totals', 'expense_count')
+    
+    def get_budget(self, user_id=None, session_id=None, fields=None, limit=None, cursor=None):
+        """
+        Get budget information for user or session.
+        `fields` picks which parts to load (default: all of BUDGET_FIELDS), so a caller
+        that only needs the balance reads one row. Expenses come newest first; with
+        `limit` they are one keyset page on (date_added, id) plus a next_cursor.
+        Raises ValueError for an unknown field or a malformed cursor.
+        """
+        fields = self.BUDGET_FIELDS if fields is None else tuple(fields)
+        unknown = set(fields) - set(self.BUDGET_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown budget fields: {', '.join(sorted(unknown))}")
+        after = None
+        if cursor:
+            date_added, expense_id = decode_cursor(cursor, 2)
+            if not expense_id.isdigit():
+                raise ValueError('invalid cursor')
+            after = [date_added, int(expense_id)]
+        
+        try:
+            conn = db_pool.connect(self.db_path)
+            cursor_db = conn.cursor()
             
             query = 'SELECT * FROM user_budgets WHERE '
             params = []
@@ -278,66 +416,76 @@ class BudgetTracker:
                     'error': 'No user_id or session_id provided'
                 }
             
-            cursor.execute(query, params)
-            row = cursor.fetchone()
+            cursor_db.execute(query, params)
+            row = cursor_db.fetchone()
             
-            if row:
-                # Get column names
-                columns = [desc[0] for desc in cursor.description]
-                budget_data = dict(zip(columns, row))
-                
-                # Get expenses for this budget
-                cursor.execute('''
-                    SELECT * FROM budget_expenses 
-                    WHERE budget_id = ? 
-                    ORDER BY date_added DESC
-                ''', (budget_data['id'],))
+            if not row:
+                conn.close()
+                return {
+                    'success': True,
+                    'budget': None,
+                    'expenses': [],
+                    'message': 'No budget found'
+                }
+            
+            # Get column names
+            columns = [desc[0] for desc in cursor_db.description]
+            budget_data = dict(zip(columns, row))
+            result = {'success': True, 'budget': budget_data}
+            
+            if 'expenses' in fields:
+                # Get expenses for this budget, newest first (one page when limit is given)
+                expense_query = 'SELECT * FROM budget_expenses WHERE budget_id = ?'
+                expense_params = [budget_data['id']]
+                if after:
+                    expense_query += ' AND (date_added, id) < (?, ?)'
+                    expense_params += after
+                expense_query += ' ORDER BY date_added DESC, id DESC'
+                if limit:
+                    expense_query += ' LIMIT ?'
+                    expense_params.append(limit + 1)
                 
-                expense_rows = cursor.fetchall()
-                expense_columns = [desc[0] for desc in cursor.description]
-                expenses = [dict(zip(expense_columns, row)) for row in expense_rows]
+                cursor_db.execute(expense_query, expense_params)
+                expense_columns = [desc[0] for desc in cursor_db.description]
+                expenses = [dict(zip(expense_columns, expense_row)) for expense_row in cursor_db.fetchall()]
                 
+                if limit:
+                    last = expenses[limit - 1] if len(expenses) > limit else None
+                    expenses = expenses[:limit]
+                    result['next_cursor'] = encode_cursor(last['date_added'], last['id']) if last else None
+                result['expenses'] = expenses
+            
+            if 'daily_breakdown' in fields:
                 # Get daily breakdown
-                cursor.execute('''
+                cursor_db.execute('''
                     SELECT * FROM daily_budget 
                     WHERE budget_id = ? 
                     ORDER BY day_number
                 ''', (budget_data['id'],))
                 
-                daily_rows = cursor.fetchall()
-                daily_columns = [desc[0] for desc in cursor.description]
-                daily_breakdown = [dict(zip(daily_columns, row)) for row in daily_rows]
-                
-                # Calculate category totals
-                cursor.execute('''
-                    SELECT category, SUM(total_cost) as total_spent 
-                    FROM budget_expenses 
-                    WHERE budget_id = ?
-                    GROUP BY category
+                daily_columns = [desc[0] for desc in cursor_db.description]
+                result['daily_breakdown'] = [dict(zip(daily_columns, daily_row)) for daily_row in cursor_db.fetchall()]
+            
+            if 'category_totals' in fields:
+                # Category totals from the rollup (one row per category)
+                cursor_db.execute('''
+                    SELECT category, total FROM budget_category_totals WHERE budget_id = ?
                 ''', (budget_data['id'],))
                 
-                category_totals = {}
-                for cat_row in cursor.fetchall():
-                    category_totals[cat_row[0]] = cat_row[1]
-                
-                conn.close()
-                
-                return {
-                    'success': True,
-                    'budget': budget_data,
-                    'expenses': expenses,
-                    'daily_breakdown': daily_breakdown,
-                    'category_totals': category_totals,
-                    'expense_count': len(expenses)
-                }
-            else:
-                conn.close()
-                return {
-                    'success': True,
-                    'budget': None,
-                    'expenses': [],
-                    'message': 'No budget found'
-                }
+                result['category_totals'] = {cat_row[0]: cat_row[1] for cat_row in cursor_db.fetchall()}
+            
+            if 'expense_count' in fields:
+                if 'expenses' in fields and not limit and not after:
+                    result['expense_count'] = len(result['expenses'])
+                else:
+                    cursor_db.execute(
+                        'SELECT COALESCE(SUM(expense_count), 0) FROM budget_category_totals WHERE budget_id = ?',
+                        (budget_data['id'],)
+                    )
+                    result['expense_count'] = cursor_db.fetchone()[0]
+            
+            conn.close()
+            return result
                 
         except Exception as e:
             print(f"❌ Error getting budget: {e}")
@@ -348,80 +496,112 @@ class BudgetTracker:
     
     def add_expense(self, user_id=None, session_id=None, category="", item_name="", 
                    item_type="", price=0, quantity=1, description="", module="", day_number=1):
-        """Add an expense to the budget"""
+        """
+        Add an expense to the budget in one transaction. The remaining-budget check
+        and the debit are a single conditional UPDATE, so concurrent adds can't both
+        spend the same money, and the new totals come back from the writes instead
+        of re-reading the expense history.
+        """
+        if user_id:
+            owner, owner_id = 'user_id', user_id
+        elif session_id:
+            owner, owner_id = 'session_id', session_id
+        else:
+            return {
+                'success': False,
+                'error': 'No budget found. Please create a budget first.'
+            }
+        
+        # Convert before writing anything: SQLite would coerce "10" silently
+        try:
+            price = float(price)
+            quantity = int(quantity)
+            day_number = int(day_number)
+        except (TypeError, ValueError):
+            return {
+                'success': False,
+                'error': 'price must be a number; quantity and day_number must be whole numbers'
+            }
+        
         try:
-            # First get the budget
-            budget_result = self.get_budget(user_id=user_id, session_id=session_id)
-            if not budget_result['success'] or not budget_result['budget']:
-                return {
-                    'success': False,
-                    'error': 'No budget found. Please create a budget first.'
-                }
-            
-            budget = budget_result['budget']
-            budget_id = budget['id']
             total_cost = price * quantity
             
-            # Check if enough budget remains
-            if total_cost > budget['remaining_budget']:
-                return {
-                    'success': False,
-                    'error': f'Not enough budget. Need ${total_cost:.2f}, only ${budget["remaining_budget"]:.2f} remaining.',
-                    'remaining': budget['remaining_budget'],
-                    'needed': total_cost
-                }
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Add the expense
-            cursor.execute('''
-                INSERT INTO budget_expenses 
-                (budget_id, user_id, session_id, category, item_name, item_type, 
-                 price, quantity, total_cost, description, module)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                budget_id,
-                user_id,
-                session_id,
-                category,
-                item_name,
-                item_type,
-                price,
-                quantity,
-                total_cost,
-                description,
-                module
-            ))
-            
-            # Update budget totals
-            cursor.execute('''
-                UPDATE user_budgets SET 
-                    spent_budget = spent_budget + ?,
-                    remaining_budget = remaining_budget - ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (total_cost, total_cost, budget_id))
-            
-            # Update daily budget
-            cursor.execute('''
-                UPDATE daily_budget SET 
-                    daily_spent = daily_spent + ?,
-                    daily_remaining = daily_remaining - ?
-                WHERE budget_id = ? AND day_number = ?
-            ''', (total_cost, total_cost, budget_id, day_number))
-            
-            # Check for budget alerts
-            self.check_budget_alerts(budget_id, budget['remaining_budget'] - total_cost, cursor)
-            
-            conn.commit()
-            conn.close()
+            with db_pool.transaction(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                # Debit the budget only if enough remains
+                budget = cursor.execute(f'''
+                    UPDATE user_budgets SET 
+                        spent_budget = spent_budget + ?,
+                        remaining_budget = remaining_budget - ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE {owner} = ? AND remaining_budget >= ?
+                    RETURNING id, total_budget, spent_budget, remaining_budget
+                ''', (total_cost, total_cost, owner_id, total_cost)).fetchall()
+                
+                if not budget:
+                    row = cursor.execute(
+                        f'SELECT remaining_budget FROM user_budgets WHERE {owner} = ?', (owner_id,)
+                    ).fetchone()
+                    if not row:
+                        return {
+                            'success': False,
+                            'error': 'No budget found. Please create a budget first.'
+                        }
+                    return {
+                        'success': False,
+                        'error': f'Not enough budget. Need ${total_cost:.2f}, only ${row[0]:.2f} remaining.',
+                        'remaining': row[0],
+                        'needed': total_cost
+                    }
+                
+                budget_id, total_budget, spent_budget, remaining_budget = budget[0]
+                
+                # Add the expense
+                cursor.execute('''
+                    INSERT INTO budget_expenses 
+                    (budget_id, user_id, session_id, category, item_name, item_type, 
+                     price, quantity, total_cost, description, module)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    budget_id,
+                    user_id,
+                    session_id,
+                    category,
+                    item_name,
+                    item_type,
+                    price,
+                    quantity,
+                    total_cost,
+                    description,
+                    module
+                ))
+                expense_id = cursor.lastrowid
+                
+                # Update daily budget
+                daily = cursor.execute('''
+                    UPDATE daily_budget SET 
+                        daily_spent = daily_spent + ?,
+                        daily_remaining = daily_remaining - ?
+                    WHERE budget_id = ? AND day_number = ?
+                    RETURNING daily_spent, daily_remaining
+                ''', (total_cost, total_cost, budget_id, day_number)).fetchall()
+                
+                # Check for budget alerts
+                self.check_budget_alerts(budget_id, remaining_budget, cursor)
             
             return {
                 'success': True,
-                'expense_id': cursor.lastrowid,
+                'expense_id': expense_id,
                 'total_cost': total_cost,
-                'remaining_budget': budget['remaining_budget'] - total_cost,
+                'total_budget': total_budget,
+                'spent_budget': spent_budget,
+                'remaining_budget': remaining_budget,
+                'daily': {
+                    'day_number': day_number,
+                    'daily_spent': daily[0][0],
+                    'daily_remaining': daily[0][1]
+                } if daily else None,
                 'message': f'Added {item_name} for ${total_cost:.2f}'
             }
             
@@ -432,6 +612,178 @@ class BudgetTracker:
                 'error': str(e)
             }
     
+    # Bulk import columns and the defaults add_budget_expense uses; price is required
+    EXPENSE_DEFAULTS = {
+        'category': 'Uncategorized', 'item_name': 'Item', 'item_type': '', 'price': None,
+        'quantity': 1, 'description': '', 'module': 'general', 'day_number': 1
+    }
+    BULK_MAX_ROWS = 5000
+    
+    def validate_expenses(self, frame, trip_duration=None):
+        """
+        Validate and normalise a DataFrame of expenses in one vectorized pass.
+        Returns (valid rows with a total_cost column, [{'row', 'errors'}] for the rest);
+        rows are numbered from 1 in input order.
+        """
+        frame = frame.reset_index(drop=True).reindex(columns=list(self.EXPENSE_DEFAULTS))
+        problems = []
+        
+        numbers = {}
+        for column in ('price', 'quantity', 'day_number'):
+            values = frame[column]
+            # JSON true/false would otherwise count as 1/0, and lists or objects as NaN
+            scalar = values.map(lambda value: isinstance(value, (str, int, float)) and not isinstance(value, bool))
+            numbers[column] = pd.to_numeric(values.where(scalar), errors='coerce')
+            problems.append((values.notna() & (~scalar | numbers[column].isna()), f'{column} must be a number'))
+        
+        for column in self.EXPENSE_DEFAULTS:
+            if column not in numbers:
+                values = frame[column]
+                problems.append((values.notna() & ~values.map(lambda value: isinstance(value, str)),
+                                 f'{column} must be text'))
+        
+        price = numbers['price']
+        quantity = numbers['quantity'].fillna(self.EXPENSE_DEFAULTS['quantity'])
+        day_number = numbers['day_number'].fillna(self.EXPENSE_DEFAULTS['day_number'])
+        problems += [
+            (frame['price'].isna(), 'price is required'),
+            ((price < 0) | (price == float('inf')), 'price must be zero or more'),
+            ((quantity < 1) | (quantity % 1 != 0), 'quantity must be a whole number of at least 1'),
+            ((day_number < 1) | (day_number % 1 != 0), 'day_number must be a whole number of at least 1'),
+        ]
+        if trip_duration:
+            problems.append((day_number > trip_duration, f'day_number must be at most {trip_duration}'))
+        
+        bad = pd.Series(False, index=frame.index)
+        row_errors = {}
+        for mask, message in problems:
+            mask = mask.fillna(False)
+            bad |= mask
+            for index in frame.index[mask]:
+                row_errors.setdefault(index, []).append(message)
+        
+        valid = frame[~bad].copy()
+        for column, default in self.EXPENSE_DEFAULTS.items():
+            if column in numbers:
+                continue
+            text = valid[column].astype(object).where(valid[column].notna(), '').astype(str).str.strip()
+            valid[column] = text.mask(text == '', default)
+        valid['price'] = price[~bad]
+        valid['quantity'] = quantity[~bad].astype(int)
+        valid['day_number'] = day_number[~bad].astype(int)
+        valid['total_cost'] = valid['price'] * valid['quantity']
+        
+        errors = [{'row': index + 1, 'errors': messages} for index, messages in sorted(row_errors.items())]
+        return valid, errors
+    
+    def add_expenses(self, user_id=None, session_id=None, frame=None, skip_invalid=False):
+        """
+        Import many expenses in one transaction: rows are validated together, the
+        budget is debited once for their total, expenses go in with one executemany
+        and each day is updated once with its aggregate. Invalid rows fail the whole
+        import unless `skip_invalid`, in which case they are reported and left out.
+        """
+        if user_id:
+            owner, owner_id = 'user_id', user_id
+        elif session_id:
+            owner, owner_id = 'session_id', session_id
+        else:
+            return {
+                'success': False,
+                'error': 'No budget found. Please create a budget first.'
+            }
+        
+        try:
+            with db_pool.transaction(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                # BEGIN IMMEDIATE holds the write lock, so this row can't change before the debit
+                row = cursor.execute(
+                    f'SELECT id, remaining_budget, trip_duration FROM user_budgets WHERE {owner} = ?', (owner_id,)
+                ).fetchone()
+                if not row:
+                    return {
+                        'success': False,
+                        'error': 'No budget found. Please create a budget first.'
+                    }
+                budget_id, remaining, trip_duration = row
+                
+                valid, errors = self.validate_expenses(frame, trip_duration)
+                if errors and not skip_invalid:
+                    return {
+                        'success': False,
+                        'error': f'{len(errors)} of {len(frame)} expenses are invalid; nothing was added.',
+                        'invalid': errors
+                    }
+                if valid.empty:
+                    return {
+                        'success': False,
+                        'error': 'No valid expenses to add.',
+                        'invalid': errors
+                    }
+                
+                total_cost = float(valid['total_cost'].sum())
+                if total_cost > remaining:
+                    return {
+                        'success': False,
+                        'error': f'Not enough budget. Need ${total_cost:.2f}, only ${remaining:.2f} remaining.',
+                        'remaining': remaining,
+                        'needed': total_cost,
+                        'invalid': errors
+                    }
+                
+                total_budget, spent_budget, remaining_budget = cursor.execute('''
+                    UPDATE user_budgets SET 
+                        spent_budget = spent_budget + ?,
+                        remaining_budget = remaining_budget - ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                    RETURNING total_budget, spent_budget, remaining_budget
+                ''', (total_cost, total_cost, budget_id)).fetchone()
+                
+                columns = ('category', 'item_name', 'item_type', 'price', 'quantity', 'total_cost',
+                           'description', 'module')
+                cursor.executemany('''
+                    INSERT INTO budget_expenses 
+                    (budget_id, user_id, session_id, category, item_name, item_type, 
+                     price, quantity, total_cost, description, module)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (budget_id, user_id, session_id) + values
+                    for values in zip(*(valid[column].tolist() for column in columns))
+                ])
+                
+                # One update per day touched
+                by_day = valid.groupby('day_number')['total_cost'].sum()
+                cursor.executemany('''
+                    UPDATE daily_budget SET 
+                        daily_spent = daily_spent + ?,
+                        daily_remaining = daily_remaining - ?
+                    WHERE budget_id = ? AND day_number = ?
+                ''', [(float(day_total), float(day_total), budget_id, int(day))
+                      for day, day_total in by_day.items()])
+                
+                self.check_budget_alerts(budget_id, remaining_budget, cursor)
+            
+            return {
+                'success': True,
+                'added': len(valid),
+                'total_cost': total_cost,
+                'total_budget': total_budget,
+                'spent_budget': spent_budget,
+                'remaining_budget': remaining_budget,
+                'by_day': {int(day): float(day_total) for day, day_total in by_day.items()},
+                'invalid': errors,
+                'message': f'Added {len(valid)} expenses for ${total_cost:.2f}'
+            }
+            
+        except Exception as e:
+            print(f"❌ Error adding expenses: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def check_budget_alerts(self, budget_id, new_remaining, cursor):
         """Check and create budget alerts"""
         # Get budget info
@@ -470,7 +822,7 @@ class BudgetTracker:
                      budget_name=None, currency=None, trip_duration=None, notes=None):
         """Update budget information"""
         try:
-            budget_result = self.get_budget(user_id=user_id, session_id=session_id)
+            budget_result = self.get_budget(user_id=user_id, session_id=session_id, fields=('budget',))
             if not budget_result['success'] or not budget_result['budget']:
                 return {
                     'success': False,
@@ -480,7 +832,7 @@ class BudgetTracker:
             budget = budget_result['budget']
             budget_id = budget['id']
             
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             # Build update query dynamically
@@ -560,7 +912,7 @@ class BudgetTracker:
     def remove_expense(self, expense_id, user_id=None, session_id=None):
         """Remove an expense and refund the budget"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             # Get expense details
@@ -622,7 +974,7 @@ class BudgetTracker:
     def get_expense_summary(self, user_id=None, session_id=None):
         """Get summary of expenses by category and module"""
         try:
-            budget_result = self.get_budget(user_id=user_id, session_id=session_id)
+            budget_result = self.get_budget(user_id=user_id, session_id=session_id, fields=('budget', 'expense_count'))
             if not budget_result['success'] or not budget_result['budget']:
                 return {
                     'success': False,
@@ -631,15 +983,15 @@ class BudgetTracker:
             
             budget = budget_result['budget']
             
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
-            # Expenses by category
+            # Expenses by category and by module come from the rollups: a few rows per
+            # budget however many expenses it has
             cursor.execute('''
-                SELECT category, COUNT(*) as count, SUM(total_cost) as total 
-                FROM budget_expenses 
+                SELECT category, expense_count, total 
+                FROM budget_category_totals 
                 WHERE budget_id = ?
-                GROUP BY category 
                 ORDER BY total DESC
             ''', (budget['id'],))
             
@@ -653,10 +1005,9 @@ class BudgetTracker:
             
             # Expenses by module
             cursor.execute('''
-                SELECT module, COUNT(*) as count, SUM(total_cost) as total 
-                FROM budget_expenses 
+                SELECT module, expense_count, total 
+                FROM budget_module_totals 
                 WHERE budget_id = ?
-                GROUP BY module 
                 ORDER BY total DESC
             ''', (budget['id'],))
             
@@ -673,7 +1024,7 @@ class BudgetTracker:
                 SELECT item_name, category, module, total_cost, date_added 
                 FROM budget_expenses 
                 WHERE budget_id = ?
-                ORDER BY date_added DESC 
+                ORDER BY date_added DESC, id DESC 
                 LIMIT 10
             ''', (budget['id'],))
             
@@ -690,7 +1041,7 @@ class BudgetTracker:
                     'by_category': by_category,
                     'by_module': by_module,
                     'recent_expenses': recent_expenses,
-                    'total_expenses': len(budget_result['expenses']),
+                    'total_expenses': budget_result['expense_count'],
                     'total_spent': budget['spent_budget'],
                     'total_remaining': budget['remaining_budget'],
                     'budget_utilization': (budget['spent_budget'] / budget['total_budget'] * 100) if budget['total_budget'] > 0 else 0
@@ -707,7 +1058,7 @@ class BudgetTracker:
     def reset_budget(self, user_id=None, session_id=None, keep_expenses=False):
         """Reset budget (clear expenses or entire budget)"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             if keep_expenses:
@@ -780,7 +1131,7 @@ class CustomPlacesManager:
     
     def init_database(self):
         """Create database for user-submitted custom places"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         # Custom places table
@@ -863,7 +1214,7 @@ class CustomPlacesManager:
     
     def create_place(self, user_id, place_data):
         """Add a new custom place with intelligent category suggestion"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
@@ -908,7 +1259,7 @@ class CustomPlacesManager:
     
     def get_all_places(self, place_type=None, limit=50):
         """Get all custom places, optionally filtered by type"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         if place_type:
@@ -945,7 +1296,7 @@ class CustomPlacesManager:
     
     def add_to_itinerary(self, user_id, place_id):
         """Add a custom place to user's itinerary"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
@@ -975,7 +1326,7 @@ class CustomPlacesManager:
     
     def get_user_custom_places(self, user_id):
         """Get all custom places in a user's itinerary"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -1013,7 +1364,7 @@ class MicroblogManager:
     
     def init_database(self):
         """Initialize microblog database"""
-        conn = sqlite3.connect(self.db_name)
+        conn = db_pool.connect(self.db_name)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -1035,7 +1386,7 @@ class MicroblogManager:
     def create_post(self, user_id, username, content, page_context=None):
         """Create a new microblog post"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_pool.connect(self.db_name)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -1055,7 +1406,7 @@ class MicroblogManager:
     def get_posts(self, page_context=None, limit=50):
         """Get microblog posts"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_pool.connect(self.db_name)
             cursor = conn.cursor()
             
             if page_context:
@@ -1095,7 +1446,7 @@ class MicroblogManager:
     def delete_post(self, post_id, user_id):
         """Delete a microblog post"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_pool.connect(self.db_name)
             cursor = conn.cursor()
             
             cursor.execute('DELETE FROM microblog_posts WHERE id = ? AND user_id = ?', (post_id, user_id))
@@ -1113,243 +1464,68 @@ class MicroblogManager:
 microblog_manager = MicroblogManager()
 
 # ============================================================================
-# ORIGINAL MUSEUM SCRAPER CLASS (unchanged)
+# ORIGINAL MUSEUM SCRAPER CLASS (moved to scrapers/museums.py)
 # ============================================================================
 
-class MuseumScraper:
-    """Web scraper for museum hours with improved parsing"""
-    
-    def scrape_met_museum(self):
-        """Scrape MET Museum hours"""
-        try:
-            url = "https://www.metmuseum.org/visit/plan-your-visit/metropolitan-museum-of-art"
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Sun-Thu: 10:00 AM - 5:30 PM, Fri-Sat: 10:00 AM - 9:00 PM"
-            
-            # Look for hours in MET page with multiple strategies
-            hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
-                                         text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|10.*AM.*5.*PM', re.IGNORECASE))
-            
-            for section in hour_sections:
-                text = section.get_text().strip()
-                if '10' in text and ('AM' in text or 'am' in text) and ('PM' in text or 'pm' in text):
-                    hours = text[:200]
-                    break
-            
-            # Also check for structured hours data
-            hour_divs = soup.find_all(['div', 'section'], class_=re.compile(r'hour|time|schedule', re.IGNORECASE))
-            for div in hour_divs:
-                text = div.get_text().strip()
-                if len(text) > 50 and ('AM' in text or 'PM' in text):
-                    hours = text[:200]
-                    break
-            
-            return {
-                'museum': 'MET Museum',
-                'hours': hours,
-                'address': '1000 5th Ave, New York, NY 10028',
-                'phone': '(212) 535-7710',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'source': 'metmuseum.org'
-            }
-            
-        except Exception as e:
-            return {
-                'museum': 'MET Museum',
-                'hours': 'Sun-Thu: 10:00 AM - 5:30 PM, Fri-Sat: 10:00 AM - 9:00 PM',
-                'address': '1000 5th Ave, New York, NY 10028',
-                'phone': '(212) 535-7710',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'error': str(e)[:100],
-                'source': 'fallback'
-            }
-    
-    def scrape_ice_cream_museum(self):
-        """Scrape Museum of Ice Cream hours"""
-        try:
-            url = "https://www.museumoficecream.com/new-york"
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Look for hours with multiple patterns
-            hours = "Mon-Sun: 10:00 AM - 9:00 PM"
-            all_text = soup.get_text()
-            
-            # Pattern 1: Direct hour patterns
-            hour_patterns = [
-                r'([A-Za-z]{3,9}[-\s]*\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm])',
-                r'(\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm])',
-                r'[Hh]ours?[:\s]*([^\n]{10,80})'
-            ]
-            
-            for pattern in hour_patterns:
-                match = re.search(pattern, all_text)
-                if match:
-                    hours = match.group(1).strip()
-                    break
-            
-            # Pattern 2: Look for opening hours sections
-            hour_sections = soup.find_all(['p', 'div', 'span'], 
-                                         text=re.compile(r'[Oo]pen|[Hh]ours?|[Mm]on.*[Ss]un', re.IGNORECASE))
-            for section in hour_sections:
-                text = section.get_text().strip()
-                if 'AM' in text or 'PM' in text:
-                    hours = text[:150]
-                    break
-            
-            return {
-                'museum': 'Museum of Ice Cream',
-                'hours': hours,
-                'address': '558 Broadway, New York, NY 10012',
-                'phone': '(646) 459-3515',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'source': 'museumoficecream.com'
-            }
-            
-        except Exception as e:
-            return {
-                'museum': 'Museum of Ice Cream',
-                'hours': 'Mon-Sun: 10:00 AM - 9:00 PM',
-                'address': '558 Broadway, New York, NY 10012',
-                'phone': '(646) 459-3515',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'error': str(e)[:100],
-                'source': 'fallback'
-            }
-    
-    def scrape_ukrainian_museum(self):
-        """Scrape Ukrainian Museum hours"""
-        try:
-            url = "https://www.ukrainianmuseum.org/"
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Wed-Sun: 11:30 AM - 5:00 PM"
-            
-            # Multiple search strategies
-            patterns = [
-                r'[Hh]ours?[:\s]*([^\n]{10,100})',
-                r'[Oo]pen[:\s]*([^\n]{10,100})',
-                r'(\d{1,2}:\d{2}\s*[APap][Mm]\s*[-–]\s*\d{1,2}:\d{2}\s*[APap][Mm])'
-            ]
-            
-            all_text = soup.get_text()
-            for pattern in patterns:
-                match = re.search(pattern, all_text)
-                if match:
-                    hours = match.group(1).strip()[:100]
-                    break
-            
-            # Also search in footer or specific sections
-            footer = soup.find(['footer', 'div'], class_=re.compile(r'footer|hours|visit', re.IGNORECASE))
-            if footer:
-                footer_text = footer.get_text()
-                for pattern in patterns:
-                    match = re.search(pattern, footer_text)
-                    if match:
-                        hours = match.group(1).strip()[:100]
-                        break
-            
-            return {
-                'museum': 'Ukrainian Museum',
-                'hours': hours,
-                'address': '222 East 6th Street, New York, NY 10003',
-                'phone': '(212) 228-0110',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'source': 'ukrainianmuseum.org'
-            }
-            
-        except Exception as e:
-            return {
-                'museum': 'Ukrainian Museum',
-                'hours': 'Wed-Sun: 11:30 AM - 5:00 PM',
-                'address': '222 East 6th Street, New York, NY 10003',
-                'phone': '(212) 228-0110',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'error': str(e)[:100],
-                'source': 'fallback'
-            }
+# Shared with app.py, landmark.py and the NY day service through the scraper registry
+scraper = museum_scraper
+
+# ============================================================================
+# STREAMING RESPONSES (NDJSON / server-sent events)
+# ============================================================================
+
+STREAM_MIMETYPES = {
+    'application/x-ndjson': 'ndjson',
+    'text/event-stream': 'sse'
+}
+
+def stream_mode():
+    """'ndjson' or 'sse' when the client asked for a streamed response in Accept, else None"""
+    best = request.accept_mimetypes.best_match(['application/json'] + list(STREAM_MIMETYPES))
+    return STREAM_MIMETYPES.get(best)
+
+def stream_response(records, mode):
+    """
+    Send each record as soon as it is produced: one JSON object per line (NDJSON),
+    or an SSE event named after the record's 'type'
+    """
+    def generate():
+        for record in records:
+            payload = json.dumps(record, default=str)
+            if mode == 'sse':
+                yield f"event: {record.get('type', 'message')}\ndata: {payload}\n\n"
+            else:
+                yield payload + '\n'
     
-    def scrape_empire_state(self):
-        """Scrape Empire State Building hours"""
-        try:
-            url = "https://www.esbnyc.com/"
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Daily: 8:00 AM - 2:00 AM"
-            
-            # Multiple search strategies
-            hour_text = soup.get_text()
-            
-            # Pattern 1: Direct time patterns
-            hour_patterns = [
-                r'(\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm])',
-                r'[Hh]ours?[:\s]*([^\n]{10,80})',
-                r'[Oo]pen[:\s]*([^\n]{10,80})'
-            ]
-            
-            for pattern in hour_patterns:
-                match = re.search(pattern, hour_text)
-                if match:
-                    found = match.group(1).strip()
-                    if 'AM' in found or 'PM' in found:
-                        hours = f"Daily: {found}" if 'daily' not in found.lower() else found
-                        break
-            
-            # Pattern 2: Look in specific sections
-            visit_sections = soup.find_all(['div', 'section'], 
-                                          text=re.compile(r'[Vv]isit|[Hh]ours?|[Oo]bservatory', re.IGNORECASE))
-            for section in visit_sections:
-                text = section.get_text()
-                for pattern in hour_patterns:
-                    match = re.search(pattern, text)
-                    if match:
-                        found = match.group(1).strip()
-                        if 'AM' in found or 'PM' in found:
-                            hours = found
-                            break
-            
-            return {
-                'museum': 'Empire State Building',
-                'hours': hours,
-                'address': '20 W 34th St, New York, NY 10001',
-                'phone': '(212) 736-3100',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'source': 'esbnyc.com'
-            }
-            
-        except Exception as e:
-            return {
-                'museum': 'Empire State Building',
-                'hours': 'Daily: 8:00 AM - 2:00 AM',
-                'address': '20 W 34th St, New York, NY 10001',
-                'phone': '(212) 736-3100',
-                'status': 'open',
-                'last_updated': datetime.now().strftime("%I:%M %p"),
-                'error': str(e)[:100],
-                'source': 'fallback'
-            }
+    mimetype = 'text/event-stream' if mode == 'sse' else 'application/x-ndjson'
+    return current_app.response_class(generate(), mimetype=mimetype, headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # stop nginx buffering the stream
+    })
 
-# Create scraper instance
-scraper = MuseumScraper()
+def stream_sources(results, started, **summary):
+    """
+    Records for a multi-source endpoint: one 'result' per (key, data, latency_ms)
+    as it arrives, then a 'summary' with counts and timings
+    """
+    count = 0
+    succeeded = 0
+    latency = {}
+    for key, data, latency_ms in results:
+        count += 1
+        succeeded += data.get('source') != 'fallback'
+        latency[key] = latency_ms
+        yield {'type': 'result', 'key': key, 'data': data, 'latency_ms': latency_ms}
+    record = {'type': 'summary'}
+    record.update(summary)
+    record.update({
+        'count': count,
+        'succeeded': succeeded,
+        'latency_ms': latency,
+        'elapsed_ms': round((time.monotonic() - started) * 1000, 1),
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    })
+    yield record
 
 # ============================================================================
 # ORIGINAL MUSEUM API ENDPOINTS (unchanged)
@@ -1358,37 +1534,39 @@ scraper = MuseumScraper()
 @app.route('/api/met')
 def get_met_hours():
     """GET MET Museum hours"""
-    data = scraper.scrape_met_museum()
+    data = scraper.get_hours('met')
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/icecream')
 def get_icecream_hours():
     """GET Ice Cream Museum hours"""
-    data = scraper.scrape_ice_cream_museum()
+    data = scraper.get_hours('icecream')
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/ukrainian')
 def get_ukrainian_hours():
     """GET Ukrainian Museum hours"""
-    data = scraper.scrape_ukrainian_museum()
+    data = scraper.get_hours('ukrainian')
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/empire')
 def get_empire_hours():
     """GET Empire State Building hours"""
-    data = scraper.scrape_empire_state()
+    data = scraper.get_hours('empire')
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/all')
 def get_all_hours():
-    """GET all museum hours at once"""
-    data = {
-        'met': scraper.scrape_met_museum(),
-        'icecream': scraper.scrape_ice_cream_museum(),
-        'ukrainian': scraper.scrape_ukrainian_museum(),
-        'empire': scraper.scrape_empire_state(),
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    """GET all museum hours at once (scraped concurrently, bounded by ?deadline=seconds)"""
+    deadline = request.args.get('deadline', type=float)
+    mode = stream_mode()
+    if mode:
+        # Accept: application/x-ndjson or text/event-stream: each museum as soon as it is ready
+        started = time.monotonic()
+        return stream_response(stream_sources(scraper.iter_all(deadline), started, success=True,
+                                              deadline_s=deadline or scraper.ALL_DEADLINE), mode)
+    data = scraper.scrape_all(deadline=deadline)
+    data['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     return jsonify({'success': True, 'data': data})
 
 @app.route('/api/test')
@@ -1404,6 +1582,11 @@ def test_api():
             '/api/ukrainian': 'Ukrainian Museum hours',
             '/api/empire': 'Empire State Building hours',
             '/api/all': 'All museums at once',
+            '/api/all?deadline=N': 'All museums, returning fallbacks for sites slower than N seconds',
+            '/api/all (Accept: application/x-ndjson or text/event-stream)': 'Each museum streamed as soon as it is scraped, then a summary',
+            '/api/open-now': 'Museums and breakfast places open now (?at=ISO time optional)',
+            '/api/hours/<place>': 'Open/closed status, next opening and weekly schedule for one place',
+            '/api/scraper/circuits': 'Circuit breaker state per scraped site',
             '/api/test': 'Test endpoint'
         }
     })
@@ -1415,30 +1598,38 @@ def test_api():
 class BreakfastScraper:
     """Web scraper for breakfast restaurant hours"""
     
+    # Shared cache lifetimes (seconds) for scraped restaurant snapshots
+    CACHE_TTL = int(os.getenv('BREAKFAST_CACHE_TTL', 2 * 60 * 60))
+    CACHE_STALE_TTL = int(os.getenv('BREAKFAST_CACHE_STALE_TTL', 24 * 60 * 60))
+    
+    # Overall time budget (seconds) for the streamed /api/breakfast
+    ALL_DEADLINE = float(os.getenv('BREAKFAST_ALL_DEADLINE', 8))
+    
+    # Restaurant key -> name stored with its hours
+    RESTAURANTS = {
+        'jacks': "Jack's Wife Freda",
+        'shuka': "Shuka",
+        'sarabeths': "Sarabeth's",
+        'bagel': "Ess-a-Bagel"
+    }
+    
     def __init__(self):
         self.db_path = "breakfast_places.db"
+        self.store = breakfast_store
         self.init_database()
-    
-    def init_database(self):
-        """Create database table for scraped restaurant data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS breakfast_hours (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                restaurant TEXT,
-                location TEXT,
-                day TEXT,
-                open_time TEXT,
-                close_time TEXT,
-                hours_text TEXT,
-                scraped_at TIMESTAMP
+        # One registry source per restaurant, shared by every entry point
+        for key in self.scrapers():
+            scrape_registry.register(
+                f'breakfast:{key}',
+                lambda key=key: self.load_hours(key),
+                ttl=self.CACHE_TTL,
+                stale_ttl=self.CACHE_STALE_TTL
             )
-        ''')
-        
-        conn.commit()
-        conn.close()
+    
+    def init_database(self):
+        """Create the snapshot tables (compacts a legacy append-only breakfast_hours table)"""
+        self.store.init_database()
         print("Breakfast Scraper Database initialized")
     
     def scrape_jacks_wife_freda(self):
@@ -1448,21 +1639,7 @@ class BreakfastScraper:
             url = "https://jackswifefreda.com/"
             
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Try to find hours - these selectors might need adjustment
-            hours = "Mon-Sun: 8:00 AM - 10:00 PM"
-            
-            # Search for hour patterns
-            hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
-                                         text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|8.*AM.*10.*PM', re.IGNORECASE))
-            
-            for section in hour_sections:
-                text = section.get_text().strip()
-                if ('8' in text or '9' in text) and ('AM' in text or 'am' in text) and ('PM' in text or 'pm' in text):
-                    hours = text[:150]
-                    break
+            hours = conditional_fetcher.fetch(url, HOURS_SPECS['jacks'], headers=headers, timeout=10)
             
             scraped_data = {
                 'restaurant': "Jack's Wife Freda",
@@ -1501,19 +1678,7 @@ class BreakfastScraper:
             url = "https://www.shukanewyork.com/"
             
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Mon-Thu: 5:00 PM - 11:00 PM, Fri: 12:00 PM - 12:00 AM, Sat-Sun: 11:00 AM - 11:00 PM"
-            
-            hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
-                                         text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|5.*PM.*11.*PM', re.IGNORECASE))
-            
-            for section in hour_sections:
-                text = section.get_text().strip()
-                if 'PM' in text or 'AM' in text:
-                    hours = text[:150]
-                    break
+            hours = conditional_fetcher.fetch(url, HOURS_SPECS['shuka'], headers=headers, timeout=10)
             
             scraped_data = {
                 'restaurant': "Shuka",
@@ -1553,19 +1718,7 @@ class BreakfastScraper:
             url = "https://sarabethsrestaurants.com/"
             
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Mon-Fri: 8:00 AM - 10:00 PM, Sat-Sun: 9:00 AM - 11:00 PM"
-            
-            hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
-                                         text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|8.*AM.*10.*PM', re.IGNORECASE))
-            
-            for section in hour_sections:
-                text = section.get_text().strip()
-                if ('8' in text or '9' in text) and ('AM' in text or 'am' in text):
-                    hours = text[:150]
-                    break
+            hours = conditional_fetcher.fetch(url, HOURS_SPECS['sarabeths'], headers=headers, timeout=10)
             
             scraped_data = {
                 'restaurant': "Sarabeth's",
@@ -1605,19 +1758,7 @@ class BreakfastScraper:
             url = "https://www.ess-a-bagel.com/"
             
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            hours = "Mon-Fri: 6:00 AM - 6:00 PM, Sat-Sun: 6:30 AM - 5:00 PM"
-            
-            hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
-                                         text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|6.*AM.*6.*PM', re.IGNORECASE))
-            
-            for section in hour_sections:
-                text = section.get_text().strip()
-                if '6:' in text and ('AM' in text or 'am' in text):
-                    hours = text[:150]
-                    break
+            hours = conditional_fetcher.fetch(url, HOURS_SPECS['bagel'], headers=headers, timeout=10)
             
             scraped_data = {
                 'restaurant': "Ess-a-Bagel",
@@ -1651,36 +1792,11 @@ class BreakfastScraper:
             }
     
     def save_to_database(self, restaurant_data):
-        """Save scraped restaurant data to database"""
+        """Save scraped restaurant data; rows are only rewritten when the hours change"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Save each day's hours as separate record
-            hours = restaurant_data.get('hours', {})
-            for day, hours_text in hours.items():
-                # Parse open and close times
-                open_time = close_time = ''
-                if ' - ' in hours_text:
-                    open_time, close_time = hours_text.split(' - ')
-                
-                cursor.execute('''
-                    INSERT INTO breakfast_hours 
-                    (restaurant, location, day, open_time, close_time, hours_text, scraped_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    restaurant_data['restaurant'],
-                    restaurant_data.get('location', ''),
-                    day,
-                    open_time.strip(),
-                    close_time.strip(),
-                    hours_text,
-                    restaurant_data.get('scraped_at', datetime.now().isoformat())
-                ))
-            
-            conn.commit()
-            conn.close()
-            print(f"✅ Saved: {restaurant_data['restaurant']}")
+            version, changed = self.store.save(restaurant_data)
+            if changed:
+                print(f"✅ Saved: {restaurant_data['restaurant']} (version {version})")
             
         except Exception as e:
             print(f"⚠️ Database error: {e}")
@@ -1701,45 +1817,75 @@ class BreakfastScraper:
         print(f"✅ Scraping complete! {success_count} out of 4 successful.")
         return results
     
+    def scrapers(self):
+        """Map of restaurant key to its live scrape method"""
+        return {
+            'jacks': self.scrape_jacks_wife_freda,
+            'shuka': self.scrape_shuka,
+            'sarabeths': self.scrape_sarabeths,
+            'bagel': self.scrape_ess_a_bagel
+        }
+    
+    def load_hours(self, key):
+        """Scrape a restaurant and attach its parsed weekly schedule (cache loader)"""
+        data = self.scrapers()[key]()
+        schedule = hours_index.schedule(data.get('hours'))
+        data['schedule'] = schedule.by_day() if schedule else None
+        return data
+    
+    def get_hours(self, key):
+        """Get the latest restaurant snapshot from the shared cache, with open/closed status for now"""
+        data = dict(scrape_registry.get(f'breakfast:{key}'))
+        hours_index.update(f'breakfast:{key}', data.get('restaurant'), data.get('hours'))
+        # 'status' already reports whether the scrape succeeded
+        status = hours_index.status(f'breakfast:{key}')
+        data['open_status'] = status.pop('status')
+        data.update(status)
+        return data
+    
+    def refresh_hours(self, key):
+        """Scrape a restaurant now and store the snapshot (scheduler job)"""
+        scrape_registry.refresh(f'breakfast:{key}')
+    
+    def get_all_hours(self):
+        """Get the latest snapshot of all four breakfast places"""
+        return [self.get_hours(key) for key in self.scrapers()]
+    
+    def iter_all_hours(self, deadline=None):
+        """
+        Yield (key, data, latency_ms) for each breakfast place as soon as it is ready,
+        scraping concurrently within an overall deadline (streaming /api/breakfast)
+        """
+        if not deadline or deadline <= 0:
+            deadline = self.ALL_DEADLINE
+        tasks = {key: (lambda key=key: self.get_hours(key)) for key in self.scrapers()}
+        
+        for key, outcome in iter_fan_out(tasks, deadline):
+            data = outcome['result']
+            if data is None:
+                data = {
+                    'restaurant': self.RESTAURANTS[key],
+                    'error': f'Timed out after {deadline:g}s' if outcome['timed_out'] else outcome['error'],
+                    'status': 'failed',
+                    'source': 'fallback'
+                }
+            yield key, data, outcome['latency_ms']
+    
     def get_restaurant_hours_formatted(self, restaurant_name):
-        """Get scraped restaurant hours formatted by day"""
+        """Get the latest scraped restaurant hours formatted by day"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT day, open_time, close_time, hours_text, scraped_at 
-                FROM breakfast_hours 
-                WHERE restaurant = ?
-                ORDER BY 
-                    CASE day
-                        WHEN 'Monday' THEN 1
-                        WHEN 'Tuesday' THEN 2
-                        WHEN 'Wednesday' THEN 3
-                        WHEN 'Thursday' THEN 4
-                        WHEN 'Friday' THEN 5
-                        WHEN 'Saturday' THEN 6
-                        WHEN 'Sunday' THEN 7
-                        ELSE 8
-                    END
-            ''', (restaurant_name,))
-            
-            days = []
-            for row in cursor.fetchall():
-                day_data = {
-                    'day': row[0],
-                    'open_time': row[1],
-                    'close_time': row[2],
-                    'hours_text': row[3],
-                    'scraped_at': row[4]
-                }
-                days.append(day_data)
-            
-            conn.close()
-            return days
+            return self.store.get_days(restaurant_name)
         except Exception as e:
             print(f"Error getting hours: {e}")
             return []
+    
+    def get_restaurant_history(self, restaurant_name, limit=20):
+        """Get the recorded changes to a restaurant's hours, newest first"""
+        try:
+            return self.store.get_history(restaurant_name, limit)
+        except Exception as e:
+            print(f"Error getting hours history: {e}")
+            return []
 
 # Create breakfast scraper instance
 breakfast_scraper = BreakfastScraper()
@@ -1751,13 +1897,37 @@ breakfast_scraper = BreakfastScraper()
 class BroadwayScraper:
     """Web scraper for Broadway show availability"""
     
+    # Shared cache lifetimes (seconds) for scraped availability snapshots
+    CACHE_TTL = int(os.getenv('BROADWAY_CACHE_TTL', 20 * 60))
+    CACHE_STALE_TTL = int(os.getenv('BROADWAY_CACHE_STALE_TTL', 60 * 60))
+    
+    # Total time budget (seconds) for racing the Broadway.com URLs, well under gunicorn's 30 s
+    # timeout, and the delay before each next URL is started alongside the ones still running
+    RACE_DEADLINE = float(os.getenv('BROADWAY_RACE_DEADLINE', 12))
+    HEDGE_DELAY = float(os.getenv('BROADWAY_HEDGE_DELAY', 1.5))
+    
+    # Availability is cached per (date, quantity); days that failed are retried after a minute
+    FALLBACK_CACHE_TTL = 60
+    MAX_RANGE_DAYS = 31
+    
+    # Per-day data comes from find-by-date for that day alone; the other pages list the
+    # current shows without dates. One request fetches at most DAY_CONCURRENCY days at once
+    FIND_BY_DATE_URL = "https://www.broadway.com/shows/find-by-date/?query=&start_date={start}&end_date={end}&quantity={quantity}"
+    LISTING_URLS = [
+        "https://www.broadway.com/shows/tickets/",
+        "https://www.broadway.com/shows/",
+        "https://www.broadway.com/"
+    ]
+    DAY_CONCURRENCY = int(os.getenv('BROADWAY_DAY_CONCURRENCY', 4))
+    DAY_TIMEOUT = float(os.getenv('BROADWAY_DAY_TIMEOUT', 8))
+    
     def __init__(self):
         self.db_path = "broadway_shows.db"
         self.init_database()
     
     def init_database(self):
         """Create database table for scraped Broadway data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -1774,10 +1944,94 @@ class BroadwayScraper:
             )
         ''')
         
+        # History is read newest first, overall or for one show
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_broadway_shows_scraped
+            ON broadway_shows (scraped_at, id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_broadway_shows_show_scraped
+            ON broadway_shows (show_name, scraped_at, id)
+        ''')
+        
+        # Daily rollup: the latest observation per show per day, kept current on insert
+        # (SQLite takes the bare columns of the MAX(scraped_at) row when back-filling)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS broadway_show_daily (
+                show_name TEXT,
+                day TEXT,
+                price_range TEXT,
+                status TEXT,
+                scraped_at TIMESTAMP,
+                samples INTEGER DEFAULT 1,
+                PRIMARY KEY (day, show_name)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_broadway_show_daily_show
+            ON broadway_show_daily (show_name, day)
+        ''')
+        
+        # Numeric prices parsed from price_range (columns added after the tables shipped)
+        prices_added = False
+        for table in ('broadway_shows', 'broadway_show_daily'):
+            columns = [row[1] for row in cursor.execute(f'PRAGMA table_info({table})')]
+            for column in ('min_price', 'max_price'):
+                if column not in columns:
+                    cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} REAL')
+                    prices_added = True
+        if cursor.execute('SELECT COUNT(*) FROM broadway_show_daily').fetchone()[0] == 0:
+            cursor.execute('''
+                INSERT INTO broadway_show_daily
+                (show_name, day, price_range, status, scraped_at, samples, min_price, max_price)
+                SELECT show_name, substr(scraped_at, 1, 10), price_range, status, MAX(scraped_at), COUNT(*),
+                       min_price, max_price
+                FROM broadway_shows
+                WHERE scraped_at IS NOT NULL
+                GROUP BY show_name, substr(scraped_at, 1, 10)
+            ''')
+        
+        # Rows stored before ingestion parsed prices are back-filled once, when the columns
+        # arrive; `flask custom backfill_broadway_prices` re-runs it
+        if prices_added:
+            self.backfill_prices(cursor)
+        
+        # "Under $X on day D" and "cheapest this week" are range scans on these
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_broadway_show_daily_price
+            ON broadway_show_daily (day, min_price)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_broadway_shows_price
+            ON broadway_shows (min_price, scraped_at)
+        ''')
+        
         conn.commit()
         conn.close()
         print("Broadway Scraper Database initialized")
     
+    def backfill_prices(self, cursor=None):
+        """Parse min_price/max_price for rows that have a price_range but no prices; returns rows updated"""
+        conn = None
+        if cursor is None:
+            conn = db_pool.connect(self.db_path)
+            cursor = conn.cursor()
+        
+        updated = 0
+        for table in ('broadway_shows', 'broadway_show_daily'):
+            rows = cursor.execute(f'''
+                SELECT rowid, price_range FROM {table} WHERE min_price IS NULL AND price_range LIKE '%$%'
+            ''').fetchall()
+            prices = [parse_price_range(price_range) + (rowid,) for rowid, price_range in rows]
+            prices = [row for row in prices if row[0] is not None]
+            cursor.executemany(f'UPDATE {table} SET min_price = ?, max_price = ? WHERE rowid = ?', prices)
+            updated += len(prices)
+        
+        if conn is not None:
+            conn.commit()
+            conn.close()
+        return updated
+    
     def scrape_broadway_availability(self, start_date=None, end_date=None, quantity=2):
         """
         Scrape Broadway.com show availability data for the specified date range
@@ -1804,58 +2058,300 @@ class BroadwayScraper:
                 f"https://www.broadway.com/shows/find-by-date/?query=&start_date={start_date}&end_date={end_date}&quantity={quantity}"
             ]
             
-            for url in urls_to_try:
-                try:
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                        'Accept-Encoding': 'gzip, deflate, br',
-                        'DNT': '1',
-                        'Connection': 'keep-alive',
-                        'Upgrade-Insecure-Requests': '1',
-                        'Sec-Fetch-Dest': 'document',
-                        'Sec-Fetch-Mode': 'navigate',
-                        'Sec-Fetch-Site': 'none',
-                        'Sec-Fetch-User': '?1',
-                        'Cache-Control': 'max-age=0'
-                    }
-                    
-                    response = requests.get(url, headers=headers, timeout=15)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Extract show information from the page
-                    shows = self.extract_shows_from_html(soup, start_date, end_date)
-                    
-                    if shows:
-                        scraped_data = {
-                            'source': 'broadway.com',
-                            'date_range': f'{start_date} to {end_date}',
-                            'ticket_quantity': quantity,
-                            'shows': shows,
-                            'total_found': len(shows),
-                            'scraped_at': datetime.now().isoformat(),
-                            'status': 'success',
-                            'url_used': url
-                        }
-                        
-                        print(f"✅ Found {len(shows)} Broadway shows")
-                        return scraped_data
-                        
-                except Exception as e:
-                    print(f"⚠️ URL {url} failed: {e}")
-                    continue
+            # Race the URLs (hedged) and keep the first page that yields shows
+            race_result = race(
+                urls_to_try,
+                lambda url, timeout: self.fetch_shows(url, start_date, end_date, timeout),
+                deadline=self.RACE_DEADLINE,
+                hedge_delay=self.HEDGE_DELAY
+            )
+            race_info = {
+                'winner': race_result['winner'],
+                'elapsed_ms': race_result['elapsed_ms'],
+                'attempts': [
+                    {'url': a['candidate'], 'ok': a['ok'], 'error': a['error'], 'latency_ms': a['latency_ms']}
+                    for a in race_result['attempts']
+                ]
+            }
+            for attempt in race_info['attempts']:
+                if attempt['error']:
+                    print(f"⚠️ URL {attempt['url']} failed: {attempt['error']}")
+            
+            shows = race_result['result']
+            if shows:
+                # Only shows parsed from listings are stored, as before; page-text matches are not
+                self.save_shows([show_info for show_info in shows if show_info.get('found_in') == 'listing'])
+                
+                scraped_data = {
+                    'source': 'broadway.com',
+                    'date_range': f'{start_date} to {end_date}',
+                    'ticket_quantity': quantity,
+                    'shows': shows,
+                    'total_found': len(shows),
+                    'scraped_at': datetime.now().isoformat(),
+                    'status': 'success',
+                    'url_used': race_result['winner'],
+                    'race': race_info
+                }
+                
+                print(f"✅ Found {len(shows)} Broadway shows from {race_result['winner']} in {race_result['elapsed_ms']:.0f} ms")
+                return scraped_data
             
             # If no URLs worked, generate sample data
-            print("⚠️ All URLs failed, generating sample data")
-            return self.generate_sample_data(start_date, end_date, quantity)
+            print(f"⚠️ No URL worked within {self.RACE_DEADLINE:g}s, generating sample data")
+            data = self.generate_sample_data(start_date, end_date, quantity)
+            data['race'] = race_info
+            return data
             
         except Exception as e:
             print(f"❌ Error scraping Broadway: {e}")
             return self.generate_sample_data(start_date, end_date, quantity)
     
+    def fetch_shows(self, url, start_date, end_date, timeout):
+        """Fetch one Broadway.com page and extract its shows (skipped when the page is unchanged)"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none',
+            'Sec-Fetch-User': '?1',
+            'Cache-Control': 'max-age=0'
+        }
+        
+        return conditional_fetcher.fetch(
+            url,
+            lambda response: self.extract_shows_from_html(
+                BeautifulSoup(response.content, 'html.parser'), start_date, end_date
+            ),
+            name='broadway',
+            headers=headers,
+            timeout=min(timeout, 15),
+            raise_for_status=True
+        )
+    
+    def default_range(self, start_date=None, end_date=None):
+        """Fill in missing dates: today, then 5 days after start"""
+        if not start_date:
+            start_date = datetime.now().strftime("%Y-%m-%d")
+        if not end_date:
+            end_dt = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=5)
+            end_date = end_dt.strftime("%Y-%m-%d")
+        return start_date, end_date
+    
+    def day_key(self, day, quantity):
+        return f'broadway:day:{day}:{quantity}'
+    
+    def day_ttl(self, day, data):
+        """Per-day lifetime: failed days briefly, days close to today shorter than later ones"""
+        if data.get('status') != 'success':
+            return self.FALLBACK_CACHE_TTL
+        days_ahead = (datetime.strptime(day, "%Y-%m-%d").date() - datetime.now().date()).days
+        if days_ahead <= 1:
+            return self.CACHE_TTL / 2
+        if days_ahead <= 7:
+            return self.CACHE_TTL
+        return self.CACHE_TTL * 3
+    
+    def fetch_day(self, day, quantity, timeout, scraped, refresh=False):
+        """
+        One day's availability from Broadway.com's find-by-date page for just that day,
+        cached under the day. Shows scraped here (not read from another worker's entry)
+        are appended to `scraped` so the caller can record them once.
+        """
+        def load():
+            url = self.FIND_BY_DATE_URL.format(start=day, end=day, quantity=quantity)
+            try:
+                shows = self.fetch_shows(url, day, day, timeout)
+            except Exception as e:
+                print(f"⚠️ Broadway availability for {day} unavailable: {e}")
+                shows = []
+            scraped.extend(shows)
+            return {
+                'date': day,
+                'quantity': quantity,
+                'shows': shows,
+                'source': 'broadway.com' if shows else None,
+                'status': 'success' if shows else 'unavailable',
+                'url_used': url,
+                'scraped_at': datetime.now().isoformat()
+            }
+        
+        key = self.day_key(day, quantity)
+        ttl = lambda entry: self.day_ttl(day, entry)
+        if refresh:
+            return scrape_cache.refresh(key, load, ttl=ttl, stale_ttl=self.CACHE_STALE_TTL)
+        return scrape_cache.get(key, load, ttl=ttl, stale_ttl=self.CACHE_STALE_TTL)
+    
+    def fetch_days(self, days, quantity, refresh=False):
+        """
+        Fetch `days` with at most DAY_CONCURRENCY in flight (so one long range can't take
+        over the shared fan-out pool) within RACE_DEADLINE. Returns {day: entry} for the
+        days fetched in time. Shows scraped here are written to the history once.
+        """
+        pending = deque(days)
+        scraped = []
+        started = time.monotonic()
+        
+        def lane():
+            entries = {}
+            while True:
+                remaining = self.RACE_DEADLINE - (time.monotonic() - started)
+                if remaining < 1:
+                    break
+                try:
+                    day = pending.popleft()
+                except IndexError:
+                    break
+                entries[day] = self.fetch_day(day, quantity, min(self.DAY_TIMEOUT, remaining), scraped, refresh)
+            return entries
+        
+        entries = {}
+        lanes = {index: lane for index in range(min(self.DAY_CONCURRENCY, len(days)))}
+        for outcome in fan_out(lanes, self.RACE_DEADLINE + 5).values():
+            if outcome['result']:
+                entries.update(outcome['result'])
+        
+        listed = {show.get('show_name'): show for show in scraped if show.get('found_in') == 'listing'}
+        if listed:
+            self.save_shows(list(listed.values()))
+        return entries
+    
+    def scrape_listing(self):
+        """
+        Race the date-agnostic Broadway.com pages for the current show listing (cache
+        loader). The listing is recorded in the history once per scrape.
+        """
+        race_result = race(
+            self.LISTING_URLS,
+            lambda url, timeout: self.fetch_shows(url, None, None, timeout),
+            deadline=self.RACE_DEADLINE,
+            hedge_delay=self.HEDGE_DELAY
+        )
+        shows = race_result['result'] or []
+        if shows:
+            self.save_shows([show for show in shows if show.get('found_in') == 'listing'])
+        return {
+            'shows': shows,
+            'source': 'broadway.com' if shows else None,
+            'status': 'success' if shows else 'unavailable',
+            'url_used': race_result['winner'],
+            'scraped_at': datetime.now().isoformat()
+        }
+    
+    def get_listing(self):
+        """The current date-agnostic show listing, scraped at most once per CACHE_TTL across workers"""
+        return scrape_cache.get(
+            'broadway:listing',
+            self.scrape_listing,
+            ttl=lambda data: self.CACHE_TTL if data.get('status') == 'success' else self.FALLBACK_CACHE_TTL,
+            stale_ttl=self.CACHE_STALE_TTL
+        )
+    
+    def get_availability(self, start_date=None, end_date=None, quantity=2):
+        """
+        Get availability for a date range (at most MAX_RANGE_DAYS), assembled from
+        per-(date, quantity) cache entries. Only missing days are fetched; stale days
+        are served and refreshed together in the background.
+        """
+        start_date, end_date = self.default_range(start_date, end_date)
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+        requested = max((datetime.strptime(end_date, "%Y-%m-%d") - start_dt).days, 0) + 1
+        days = [(start_dt + timedelta(days=offset)).strftime("%Y-%m-%d")
+                for offset in range(min(requested, self.MAX_RANGE_DAYS))]
+        
+        cached = scrape_cache.get_many([self.day_key(day, quantity) for day in days])
+        entries = {}
+        missing = []
+        stale = []
+        for day in days:
+            found = cached.get(self.day_key(day, quantity))
+            if found:
+                entries[day] = found[0]
+                if not found[1]:
+                    stale.append(day)
+            else:
+                missing.append(day)
+        
+        if missing:
+            entries.update(self.fetch_days(missing, quantity))
+        
+        if stale:
+            scrape_cache.run_in_background(
+                f'broadway:refresh:{stale[0]}:{stale[-1]}:{quantity}',
+                lambda: self.fetch_days(stale, quantity, refresh=True)
+            )
+        
+        data = self.assemble_range(days, quantity, entries, {
+            'days': len(days),
+            'hits': len(days) - len(missing) - len(stale),
+            'stale': len(stale),
+            'fetched': len([day for day in missing if day in entries])
+        })
+        if requested > len(days):
+            data['truncated'] = True
+            data['note'] = f'Only the first {self.MAX_RANGE_DAYS} days of the {requested} requested are included'
+        return data
+    
+    def assemble_range(self, days, quantity, entries, cache_stats):
+        """
+        One availability response for a range from its per-day entries. Days without
+        per-day data are covered by the current listing (not tied to any date), and
+        sample data is used only when neither is available.
+        """
+        shows = {}
+        for day in days:
+            for show in entries.get(day, {}).get('shows', []):
+                merged = shows.setdefault(show.get('show_name'), dict(show, dates=[]))
+                merged['dates'].append(day)
+        
+        covered = [day for day in days if entries.get(day, {}).get('status') == 'success']
+        data = {
+            'source': 'broadway.com',
+            'date_range': f'{days[0]} to {days[-1]}',
+            'ticket_quantity': quantity,
+            'shows': list(shows.values()),
+            'total_found': len(shows),
+            'scraped_at': min((entries[day].get('scraped_at') or '' for day in covered), default=None),
+            'status': 'success' if len(covered) == len(days) else 'partial',
+            'url_used': entries[covered[0]].get('url_used') if covered else None,
+            'days': {
+                day: {
+                    'status': entries[day].get('status') if day in entries else 'timed_out',
+                    'scraped_at': entries.get(day, {}).get('scraped_at'),
+                    'show_count': len(entries.get(day, {}).get('shows', []))
+                }
+                for day in days
+            },
+            'cache': cache_stats
+        }
+        
+        if len(covered) < len(days):
+            listing = self.get_listing()
+            if listing.get('status') == 'success':
+                data['listing'] = dict(listing, note='Current Broadway.com listing; not tied to the requested dates')
+                if not covered:
+                    data.update(status='listing', shows=listing['shows'], total_found=len(listing['shows']),
+                                scraped_at=listing['scraped_at'], url_used=listing['url_used'])
+            elif not covered:
+                sample = self.generate_sample_data(days[0], days[-1], quantity)
+                data.update(source=sample['source'], status='sample', shows=sample['shows'],
+                            total_found=sample['total_found'], scraped_at=sample['scraped_at'])
+                data['note'] = sample['note']
+        return data
+    
+    def refresh_default_availability(self):
+        """Re-fetch the next week's days (scheduler job); skipped while another worker does it"""
+        start_dt = datetime.now()
+        days = [(start_dt + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(7)]
+        scrape_cache.run_in_background('broadway:refresh:default',
+                                       lambda: self.fetch_days(days, 2, refresh=True))
+    
     def extract_shows_from_html(self, soup, start_date, end_date):
         """Extract show information from HTML content"""
         shows = []
@@ -1877,8 +2373,8 @@ class BroadwayScraper:
                     try:
                         show_info = self.parse_show_element(element)
                         if show_info:
+                            show_info['found_in'] = 'listing'
                             shows.append(show_info)
-                            self.save_to_database(show_info)
                     except Exception as e:
                         continue
         
@@ -1899,7 +2395,8 @@ class BroadwayScraper:
                         'show_date': 'Check website',
                         'price_range': 'from $99.00 - $399.00',
                         'status': 'Likely Available',
-                        'description': f'{show_name} - Check official site for exact dates and prices'
+                        'description': f'{show_name} - Check official site for exact dates and prices',
+                        'found_in': 'page text'
                     }
                     shows.append(show_info)
         
@@ -1981,9 +2478,7 @@ class BroadwayScraper:
             }
         ]
         
-        for show in sample_shows:
-            self.save_to_database(show)
-        
+        # Not saved: the history and price index only hold what was actually scraped
         return {
             'source': 'sample data',
             'date_range': f'{start_date} to {end_date}',
@@ -1996,22 +2491,43 @@ class BroadwayScraper:
         }
     
     def save_to_database(self, show_data):
-        """Save scraped Broadway data to database"""
+        """Save one scraped Broadway show to the database"""
+        self.save_shows([show_data])
+    
+    def save_shows(self, shows):
+        """Save scraped Broadway shows in one transaction and update the daily rollup"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO broadway_shows 
-                (show_name, show_date, price_range, status, scraped_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                show_data.get('show_name', ''),
-                show_data.get('show_date', ''),
-                show_data.get('price_range', ''),
-                show_data.get('status', ''),
-                datetime.now().isoformat()
-            ))
+            scraped_at = datetime.now().isoformat()
+            for show_data in shows:
+                min_price, max_price = parse_price_range(show_data.get('price_range'))
+                row = (
+                    show_data.get('show_name', ''),
+                    show_data.get('show_date', ''),
+                    show_data.get('price_range', ''),
+                    show_data.get('status', ''),
+                    scraped_at,
+                    min_price,
+                    max_price
+                )
+                cursor.execute('''
+                    INSERT INTO broadway_shows 
+                    (show_name, show_date, price_range, status, scraped_at, min_price, max_price)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', row)
+                cursor.execute('''
+                    INSERT INTO broadway_show_daily (show_name, day, price_range, status, scraped_at, min_price, max_price)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(day, show_name) DO UPDATE SET
+                        price_range = excluded.price_range,
+                        status = excluded.status,
+                        scraped_at = excluded.scraped_at,
+                        min_price = excluded.min_price,
+                        max_price = excluded.max_price,
+                        samples = samples + 1
+                ''', (row[0], scraped_at[:10], row[2], row[3], scraped_at, min_price, max_price))
             
             conn.commit()
             conn.close()
@@ -2019,32 +2535,131 @@ class BroadwayScraper:
         except Exception as e:
             print(f"⚠️ Broadway database error: {e}")
     
+    def get_history(self, limit=100, cursor=None, show=None, since=None, until=None):
+        """
+        Scraped observations newest first, one page at a time. Pages are keyset-paginated
+        on (scraped_at, id), so every page is an index range scan however large the table
+        gets. Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        clauses = []
+        params = []
+        if show:
+            clauses.append('show_name = ?')
+            params.append(show)
+        if since:
+            clauses.append('scraped_at >= ?')
+            params.append(since)
+        if until:
+            clauses.append('scraped_at < ?')
+            params.append(until)
+        if cursor:
+            scraped_at, row_id = decode_cursor(cursor, 2)
+            clauses.append('(scraped_at, id) < (?, ?)')
+            params.extend([scraped_at, int(row_id)])
+        
+        conn = db_pool.connect(self.db_path)
+        rows = conn.execute(f'''
+            SELECT id, show_name, show_date, price_range, status, scraped_at, min_price, max_price
+            FROM broadway_shows
+            {'WHERE ' + ' AND '.join(clauses) if clauses else ''}
+            ORDER BY scraped_at DESC, id DESC
+            LIMIT ?
+        ''', params + [limit + 1]).fetchall()
+        conn.close()
+        
+        shows = [{
+            'show_name': row[1],
+            'show_date': row[2],
+            'price_range': row[3],
+            'status': row[4],
+            'scraped_at': row[5],
+            'min_price': row[6],
+            'max_price': row[7]
+        } for row in rows[:limit]]
+        next_cursor = encode_cursor(rows[limit - 1][5], rows[limit - 1][0]) if len(rows) > limit else None
+        return shows, next_cursor
+    
+    def get_daily_history(self, limit=100, cursor=None, show=None, since=None, until=None):
+        """
+        Downsampled history from the daily rollup: the latest price and status per show
+        per day, newest day first, keyset-paginated on (day, show_name)
+        """
+        clauses = []
+        params = []
+        if show:
+            clauses.append('show_name = ?')
+            params.append(show)
+        if since:
+            clauses.append('day >= ?')
+            params.append(since[:10])
+        if until:
+            clauses.append('day < ?')
+            params.append(until[:10])
+        if cursor:
+            day, show_name = decode_cursor(cursor, 2)
+            clauses.append('(day, show_name) < (?, ?)')
+            params.extend([day, show_name])
+        
+        conn = db_pool.connect(self.db_path)
+        rows = conn.execute(f'''
+            SELECT day, show_name, price_range, status, scraped_at, samples, min_price, max_price
+            FROM broadway_show_daily
+            {'WHERE ' + ' AND '.join(clauses) if clauses else ''}
+            ORDER BY day DESC, show_name DESC
+            LIMIT ?
+        ''', params + [limit + 1]).fetchall()
+        conn.close()
+        
+        days = [{
+            'day': row[0],
+            'show_name': row[1],
+            'price_range': row[2],
+            'status': row[3],
+            'scraped_at': row[4],
+            'samples': row[5],
+            'min_price': row[6],
+            'max_price': row[7]
+        } for row in rows[:limit]]
+        next_cursor = encode_cursor(rows[limit - 1][0], rows[limit - 1][1]) if len(rows) > limit else None
+        return days, next_cursor
+    
+    def find_by_price(self, start_day, end_day, max_price=None, limit=10):
+        """
+        Cheapest observed price per show between two days (inclusive), optionally only
+        shows from at most `max_price`, cheapest first. Reads the daily rollup through
+        its (day, min_price) index.
+        """
+        clauses = ['day BETWEEN ? AND ?', 'min_price IS NOT NULL']
+        params = [start_day, end_day]
+        if max_price is not None:
+            clauses.append('min_price <= ?')
+            params.append(max_price)
+        
+        conn = db_pool.connect(self.db_path)
+        rows = conn.execute(f'''
+            SELECT show_name, MIN(min_price), max_price, price_range, status, day, scraped_at
+            FROM broadway_show_daily
+            WHERE {' AND '.join(clauses)}
+            GROUP BY show_name
+            ORDER BY MIN(min_price), show_name
+            LIMIT ?
+        ''', params + [limit]).fetchall()
+        conn.close()
+        
+        return [{
+            'show_name': row[0],
+            'min_price': row[1],
+            'max_price': row[2],
+            'price_range': row[3],
+            'status': row[4],
+            'day': row[5],
+            'scraped_at': row[6]
+        } for row in rows]
+    
     def get_recent_shows(self, limit=50):
         """Get recently scraped Broadway shows from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT show_name, show_date, price_range, status, scraped_at 
-                FROM broadway_shows 
-                ORDER BY scraped_at DESC 
-                LIMIT ?
-            ''', (limit,))
-            
-            shows = []
-            for row in cursor.fetchall():
-                show_data = {
-                    'show_name': row[0],
-                    'show_date': row[1],
-                    'price_range': row[2],
-                    'status': row[3],
-                    'scraped_at': row[4]
-                }
-                shows.append(show_data)
-            
-            conn.close()
-            return shows
+            return self.get_history(limit=limit)[0]
         except Exception as e:
             print(f"Error getting Broadway shows: {e}")
             return []
@@ -2052,6 +2667,132 @@ class BroadwayScraper:
 # Create Broadway scraper instance
 broadway_scraper = BroadwayScraper()
 
+# ============================================================================
+# BACKGROUND SCRAPE SCHEDULER
+# ============================================================================
+
+# Refresh every scraped source before its cache entry expires so request
+# handlers only ever read the latest stored snapshot.
+scrape_registry.schedule(scrape_scheduler, prefix='museum:')
+scrape_registry.schedule(scrape_scheduler, prefix='breakfast:')
+
+# Prune the breakfast hours change history once a day
+scrape_scheduler.add_job(
+    'breakfast:compact',
+    breakfast_scraper.store.compact,
+    interval=24 * 60 * 60,
+    run_at_start=False
+)
+
+scrape_scheduler.add_job(
+    'broadway:default',
+    broadway_scraper.refresh_default_availability,
+    interval=BroadwayScraper.CACHE_TTL / 2
+)
+
+@app.before_request
+def start_scrape_scheduler():
+    """Start the scheduler lazily so CLI scripts importing main don't scrape"""
+    if os.getenv('SCRAPER_SCHEDULER', 'on') != 'off':
+        scrape_scheduler.start()
+
+@app.route('/api/scheduler/status')
+def get_scheduler_status():
+    """GET background scrape scheduler state for this worker"""
+    return jsonify({'success': True, 'data': scrape_scheduler.status()})
+
+@app.route('/api/scraper/circuits')
+def get_scraper_circuits():
+    """GET circuit breaker state for every scraped domain (shared by all workers)"""
+    circuits = circuit_breaker.status()
+    return jsonify({
+        'success': True,
+        'open': sorted(domain for domain, circuit in circuits.items() if circuit['state'] != 'closed'),
+        'data': circuits
+    })
+
+@app.route('/api/scraper/circuits/reset', methods=['POST'])
+@login_required
+def reset_scraper_circuits():
+    """POST to close every circuit, or one with ?domain=www.broadway.com (admins only)"""
+    if current_user.role != 'Admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    circuit_breaker.reset(request.args.get('domain'))
+    return jsonify({'success': True, 'data': circuit_breaker.status()})
+
+# ============================================================================
+# OPENING HOURS QUERIES
+# ============================================================================
+
+def hours_query_time():
+    """The ?at= ISO time to answer for (NYC local unless it has an offset), default now"""
+    at = request.args.get('at')
+    return hours_index.local(datetime.fromisoformat(at)) if at else hours_index.now()
+
+def hours_place_loaders():
+    """{hours index key: callable returning that place's latest snapshot}; loads nothing itself"""
+    loaders = {f'museum:{key}': (lambda key=key: scraper.get_hours(key)) for key in scraper.scrapers()}
+    loaders.update({f'breakfast:{key}': (lambda key=key: breakfast_scraper.get_hours(key))
+                    for key in breakfast_scraper.scrapers()})
+    return loaders
+
+@app.route('/api/open-now')
+def get_open_now():
+    """GET every museum and breakfast place open now (or at ?at=2025-06-01T21:30)"""
+    try:
+        when = hours_query_time()
+    except ValueError:
+        return jsonify({'success': False, 'error': 'at must be an ISO date-time'}), 400
+    
+    # Reading the snapshots keeps the index current; cached ones return at once and cold
+    # ones are scraped concurrently, so a slow site costs at most the deadline
+    deadline = max(scraper.ALL_DEADLINE, breakfast_scraper.ALL_DEADLINE)
+    timed_out = [key for key, outcome in iter_fan_out(hours_place_loaders(), deadline) if outcome['timed_out']]
+    open_places = hours_index.open_now(when)
+    return jsonify({
+        'success': True,
+        'at': when.isoformat(),
+        'count': len(open_places),
+        'data': open_places,
+        'timed_out': timed_out
+    })
+
+@app.route('/api/hours/<place>')
+def get_place_hours(place):
+    """GET open/closed status, next opening and weekly schedule for one place (?at= optional)"""
+    try:
+        when = hours_query_time()
+    except ValueError:
+        return jsonify({'success': False, 'error': 'at must be an ISO date-time'}), 400
+    
+    key = place if ':' in place else next(
+        (f'{kind}:{place}' for kind, source in (('museum', scraper), ('breakfast', breakfast_scraper))
+         if place in source.scrapers()),
+        None
+    )
+    loaders = hours_place_loaders()
+    if key not in loaders:
+        return jsonify({
+            'success': False,
+            'error': f"Place not found. Available: {[k.split(':', 1)[1] for k in loaders]}"
+        }), 404
+    
+    # Only the requested place is loaded
+    snapshot = loaders[key]()
+    status = hours_index.status(key, when)
+    return jsonify({
+        'success': True,
+        'at': when.isoformat(),
+        'data': {
+            'key': key,
+            'name': hours_index.places[key]['name'],
+            'hours': snapshot.get('hours'),
+            'schedule': snapshot.get('schedule'),
+            **status
+        }
+    })
+
 # ============================================================================
 # ORIGINAL ITINERARY STORAGE CLASS (unchanged)
 # ============================================================================
@@ -2065,7 +2806,7 @@ class ItineraryStorage:
     
     def init_database(self):
         """Create database table for itinerary data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db_pool.connect(self.db_path)
         cursor = conn.cursor()
         
         # Main itinerary table with user_id for authentication
@@ -2101,7 +2842,7 @@ class ItineraryStorage:
     def save_itinerary(self, session_id, itinerary_data, user_id=None):
         """Save or update itinerary data for a session or user"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             # Check if user already has an itinerary
@@ -2178,7 +2919,7 @@ class ItineraryStorage:
     def get_itinerary(self, session_id=None, user_id=None):
         """Get itinerary data for a session or user"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             query = '''
@@ -2259,7 +3000,7 @@ class ItineraryStorage:
                     'error': f'Invalid section. Must be one of: {", ".join(valid_sections)}'
                 }
             
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             # Check if itinerary exists
@@ -2318,7 +3059,7 @@ class ItineraryStorage:
     def clear_itinerary(self, session_id=None, user_id=None):
         """Clear all itinerary data for a session or user"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             query = '''
@@ -2367,7 +3108,7 @@ class ItineraryStorage:
     def delete_itinerary(self, session_id=None, user_id=None):
         """Delete an entire itinerary"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_pool.connect(self.db_path)
             cursor = conn.cursor()
             
             query = 'DELETE FROM itinerary WHERE '
@@ -2517,7 +3258,7 @@ enhanced_itinerary_storage = EnhancedItineraryStorage()
 
 @app.route('/api/budget', methods=['GET'])
 def get_budget_info():
-    """GET budget information for current user/session"""
+    """GET budget information for current user/session (?fields, ?header, ?limit, ?cursor)"""
     try:
         # Get user ID if logged in
         user_id = None
@@ -2527,7 +3268,22 @@ def get_budget_info():
         # Get session ID
         session_id = request.cookies.get('budget_session_id')
         
-        result = budget_tracker.get_budget(user_id=user_id, session_id=session_id)
+        # ?fields=budget,category_totals picks parts; ?header=1 is the budget row only;
+        # ?limit=N pages expenses newest first, continued with ?cursor=<next_cursor>
+        fields = request.args.get('fields')
+        if request.args.get('header') in ('1', 'true'):
+            fields = 'budget'
+        limit = request.args.get('limit', type=int)
+        try:
+            result = budget_tracker.get_budget(
+                user_id=user_id,
+                session_id=session_id,
+                fields=[field.strip() for field in fields.split(',') if field.strip()] if fields else None,
+                limit=min(max(limit, 1), 500) if limit else None,
+                cursor=request.args.get('cursor')
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         if result['success']:
             # Set session cookie if needed
@@ -2569,7 +3325,7 @@ def create_update_budget():
             }), 400
         
         # Check if budget already exists
-        existing = budget_tracker.get_budget(user_id=user_id, session_id=session_id)
+        existing = budget_tracker.get_budget(user_id=user_id, session_id=session_id, fields=('budget',))
         
         if existing['success'] and existing.get('budget'):
             # Update existing budget
@@ -2656,6 +3412,75 @@ def add_budget_expense():
             'error': str(e)
         }), 500
 
+@app.route('/api/budget/expenses/bulk', methods=['POST'])
+def add_budget_expenses_bulk():
+    """
+    Add many expenses at once from a JSON array (or {"expenses": [...]}), a CSV body
+    (Content-Type: text/csv) or an uploaded CSV file field named "file". Columns are
+    those of POST /api/budget/expense. Any invalid row rejects the import unless
+    ?on_error=skip, which adds the valid rows and reports the rest.
+    """
+    try:
+        # Get user ID if logged in
+        user_id = None
+        if current_user.is_authenticated:
+            user_id = current_user.id
+        
+        # Get session ID
+        session_id = request.cookies.get('budget_session_id')
+        if not session_id:
+            return jsonify({
+                'success': False,
+                'error': 'No budget session. Please create a budget first.'
+            }), 400
+        
+        on_error = request.args.get('on_error', 'reject')
+        if on_error not in ('reject', 'skip'):
+            return jsonify({'success': False, 'error': 'on_error must be reject or skip'}), 400
+        
+        if 'file' in request.files or request.mimetype == 'text/csv':
+            raw = request.files['file'].read() if 'file' in request.files else request.get_data()
+            try:
+                frame = pd.read_csv(io.BytesIO(raw), dtype=str, encoding='utf-8-sig', skipinitialspace=True)
+            except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+                return jsonify({'success': False, 'error': f'Could not read CSV: {e}'}), 400
+            frame.columns = [str(column).strip().lower() for column in frame.columns]
+        else:
+            data = request.get_json(silent=True)
+            records = data.get('expenses') if isinstance(data, dict) else data
+            if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+                return jsonify({
+                    'success': False,
+                    'error': 'Send a JSON array of expenses or a CSV file'
+                }), 400
+            frame = pd.DataFrame.from_records(records)
+        
+        if frame.empty:
+            return jsonify({'success': False, 'error': 'No expenses provided'}), 400
+        if len(frame) > BudgetTracker.BULK_MAX_ROWS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {BudgetTracker.BULK_MAX_ROWS} expenses per request'
+            }), 400
+        
+        result = budget_tracker.add_expenses(
+            user_id=user_id,
+            session_id=session_id,
+            frame=frame,
+            skip_invalid=on_error == 'skip'
+        )
+        
+        if result['success']:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/budget/expense/<int:expense_id>', methods=['DELETE'])
 def remove_budget_expense(expense_id):
     """Remove an expense from the budget"""
@@ -2770,12 +3595,12 @@ def sync_budget_to_account():
             }), 400
         
         # Get user budget
-        user_budget = budget_tracker.get_budget(user_id=user_id)
+        user_budget = budget_tracker.get_budget(user_id=user_id, fields=('budget',))
         
         # If user has no budget, transfer session budget to user
         if not user_budget.get('budget'):
             # Update session budget with user_id
-            conn = sqlite3.connect(budget_tracker.db_path)
+            conn = db_pool.connect(budget_tracker.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -2841,8 +3666,12 @@ def test_budget_api():
         'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         'endpoints': {
             'GET /api/budget': 'Get budget information',
+            'GET /api/budget?header=1': 'Budget balance only (no expenses)',
+            'GET /api/budget?fields=budget,category_totals': 'Only the listed parts (budget, expenses, daily_breakdown, category_totals, expense_count)',
+            'GET /api/budget?limit=N&cursor=...': 'Expenses newest first, one page at a time',
             'POST /api/budget': 'Create/update budget',
             'POST /api/budget/expense': 'Add expense',
+            'POST /api/budget/expenses/bulk': 'Add many expenses from JSON or CSV in one transaction',
             'DELETE /api/budget/expense/<id>': 'Remove expense',
             'GET /api/budget/summary': 'Get budget summary',
             'POST /api/budget/reset': 'Reset budget',
@@ -2891,7 +3720,7 @@ def save_itinerary_with_budget():
         # Get budget ID if exists
         budget_id = None
         if budget_session_id:
-            budget_info = budget_tracker.get_budget(session_id=budget_session_id)
+            budget_info = budget_tracker.get_budget(session_id=budget_session_id, fields=('budget',))
             if budget_info['success'] and budget_info.get('budget'):
                 budget_id = budget_info['budget']['id']
         
@@ -2939,9 +3768,11 @@ def get_itinerary_budget_summary():
         )
         
         # Get budget data
+        # Everything but the expense list, which this summary doesn't use
         budget_result = budget_tracker.get_budget(
             user_id=user_id,
-            session_id=budget_session_id
+            session_id=budget_session_id,
+            fields=('budget', 'daily_breakdown', 'category_totals', 'expense_count')
         )
         
         combined_data = {
@@ -3057,9 +3888,15 @@ def get_user_classes():
 
 @app.route('/api/breakfast')
 def get_all_breakfast():
-    """GET all breakfast restaurant hours"""
+    """GET all breakfast restaurant hours (streamed per restaurant with an NDJSON/SSE Accept header)"""
+    mode = stream_mode()
+    if mode:
+        started = time.monotonic()
+        deadline = request.args.get('deadline', type=float)
+        return stream_response(stream_sources(breakfast_scraper.iter_all_hours(deadline), started, success=True,
+                                              deadline_s=deadline or breakfast_scraper.ALL_DEADLINE), mode)
     try:
-        results = breakfast_scraper.scrape_all_restaurants()
+        results = breakfast_scraper.get_all_hours()
         success_count = len([r for r in results if r.get('status') == 'success'])
         
         return jsonify({
@@ -3081,11 +3918,11 @@ def get_breakfast_hours(restaurant):
     """GET specific breakfast restaurant hours"""
     try:
         restaurant_map = {
-            'jacks': breakfast_scraper.scrape_jacks_wife_freda,
-            'shuka': breakfast_scraper.scrape_shuka,
-            'sarabeths': breakfast_scraper.scrape_sarabeths,
-            'bagel': breakfast_scraper.scrape_ess_a_bagel,
-            'ess': breakfast_scraper.scrape_ess_a_bagel  # Added alias for frontend
+            'jacks': 'jacks',
+            'shuka': 'shuka',
+            'sarabeths': 'sarabeths',
+            'bagel': 'bagel',
+            'ess': 'bagel'  # Added alias for frontend
         }
         
         if restaurant not in restaurant_map:
@@ -3095,7 +3932,7 @@ def get_breakfast_hours(restaurant):
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }), 404
         
-        result = restaurant_map[restaurant]()
+        result = breakfast_scraper.get_hours(restaurant_map[restaurant])
         days_data = breakfast_scraper.get_restaurant_hours_formatted(result['restaurant'])
         
         return jsonify({
@@ -3112,6 +3949,27 @@ def get_breakfast_hours(restaurant):
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }), 500
 
+@app.route('/api/breakfast/<restaurant>/history')
+def get_breakfast_history(restaurant):
+    """GET recorded versions of a breakfast restaurant's hours (?limit=N, default 20)"""
+    names = dict(BreakfastScraper.RESTAURANTS, ess=BreakfastScraper.RESTAURANTS['bagel'])
+    if restaurant not in names:
+        return jsonify({
+            'success': False,
+            'error': f'Restaurant not found. Available: {list(names.keys())}',
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }), 404
+    
+    limit = request.args.get('limit', 20, type=int)
+    versions = breakfast_scraper.get_restaurant_history(names[restaurant], limit)
+    return jsonify({
+        'success': True,
+        'restaurant': names[restaurant],
+        'count': len(versions),
+        'data': versions,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    })
+
 @app.route('/api/breakfast/test')
 def test_breakfast_api():
     """Test breakfast API endpoint"""
@@ -3121,11 +3979,13 @@ def test_breakfast_api():
         'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         'endpoints': {
             '/api/breakfast': 'All breakfast restaurant hours',
+            '/api/breakfast (Accept: application/x-ndjson or text/event-stream)': 'Each restaurant streamed as soon as it is scraped, then a summary',
             '/api/breakfast/jacks': "Jack's Wife Freda hours",
             '/api/breakfast/shuka': 'Shuka hours',
             '/api/breakfast/sarabeths': "Sarabeth's hours",
             '/api/breakfast/bagel': 'Ess-a-Bagel hours',
             '/api/breakfast/ess': 'Ess-a-Bagel hours (alias)',
+            '/api/breakfast/<restaurant>/history': 'Recorded changes to a restaurant\'s hours',
             '/api/breakfast/test': 'Test endpoint'
         },
         'restaurants': [
@@ -3149,8 +4009,18 @@ def get_broadway_availability():
         if not start_date:
             # Default to next 7 days
             start_date = datetime.now().strftime("%Y-%m-%d")
+        try:
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d') if end_date else start_dt
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Dates must be YYYY-MM-DD'}), 400
+        if end_dt < start_dt or (end_dt - start_dt).days >= BroadwayScraper.MAX_RANGE_DAYS:
+            return jsonify({
+                'success': False,
+                'error': f'end_date must not be before start_date, and a range spans at most {BroadwayScraper.MAX_RANGE_DAYS} days'
+            }), 400
         
-        result = broadway_scraper.scrape_broadway_availability(
+        result = broadway_scraper.get_availability(
             start_date=start_date,
             end_date=end_date,
             quantity=quantity
@@ -3176,15 +4046,75 @@ def get_broadway_availability():
 
 @app.route('/api/broadway/history')
 def get_broadway_history():
-    """GET historical Broadway data from database"""
+    """
+    GET scraped Broadway history, newest first.
+    ?limit=N (max 500), ?cursor= from the previous page's next_cursor, ?show=<name>,
+    ?since= / ?until= ISO dates, ?downsample=daily for the latest price per show per day
+    """
+    try:
+        limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+        downsample = request.args.get('downsample')
+        if downsample not in (None, '', 'daily'):
+            return jsonify({'success': False, 'error': 'downsample must be daily'}), 400
+        
+        query = broadway_scraper.get_daily_history if downsample == 'daily' else broadway_scraper.get_history
+        try:
+            shows, next_cursor = query(
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                show=request.args.get('show'),
+                since=request.args.get('since'),
+                until=request.args.get('until')
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'data': shows,
+            'count': len(shows),
+            'next_cursor': next_cursor,
+            'downsample': downsample or None,
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }), 500
+
+@app.route('/api/broadway/prices')
+def get_broadway_prices():
+    """
+    GET the cheapest observed price per show, cheapest first.
+    ?date=YYYY-MM-DD for one day, or ?start_date= / ?end_date= (default: this Monday
+    to Sunday), ?max_price=X for shows from at most $X, ?limit=N (default 10, max 100)
+    """
     try:
-        limit = request.args.get('limit', 100, type=int)
-        shows = broadway_scraper.get_recent_shows(limit=limit)
+        today = datetime.now().date()
+        date = request.args.get('date')
+        start_date = request.args.get('start_date') or date or (today - timedelta(days=today.weekday())).strftime('%Y-%m-%d')
+        end_date = request.args.get('end_date') or date or (
+            datetime.strptime(start_date, '%Y-%m-%d') + timedelta(days=6)
+        ).strftime('%Y-%m-%d')
+        try:
+            datetime.strptime(start_date, '%Y-%m-%d')
+            datetime.strptime(end_date, '%Y-%m-%d')
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Dates must be YYYY-MM-DD'}), 400
+        
+        max_price = request.args.get('max_price', type=float)
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        shows = broadway_scraper.find_by_price(start_date, end_date, max_price=max_price, limit=limit)
         
         return jsonify({
             'success': True,
             'data': shows,
             'count': len(shows),
+            'start_date': start_date,
+            'end_date': end_date,
+            'max_price': max_price,
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         })
     except Exception as e:
@@ -3204,7 +4134,10 @@ def test_broadway_api():
         'endpoints': {
             '/api/broadway': 'Scrape Broadway availability (default: next 7 days)',
             '/api/broadway?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&quantity=N': 'Custom date range',
-            '/api/broadway/history': 'Get scraped data from database',
+            '/api/broadway/history': 'Scraped history, newest first (?limit, ?cursor, ?show, ?since, ?until)',
+            '/api/broadway/history?downsample=daily': 'Latest price and status per show per day',
+            '/api/broadway/prices?date=YYYY-MM-DD&max_price=X': 'Shows from at most $X on a day, cheapest first',
+            '/api/broadway/prices?limit=N': 'Cheapest N shows this week',
             '/api/broadway/test': 'Test endpoint'
         },
         'parameters': {
@@ -3573,7 +4506,7 @@ def add_custom_place_to_itinerary():
             }), 400
         
         # Get the place details
-        conn = sqlite3.connect('custom_places.db')
+        conn = db_pool.connect(custom_places_manager.db_path)
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM custom_places WHERE id = ?', (place_id,))
         row = cursor.fetchone()
@@ -3818,7 +4751,7 @@ def get_category_suggestion():
 def get_single_place(place_id):
     """Get a single place by ID for editing"""
     try:
-        conn = sqlite3.connect('custom_places.db')
+        conn = db_pool.connect(custom_places_manager.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -3858,32 +4791,29 @@ def update_place(place_id):
     try:
         data = request.get_json()
         
-        conn = sqlite3.connect('custom_places.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE custom_places SET
-                place_name = ?,
-                place_type = ?,
-                description = ?,
-                location = ?,
-                time = ?,
-                price = ?,
-                image_url = ?
-            WHERE id = ?
-        ''', (
-            data.get('place_name'),
-            data.get('place_type'),
-            data.get('description', ''),
-            data.get('location', ''),
-            data.get('time', ''),
-            data.get('price', ''),
-            data.get('image_url', ''),
-            place_id
-        ))
-        
-        conn.commit()
-        conn.close()
+        with db_pool.transaction(custom_places_manager.db_path) as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE custom_places SET
+                    place_name = ?,
+                    place_type = ?,
+                    description = ?,
+                    location = ?,
+                    time = ?,
+                    price = ?,
+                    image_url = ?
+                WHERE id = ?
+            ''', (
+                data.get('place_name'),
+                data.get('place_type'),
+                data.get('description', ''),
+                data.get('location', ''),
+                data.get('time', ''),
+                data.get('price', ''),
+                data.get('image_url', ''),
+                place_id
+            ))
         
         return jsonify({
             'success': True,
@@ -3900,16 +4830,14 @@ def update_place(place_id):
 def delete_place(place_id):
     """Delete a place"""
     try:
-        conn = sqlite3.connect('custom_places.db')
-        cursor = conn.cursor()
-        
-        # Delete from itinerary first (foreign key constraint)
-        cursor.execute('DELETE FROM itinerary_custom_places WHERE place_id = ?', (place_id,))
-        cursor.execute('DELETE FROM custom_place_popularity WHERE place_id = ?', (place_id,))
-        cursor.execute('DELETE FROM custom_places WHERE id = ?', (place_id,))
-        
-        conn.commit()
-        conn.close()
+        # One transaction, so a failure can't leave the place half deleted
+        with db_pool.transaction(custom_places_manager.db_path) as conn:
+            cursor = conn.cursor()
+            
+            # Delete from itinerary first (foreign key constraint)
+            cursor.execute('DELETE FROM itinerary_custom_places WHERE place_id = ?', (place_id,))
+            cursor.execute('DELETE FROM custom_place_popularity WHERE place_id = ?', (place_id,))
+            cursor.execute('DELETE FROM custom_places WHERE id = ?', (place_id,))
         
         return jsonify({
             'success': True,
@@ -3926,7 +4854,7 @@ def delete_place(place_id):
 def get_custom_places_events():
     """Get events related to custom places for microblog"""
     try:
-        conn = sqlite3.connect('custom_places.db')
+        conn = db_pool.connect(custom_places_manager.db_path)
         cursor = conn.cursor()
         
         # Get recent custom places additions
@@ -5043,6 +5971,23 @@ def generate_data():
     initUsers()
     init_microblogs()
 
+@custom_cli.command('rebuild_budget_rollups')
+def rebuild_budget_rollups():
+    """Recompute the budget category/module rollups from budget_expenses"""
+    rows = budget_tracker.rebuild_rollups()
+    print(f"✅ Rebuilt budget rollups: {rows} rows")
+
+@custom_cli.command('backfill_broadway_prices')
+def backfill_broadway_prices():
+    """Parse numeric prices for Broadway history rows stored without them"""
+    rows = broadway_scraper.backfill_prices()
+    print(f"✅ Back-filled prices on {rows} Broadway rows")
+
+@custom_cli.command('compact_breakfast_hours')
+def compact_breakfast_hours():
+    """Prune old breakfast hours versions (same as the daily scheduler job)"""
+    breakfast_scraper.store.compact()
+
 app.cli.add_command(custom_cli)
 
 # ============================================================================
@@ -1,38 +1,27 @@
 from flask import Flask, jsonify, send_from_directory
 from flask_cors import CORS
-from met_scraper import scrape_met_hours, read_from_json
 from datetime import datetime
-import threading
-import time
+from scrapers.met_visit import read_from_json
+from scrapers.registry import scrape_registry
+from scrapers.scheduler import ScrapeScheduler
 
 app = Flask(__name__)
 CORS(app)
 
-# Global cache
-met_cache = None
-
-def update_cache():
-    """Update cache in background"""
-    global met_cache
-    try:
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] 🔄 Updating MET cache...")
-        met_cache = scrape_met_hours()
-    except Exception as e:
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ Cache update failed: {e}")
+# MET data is the shared 'met:visit' registry snapshot, also served by NY day/api.py
 
 @app.route('/api/met-hours')
 def get_met_hours():
     """API endpoint to get MET hours"""
     try:
         print(f"[{datetime.now().strftime('%H:%M:%S')}] 📡 Fetching MET hours...")
-        data = scrape_met_hours()
-        return jsonify(data)
+        return jsonify(scrape_registry.get('met:visit'))
     except Exception as e:
         print(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ Error: {e}")
         # Try cache
-        global met_cache
-        if met_cache:
-            return jsonify(met_cache)
+        cached = scrape_registry.peek('met:visit')
+        if cached:
+            return jsonify(cached)
         # Try file
         cached = read_from_json()
         if cached:
@@ -43,7 +32,7 @@ def get_met_hours():
 def get_cached_met_hours():
     """API endpoint to get cached MET hours"""
     try:
-        cached = read_from_json()
+        cached = scrape_registry.peek('met:visit') or read_from_json()
         if cached:
             return jsonify(cached)
         return jsonify({'error': 'No cached data'}), 404
@@ -114,19 +103,13 @@ fetch('http://localhost:5001/api/met-hours')
     </html>
     '''
 
-def background_updater():
-    """Background thread to update cache"""
-    while True:
-        update_cache()
-        time.sleep(1800)  # 30 minutes
+# Refresh the shared snapshot every 30 minutes via the shared scrape scheduler
+met_scheduler = ScrapeScheduler('met_api_scheduler.lock')
+scrape_registry.schedule(met_scheduler, prefix='met:')
 
 if __name__ == '__main__':
-    # Initial cache update
-    update_cache()
-    
-    # Start background updater
-    updater_thread = threading.Thread(target=background_updater, daemon=True)
-    updater_thread.start()
+    # Start background updater (its first run fills the shared snapshot)
+    met_scheduler.start()
     
     print("=" * 50)
     print("🏛️  MET Museum Web Scraper API")
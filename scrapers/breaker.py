@@ -0,0 +1,243 @@
+# breaker.py - Per-domain circuit breakers shared across gunicorn workers
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from scrapers.cache import PROJECT_ROOT
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling a domain whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Tracks upstream failures per domain in SQLite so every worker on the host sees
+    the same circuit state.
+
+    - closed: requests go through; `threshold` consecutive failures (connection
+      errors, timeouts, 5xx, 429) within `window` seconds open the circuit
+    - open: requests fail at once with CircuitOpenError for `cooldown` seconds, so
+      callers return their fallback data without waiting on the upstream timeout
+    - half-open: after the cooldown one worker takes a probe lease and tries the
+      domain; success closes the circuit, failure opens it again for twice as long
+      (up to `max_cooldown`)
+
+    An open circuit is also remembered in a per-process memory layer, so failing
+    fast never touches SQLite.
+    """
+
+    SUCCESS_STAMP_SECONDS = 60
+
+    def __init__(self, db_path="scraper_cache.db", threshold=5, window=60, cooldown=30,
+                 max_cooldown=600, probe_seconds=30):
+        self.db_path = db_path
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_seconds = probe_seconds
+        self._local = threading.local()
+        self._open_until = {}
+        self._short_circuited = {}
+        self.init_database()
+
+    def _conn(self):
+        """One connection per thread, opened lazily"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def init_database(self):
+        """Create the circuit table"""
+        self._conn().execute('''
+            CREATE TABLE IF NOT EXISTS circuit_breakers (
+                domain TEXT PRIMARY KEY,
+                state TEXT DEFAULT 'closed',
+                failures INTEGER DEFAULT 0,
+                first_failure_at REAL DEFAULT 0,
+                opened_until REAL DEFAULT 0,
+                cooldown REAL DEFAULT 0,
+                probe_until REAL DEFAULT 0,
+                last_error TEXT,
+                last_failure_at REAL,
+                last_success_at REAL
+            )
+        ''')
+
+    @staticmethod
+    def domain(url):
+        """'https://www.esbnyc.com/visit' -> 'www.esbnyc.com'"""
+        return urlsplit(url).netloc.lower()
+
+    def _reject(self, domain, opened_until):
+        self._open_until[domain] = opened_until
+        self._short_circuited[domain] = self._short_circuited.get(domain, 0) + 1
+        raise CircuitOpenError(f"Circuit open for {domain}; retrying in {max(opened_until - time.time(), 0):.0f}s")
+
+    def before(self, domain):
+        """Raise CircuitOpenError unless a request to `domain` may go out now"""
+        now = time.time()
+        if self._open_until.get(domain, 0) > now:
+            self._short_circuited[domain] = self._short_circuited.get(domain, 0) + 1
+            raise CircuitOpenError(f"Circuit open for {domain}")
+
+        conn = self._conn()
+        row = conn.execute(
+            'SELECT state, opened_until FROM circuit_breakers WHERE domain = ?', (domain,)
+        ).fetchone()
+        if not row or row[0] == 'closed':
+            return
+        if row[1] > now:
+            self._reject(domain, row[1])
+
+        # Cooldown over: only the worker holding the probe lease tries the domain
+        cursor = conn.execute('''
+            UPDATE circuit_breakers SET state = 'half-open', probe_until = ?
+            WHERE domain = ? AND state != 'closed' AND opened_until <= ? AND probe_until < ?
+        ''', (now + self.probe_seconds, domain, now, now))
+        if cursor.rowcount != 1:
+            self._reject(domain, now + 1)
+
+    def is_open(self, url):
+        """True while requests to the url's domain are being short-circuited"""
+        domain = self.domain(url)
+        if self._open_until.get(domain, 0) > time.time():
+            return True
+        row = self._conn().execute(
+            'SELECT state, opened_until FROM circuit_breakers WHERE domain = ?', (domain,)
+        ).fetchone()
+        return bool(row) and row[0] != 'closed' and row[1] > time.time()
+
+    def record_success(self, domain):
+        """
+        Close the circuit (a successful probe or ordinary request). A domain that is
+        already closed with no failures is only read, not written, so successes on a
+        healthy domain don't take the shared write lock; last_success_at is refreshed
+        at most every SUCCESS_STAMP_SECONDS.
+        """
+        self._open_until.pop(domain, None)
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(
+            'SELECT state, failures, last_success_at FROM circuit_breakers WHERE domain = ?', (domain,)
+        ).fetchone()
+        if row and row[0] == 'closed' and not row[1] and (row[2] or 0) > now - self.SUCCESS_STAMP_SECONDS:
+            return
+        conn.execute('''
+            INSERT INTO circuit_breakers (domain, state, last_success_at) VALUES (?, 'closed', ?)
+            ON CONFLICT(domain) DO UPDATE SET
+                state = 'closed', failures = 0, first_failure_at = 0, cooldown = 0,
+                opened_until = 0, probe_until = 0, last_success_at = excluded.last_success_at
+        ''', (domain, now))
+
+    def record_failure(self, domain, error):
+        """Count a failure; opens the circuit at the threshold or when a probe fails"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT state, failures, first_failure_at, cooldown FROM circuit_breakers WHERE domain = ?', (domain,)
+            ).fetchone()
+            state, failures, first_failure_at, cooldown = row or ('closed', 0, 0, 0)
+            if not failures or now - first_failure_at > self.window:
+                failures, first_failure_at = 0, now
+            failures += 1
+
+            opened_until = 0
+            if state == 'half-open':
+                cooldown = min(max(cooldown, self.cooldown) * 2, self.max_cooldown)
+            elif state == 'closed' and failures >= self.threshold:
+                cooldown = self.cooldown
+            else:
+                cooldown = None
+            if cooldown is not None:
+                state, opened_until = 'open', now + cooldown
+                print(f"🔌 Circuit for {domain} opened for {cooldown:.0f}s: {error}")
+
+            conn.execute('''
+                INSERT INTO circuit_breakers
+                (domain, state, failures, first_failure_at, opened_until, cooldown, probe_until, last_error, last_failure_at)
+                VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)
+                ON CONFLICT(domain) DO UPDATE SET
+                    state = excluded.state,
+                    failures = excluded.failures,
+                    first_failure_at = excluded.first_failure_at,
+                    opened_until = CASE WHEN excluded.opened_until > 0 THEN excluded.opened_until ELSE opened_until END,
+                    cooldown = CASE WHEN excluded.opened_until > 0 THEN excluded.cooldown ELSE cooldown END,
+                    probe_until = 0,
+                    last_error = excluded.last_error,
+                    last_failure_at = excluded.last_failure_at
+            ''', (domain, state, failures, first_failure_at, opened_until, cooldown or 0, str(error)[:200], now))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if opened_until:
+            self._open_until[domain] = opened_until
+
+    def call(self, fetch, url, *args, **kwargs):
+        """
+        `fetch(url, *args, **kwargs)` (e.g. requests.get) through the breaker for the
+        url's domain. Connection errors, timeouts, 5xx and 429 count as failures;
+        the response is returned either way.
+        """
+        domain = self.domain(url)
+        self.before(domain)
+        try:
+            response = fetch(url, *args, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.record_failure(domain, e)
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            self.record_failure(domain, f'HTTP {response.status_code}')
+        else:
+            self.record_success(domain)
+        return response
+
+    def get(self, url, **kwargs):
+        """Breaker-guarded requests.get"""
+        return self.call(requests.get, url, **kwargs)
+
+    def status(self):
+        """Every domain's circuit for status endpoints ('short_circuited' counts this worker's rejections)"""
+        now = time.time()
+        rows = self._conn().execute('''
+            SELECT domain, state, failures, opened_until, cooldown, last_error,
+                   last_failure_at, last_success_at
+            FROM circuit_breakers ORDER BY domain
+        ''').fetchall()
+        return {
+            row[0]: {
+                'state': 'half-open' if row[1] == 'open' and row[3] <= now else row[1],
+                'failures': row[2],
+                'retry_in': round(max(row[3] - now, 0), 1),
+                'cooldown': row[4],
+                'last_error': row[5],
+                'last_failure_at': row[6],
+                'last_success_at': row[7],
+                'short_circuited': self._short_circuited.get(row[0], 0)
+            }
+            for row in rows
+        }
+
+    def reset(self, domain=None):
+        """Close one domain's circuit, or every circuit"""
+        if domain:
+            self._open_until.pop(domain, None)
+            self._conn().execute('DELETE FROM circuit_breakers WHERE domain = ?', (domain,))
+        else:
+            self._open_until.clear()
+            self._conn().execute('DELETE FROM circuit_breakers')
+
+
+# Shared instance used by the scrapers
+circuit_breaker = CircuitBreaker(os.getenv('SCRAPER_CACHE_DB', os.path.join(PROJECT_ROOT, 'scraper_cache.db')))
@@ -0,0 +1,342 @@
+# breakfast_store.py - Latest-hours snapshots for the breakfast places, with a compact change history
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from scrapers.hours import hours_index
+from scrapers.sqlite_pool import db_pool
+
+DAY_ORDER = '''
+    CASE day
+        WHEN 'Monday' THEN 1
+        WHEN 'Tuesday' THEN 2
+        WHEN 'Wednesday' THEN 3
+        WHEN 'Thursday' THEN 4
+        WHEN 'Friday' THEN 5
+        WHEN 'Saturday' THEN 6
+        WHEN 'Sunday' THEN 7
+        ELSE 8
+    END
+'''
+
+
+class BreakfastHoursStore:
+    """
+    Stores each restaurant's hours as one snapshot instead of 7 new rows per scrape.
+
+    - breakfast_hours holds only the latest hours: one row per (restaurant, day)
+    - breakfast_snapshots holds each restaurant's content hash and version; a scrape
+      whose hash matches only updates checked_at
+    - breakfast_hours_history keeps one row per change (optional), pruned by compact()
+
+    Storage and read cost depend on the number of restaurants, not on traffic.
+    """
+
+    def __init__(self, db_path="breakfast_places.db", history=True, keep_versions=50, max_age_days=365):
+        self.db_path = db_path
+        self.history = history
+        self.keep_versions = keep_versions
+        self.max_age_days = max_age_days
+        self.init_database()
+
+    def _connect(self):
+        return db_pool.connect(self.db_path)
+
+    def init_database(self):
+        """Create the tables, compacting a legacy append-only breakfast_hours table first"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS breakfast_hours (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                restaurant TEXT,
+                location TEXT,
+                day TEXT,
+                open_time TEXT,
+                close_time TEXT,
+                hours_text TEXT,
+                scraped_at TIMESTAMP,
+                open_minute INTEGER,
+                close_minute INTEGER
+            )
+        ''')
+
+        # Databases created before the minute columns existed
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(breakfast_hours)')]
+        for column in ('open_minute', 'close_minute'):
+            if column not in columns:
+                cursor.execute(f'ALTER TABLE breakfast_hours ADD COLUMN {column} INTEGER')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS breakfast_snapshots (
+                restaurant TEXT PRIMARY KEY,
+                location TEXT,
+                content_hash TEXT,
+                version INTEGER,
+                changed_at TIMESTAMP,
+                checked_at TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS breakfast_hours_history (
+                restaurant TEXT,
+                version INTEGER,
+                content_hash TEXT,
+                location TEXT,
+                hours_json TEXT,
+                first_seen_at TIMESTAMP,
+                last_seen_at TIMESTAMP,
+                PRIMARY KEY (restaurant, version)
+            )
+        ''')
+
+        legacy = cursor.execute('''
+            SELECT COUNT(*) FROM (SELECT 1 FROM breakfast_hours GROUP BY restaurant, day HAVING COUNT(*) > 1)
+        ''').fetchone()[0]
+        if legacy:
+            self._compact_legacy_rows(cursor)
+
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_breakfast_hours_restaurant_day
+            ON breakfast_hours (restaurant, day)
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _compact_legacy_rows(self, cursor):
+        """
+        Fold the old one-row-per-day-per-scrape history into versioned snapshots, then
+        keep only the latest row per (restaurant, day)
+        """
+        before = cursor.execute('SELECT COUNT(*) FROM breakfast_hours').fetchone()[0]
+        scrapes = {}
+        for restaurant, location, day, hours_text, scraped_at in cursor.execute('''
+            SELECT restaurant, location, day, hours_text, scraped_at FROM breakfast_hours ORDER BY id
+        '''):
+            scrape = scrapes.setdefault((restaurant, scraped_at), {'location': location, 'hours': {}})
+            scrape['hours'][day] = hours_text
+
+        latest = {}
+        for (restaurant, scraped_at), scrape in sorted(scrapes.items(), key=lambda item: (item[0][0], item[0][1] or '')):
+            content_hash = self.content_hash(scrape['location'], scrape['hours'])
+            current = latest.get(restaurant)
+            if current and current['content_hash'] == content_hash:
+                current['last_seen_at'] = scraped_at
+                continue
+            if current and self.history:
+                self._touch_history(cursor, restaurant, current)
+            latest[restaurant] = {
+                'version': current['version'] + 1 if current else 1,
+                'content_hash': content_hash,
+                'location': scrape['location'],
+                'hours': scrape['hours'],
+                'first_seen_at': scraped_at,
+                'last_seen_at': scraped_at
+            }
+            if self.history:
+                self._insert_history(cursor, restaurant, latest[restaurant])
+
+        for restaurant, snapshot in latest.items():
+            if self.history:
+                self._touch_history(cursor, restaurant, snapshot)
+            cursor.execute('''
+                INSERT OR REPLACE INTO breakfast_snapshots
+                (restaurant, location, content_hash, version, changed_at, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (restaurant, snapshot['location'], snapshot['content_hash'], snapshot['version'],
+                  snapshot['first_seen_at'], snapshot['last_seen_at']))
+
+        cursor.execute('''
+            DELETE FROM breakfast_hours WHERE id NOT IN (
+                SELECT MAX(id) FROM breakfast_hours GROUP BY restaurant, day
+            )
+        ''')
+        # Legacy rows were written before the minute columns existed
+        missing = cursor.execute(
+            'SELECT id, day, hours_text FROM breakfast_hours WHERE open_minute IS NULL AND hours_text IS NOT NULL'
+        ).fetchall()
+        for row_id, day, hours_text in missing:
+            open_minute, close_minute = self.day_row(day, hours_text)[2:]
+            cursor.execute('UPDATE breakfast_hours SET open_minute = ?, close_minute = ? WHERE id = ?',
+                           (open_minute, close_minute, row_id))
+
+        after = cursor.execute('SELECT COUNT(*) FROM breakfast_hours').fetchone()[0]
+        print(f"🧹 Compacted breakfast_hours from {before} to {after} rows")
+
+    @staticmethod
+    def content_hash(location, hours):
+        payload = json.dumps({'location': location or '', 'hours': hours}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _insert_history(self, cursor, restaurant, snapshot):
+        cursor.execute('''
+            INSERT OR REPLACE INTO breakfast_hours_history
+            (restaurant, version, content_hash, location, hours_json, first_seen_at, last_seen_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (restaurant, snapshot['version'], snapshot['content_hash'], snapshot['location'],
+              json.dumps(snapshot['hours'], sort_keys=True), snapshot['first_seen_at'], snapshot['last_seen_at']))
+
+    def _touch_history(self, cursor, restaurant, snapshot):
+        cursor.execute(
+            'UPDATE breakfast_hours_history SET last_seen_at = ? WHERE restaurant = ? AND version = ?',
+            (snapshot['last_seen_at'], restaurant, snapshot['version'])
+        )
+
+    @staticmethod
+    def day_row(day, hours_text):
+        """(open_time, close_time, open_minute, close_minute) for one day's hours text"""
+        open_time = close_time = ''
+        if ' - ' in hours_text:
+            open_time, close_time = hours_text.split(' - ', 1)
+
+        # Minutes since midnight; a close past midnight is stored above 1440
+        schedule = hours_index.schedule({day: hours_text})
+        open_minute = close_minute = None
+        if schedule:
+            start, end = schedule.intervals[0]
+            open_minute = start % 1440
+            close_minute = open_minute + end - start
+        return open_time.strip(), close_time.strip(), open_minute, close_minute
+
+    def save(self, restaurant_data):
+        """
+        Store a scrape. Returns (version, changed): unchanged hours only bump
+        checked_at, changed hours replace the restaurant's rows and add a version.
+        """
+        restaurant = restaurant_data['restaurant']
+        location = restaurant_data.get('location', '')
+        hours = restaurant_data.get('hours', {})
+        scraped_at = restaurant_data.get('scraped_at', datetime.now().isoformat())
+        content_hash = self.content_hash(location, hours)
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            row = cursor.execute(
+                'SELECT content_hash, version FROM breakfast_snapshots WHERE restaurant = ?', (restaurant,)
+            ).fetchone()
+
+            if row and row[0] == content_hash:
+                cursor.execute('UPDATE breakfast_snapshots SET checked_at = ? WHERE restaurant = ?', (scraped_at, restaurant))
+                if self.history:
+                    self._touch_history(cursor, restaurant, {'version': row[1], 'last_seen_at': scraped_at})
+                conn.commit()
+                return row[1], False
+
+            version = row[1] + 1 if row else 1
+            cursor.execute('DELETE FROM breakfast_hours WHERE restaurant = ?', (restaurant,))
+            rows = []
+            for day, hours_text in hours.items():
+                open_time, close_time, open_minute, close_minute = self.day_row(day, hours_text)
+                rows.append((restaurant, location, day, open_time, close_time, hours_text, scraped_at, open_minute, close_minute))
+            cursor.executemany('''
+                INSERT INTO breakfast_hours
+                (restaurant, location, day, open_time, close_time, hours_text, scraped_at, open_minute, close_minute)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            cursor.execute('''
+                INSERT OR REPLACE INTO breakfast_snapshots
+                (restaurant, location, content_hash, version, changed_at, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (restaurant, location, content_hash, version, scraped_at, scraped_at))
+            if self.history:
+                self._insert_history(cursor, restaurant, {
+                    'version': version,
+                    'content_hash': content_hash,
+                    'location': location,
+                    'hours': hours,
+                    'first_seen_at': scraped_at,
+                    'last_seen_at': scraped_at
+                })
+            conn.commit()
+            return version, True
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def get_days(self, restaurant):
+        """The latest hours for a restaurant, one entry per day in week order"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT h.day, h.open_time, h.close_time, h.hours_text, h.scraped_at, h.open_minute, h.close_minute,
+                   s.version, s.checked_at
+            FROM breakfast_hours h LEFT JOIN breakfast_snapshots s ON s.restaurant = h.restaurant
+            WHERE h.restaurant = ?
+            ORDER BY {DAY_ORDER}
+        ''', (restaurant,))
+
+        days = []
+        for row in cursor.fetchall():
+            days.append({
+                'day': row[0],
+                'open_time': row[1],
+                'close_time': row[2],
+                'hours_text': row[3],
+                'scraped_at': row[4],
+                'open_minute': row[5],
+                'close_minute': row[6],
+                'version': row[7],
+                'checked_at': row[8]
+            })
+        conn.close()
+        return days
+
+    def get_history(self, restaurant, limit=20):
+        """Recorded versions of a restaurant's hours, newest first"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT version, location, hours_json, first_seen_at, last_seen_at
+            FROM breakfast_hours_history WHERE restaurant = ?
+            ORDER BY version DESC LIMIT ?
+        ''', (restaurant, limit))
+        versions = [{
+            'version': row[0],
+            'location': row[1],
+            'hours': json.loads(row[2]),
+            'first_seen_at': row[3],
+            'last_seen_at': row[4]
+        } for row in cursor.fetchall()]
+        conn.close()
+        return versions
+
+    def compact(self):
+        """
+        Retention job: drop history beyond the newest `keep_versions` per restaurant
+        or older than `max_age_days` (the current version is always kept), then
+        reclaim the space. Returns the number of history rows removed.
+        """
+        started = time.time()
+        cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat()
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            DELETE FROM breakfast_hours_history
+            WHERE version < (SELECT version FROM breakfast_snapshots s WHERE s.restaurant = breakfast_hours_history.restaurant)
+              AND (
+                  version <= (SELECT version FROM breakfast_snapshots s WHERE s.restaurant = breakfast_hours_history.restaurant) - ?
+                  OR last_seen_at < ?
+              )
+        ''', (max(self.keep_versions, 1), cutoff))
+        removed = cursor.rowcount
+        conn.commit()
+        if removed:
+            conn.execute('VACUUM')
+        conn.close()
+        print(f"🧹 Breakfast history compaction removed {removed} versions in {time.time() - started:.2f}s")
+        return removed
+
+
+# Shared instance for main.py and breakfast.py
+breakfast_store = BreakfastHoursStore(
+    history=os.getenv('BREAKFAST_HOURS_HISTORY', 'on') != 'off',
+    keep_versions=int(os.getenv('BREAKFAST_HOURS_KEEP_VERSIONS', 50)),
+    max_age_days=int(os.getenv('BREAKFAST_HOURS_MAX_AGE_DAYS', 365))
+)
@@ -0,0 +1,212 @@
+# cache.py - TTL cache for scraped data shared across gunicorn workers
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SharedCache:
+    """
+    SQLite-backed TTL cache shared by every worker process on the host.
+
+    - Fresh entries are served from a small per-process memory layer, then SQLite
+    - Stale entries are served immediately while one worker refreshes in the background
+    - A refresh lease stored in the row stops several workers fetching the same key at once
+    """
+
+    def __init__(self, db_path="scraper_cache.db", lease_seconds=30):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._memory = {}
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache-refresh')
+        self.init_database()
+
+    def _conn(self):
+        """One connection per thread, opened lazily"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def init_database(self):
+        """Create the cache table"""
+        self._conn().execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                fetched_at REAL DEFAULT 0,
+                expires_at REAL DEFAULT 0,
+                stale_until REAL DEFAULT 0,
+                refreshing_until REAL DEFAULT 0
+            )
+        ''')
+
+    def _read(self, key):
+        row = self._conn().execute(
+            'SELECT value, expires_at, stale_until FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if not row or row[0] is None:
+            return None
+        return row
+
+    def _acquire_lease(self, key, now):
+        """Try to become the only worker refreshing `key`; returns True on success"""
+        conn = self._conn()
+        conn.execute('INSERT OR IGNORE INTO cache_entries (key) VALUES (?)', (key,))
+        cursor = conn.execute(
+            'UPDATE cache_entries SET refreshing_until = ? WHERE key = ? AND refreshing_until < ?',
+            (now + self.lease_seconds, key, now)
+        )
+        return cursor.rowcount == 1
+
+    def set(self, key, value, ttl, stale_ttl=0):
+        """Store a value and release any refresh lease on it"""
+        now = time.time()
+        payload = json.dumps(value)
+        self._conn().execute('''
+            INSERT INTO cache_entries (key, value, fetched_at, expires_at, stale_until, refreshing_until)
+            VALUES (?, ?, ?, ?, ?, 0)
+            ON CONFLICT(key) DO UPDATE SET
+                value = excluded.value,
+                fetched_at = excluded.fetched_at,
+                expires_at = excluded.expires_at,
+                stale_until = excluded.stale_until,
+                refreshing_until = 0
+        ''', (key, payload, now, now + ttl, now + ttl + stale_ttl))
+        self._memory[key] = (now + ttl, payload)
+
+    def refresh(self, key, loader, ttl, stale_ttl=0):
+        """Call `loader()` now and store its result (used by background jobs)"""
+        try:
+            value = loader()
+        except Exception:
+            self._conn().execute('UPDATE cache_entries SET refreshing_until = 0 WHERE key = ?', (key,))
+            raise
+        self.set(key, value, ttl(value) if callable(ttl) else ttl, stale_ttl)
+        return value
+
+    def refresh_if_idle(self, key, loader, ttl, stale_ttl=0):
+        """
+        refresh() for scheduled jobs: takes the refresh lease first, so a job and a
+        request-path refresh never scrape the same key at once. Returns None without
+        loading while another worker holds the lease.
+        """
+        if not self._acquire_lease(key, time.time()):
+            print(f"⏭️ Skipping refresh of {key}: another worker is refreshing it")
+            return None
+        return self.refresh(key, loader, ttl, stale_ttl)
+
+    def _refresh_in_background(self, key, loader, ttl, stale_ttl):
+        def run():
+            try:
+                self.refresh(key, loader, ttl, stale_ttl)
+            except Exception as e:
+                print(f"⚠️ Background refresh of {key} failed: {e}")
+        self._refresher.submit(run)
+
+    def get(self, key, loader, ttl, stale_ttl=0):
+        """
+        Return the cached value for `key`, calling `loader()` only when needed.
+        `ttl` may be a number of seconds or a function of the loaded value.
+        """
+        now = time.time()
+
+        cached = self._memory.get(key)
+        if cached and cached[0] > now:
+            return json.loads(cached[1])
+
+        row = self._read(key)
+        if row:
+            payload, expires_at, stale_until = row
+            if expires_at > now:
+                self._memory[key] = (expires_at, payload)
+                return json.loads(payload)
+            if stale_until > now:
+                if self._acquire_lease(key, now):
+                    self._refresh_in_background(key, loader, ttl, stale_ttl)
+                return json.loads(payload)
+
+        # Missing or too stale: one worker fetches, the others wait for its result
+        if not self._acquire_lease(key, now):
+            deadline = now + self.lease_seconds
+            while time.time() < deadline:
+                time.sleep(0.1)
+                row = self._read(key)
+                if row and row[1] > time.time():
+                    return json.loads(row[0])
+        return self.refresh(key, loader, ttl, stale_ttl)
+
+    def get_many(self, keys):
+        """
+        {key: (value, fresh)} for each of `keys` that is stored and not past its stale
+        window, read with one query; never loads. Stale values come back with fresh=False.
+        """
+        now = time.time()
+        found = {}
+        missing = []
+        for key in keys:
+            cached = self._memory.get(key)
+            if cached and cached[0] > now:
+                found[key] = (json.loads(cached[1]), True)
+            else:
+                missing.append(key)
+        
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            rows = self._conn().execute(f'''
+                SELECT key, value, expires_at, stale_until FROM cache_entries
+                WHERE key IN ({','.join('?' * len(chunk))}) AND value IS NOT NULL
+            ''', chunk).fetchall()
+            for key, payload, expires_at, stale_until in rows:
+                if expires_at > now:
+                    self._memory[key] = (expires_at, payload)
+                    found[key] = (json.loads(payload), True)
+                elif stale_until > now:
+                    found[key] = (json.loads(payload), False)
+        return found
+
+    def run_in_background(self, key, fn):
+        """
+        Run `fn()` on the refresh pool unless another worker holds the refresh lease
+        on `key`; `fn` should store its result with refresh()/set(). Returns True if started.
+        """
+        if not self._acquire_lease(key, time.time()):
+            return False
+
+        def run():
+            try:
+                fn()
+            except Exception as e:
+                print(f"⚠️ Background refresh of {key} failed: {e}")
+            finally:
+                self._conn().execute('UPDATE cache_entries SET refreshing_until = 0 WHERE key = ?', (key,))
+        self._refresher.submit(run)
+        return True
+
+    def peek(self, key):
+        """The stored value for `key` however old, or None; never loads"""
+        row = self._read(key)
+        return json.loads(row[0]) if row else None
+
+    def invalidate(self, key):
+        """Drop a key so the next read fetches fresh data"""
+        self._memory.pop(key, None)
+        self._conn().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def clear(self):
+        """Drop every entry (this process's memory layer and the shared table)"""
+        self._memory.clear()
+        self._conn().execute('DELETE FROM cache_entries')
+
+
+# Project root, so every entry point shares one store whatever its working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Shared instance used by the scrapers; the path can be moved to a shared volume
+scrape_cache = SharedCache(os.getenv('SCRAPER_CACHE_DB', os.path.join(PROJECT_ROOT, 'scraper_cache.db')))
@@ -0,0 +1,130 @@
+# crawl.py - Rate-limited concurrent crawling for JSON APIs
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from scrapers.breaker import CircuitOpenError, circuit_breaker
+
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average with bursts of up to
+    `capacity`. acquire() blocks the calling thread until a token is free.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Crawler:
+    """
+    Runs many small API requests with at most `concurrency` in flight and at most
+    `rate` per second (the bucket is per process). Requests go through the domain's
+    circuit breaker; connection errors, timeouts, 429 and 5xx are retried with
+    exponential backoff (honouring Retry-After), and an open circuit stops the
+    crawl instead of queueing more doomed requests.
+    """
+
+    def __init__(self, rate, concurrency=8, retries=3, backoff=0.5, max_backoff=8, timeout=10):
+        self.bucket = TokenBucket(rate, capacity=max(concurrency, 1))
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        """Keep-alive session per thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * 2 ** attempt, self.max_backoff)
+
+    def get_json(self, url, params=None):
+        """
+        GET `url` and return its JSON body, or None for a 4xx other than 429.
+        Raises the last error once retries run out, or CircuitOpenError at once.
+        """
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            response = None
+            try:
+                response = circuit_breaker.call(self._session().get, url, params=params, timeout=self.timeout)
+                if response.status_code == 429 or response.status_code >= 500:
+                    response.raise_for_status()
+                if response.status_code >= 400:
+                    return None
+                return response.json()
+            except CircuitOpenError:
+                raise
+            except requests.exceptions.RequestException:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self._delay(attempt, response))
+
+    def crawl(self, items, work, batch_size=25, on_batch=None):
+        """
+        Call `work(item)` for every item concurrently and return the truthy results
+        in the order of `items`. Every `batch_size` results (and once at the end)
+        `on_batch(results)` is called from the calling thread, so persistence can
+        be batched. Items whose work raises are skipped; an open circuit cancels
+        the rest.
+        """
+        results = {}
+        batch = []
+        stats = {'done': 0, 'failed': 0, 'cancelled': 0}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='crawler') as executor:
+            futures = {executor.submit(work, item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                try:
+                    result = future.result()
+                except CircuitOpenError as e:
+                    if not stats['cancelled']:
+                        print(f"⚠️ Crawl stopped: {e}")
+                        stats['cancelled'] = sum(f.cancel() for f in futures)
+                    continue
+                except Exception as e:
+                    stats['failed'] += 1
+                    print(f"⚠️ Crawl item failed: {e}")
+                    continue
+                stats['done'] += 1
+                if result:
+                    results[futures[future]] = result
+                    batch.append(result)
+                if on_batch and len(batch) >= batch_size:
+                    on_batch(batch)
+                    batch = []
+
+        if on_batch and batch:
+            on_batch(batch)
+        print(f"🕷️ Crawled {len(items)} items: {stats['done']} done, {stats['failed']} failed, {stats['cancelled']} cancelled")
+        return [results[index] for index in sorted(results)]
@@ -0,0 +1,209 @@
+# extract.py - Declarative, targeted-subtree extraction of opening hours from scraped pages
+import html
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Shared, precompiled patterns
+TIME_RANGE = r'\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm]'
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style|noscript)\b.*?</\1\s*>', re.S | re.I)
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def strip_non_content(markup):
+    """Drop comments, scripts and styles, which html.parser never exposes as text"""
+    return _SCRIPT_STYLE_RE.sub('', _COMMENT_RE.sub('', markup))
+
+
+def page_text(markup, stripped=False):
+    """
+    Visible text of a page without building a parse tree: drop scripts, styles and
+    comments, strip tags and unescape entities. Used for whole-page regex scans.
+    """
+    markup = markup if stripped else strip_non_content(markup)
+    return html.unescape(_TAG_RE.sub('', markup))
+
+
+class Rule:
+    """
+    One extraction strategy. Elements are selected either by tag + own-string regex
+    (`text`), by tag + class regex (`class_`), or the whole page when neither is set.
+    Each element's text is optionally narrowed by `patterns` (first capture group),
+    checked by `accept`, trimmed to `max_len` and passed through `transform`.
+
+    Selection is done on the raw markup rather than a full parse tree: `text` rules
+    scan text-only elements with one precompiled regex, and `class_` rules parse
+    only from the first element whose class matches, keeping just the selected tags.
+    """
+
+    def __init__(self, tags=None, text=None, class_=None, patterns=(), accept=None,
+                 max_len=None, transform=None, limit=None):
+        self.tags = tags
+        self.text = re.compile(text, re.IGNORECASE) if isinstance(text, str) else text
+        self.class_ = re.compile(class_, re.IGNORECASE) if isinstance(class_, str) else class_
+        self.patterns = [re.compile(p) if isinstance(p, str) else p for p in patterns]
+        self.accept = accept
+        self.max_len = max_len
+        self.transform = transform
+        self.limit = limit
+        if tags:
+            names = '|'.join(map(re.escape, tags))
+            # <tag>text</tag> or <tag><child>text</child></tag>: elements that have a .string
+            self._leaf_re = re.compile(
+                rf'<({names})\b[^>]*>(?:<([a-z][\w-]*)\b[^>]*>([^<]*)</\2\s*>|([^<]*))</\1\s*>',
+                re.IGNORECASE
+            )
+            self._class_re = re.compile(rf'<(?:{names})\b[^>]*?\bclass\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+            self._strainer = SoupStrainer(tags, class_=self.class_)
+
+    @property
+    def needs_tree(self):
+        return self.text is not None or self.class_ is not None
+
+    def _candidate(self, text):
+        if self.patterns:
+            for pattern in self.patterns:
+                match = pattern.search(text)
+                if match:
+                    found = match.group(1).strip()
+                    if self.accept is None or self.accept(found):
+                        return found
+            return None
+        text = text.strip()
+        if text and (self.accept is None or self.accept(text)):
+            return text
+        return None
+
+    def _text_blocks(self, markup):
+        """Text of leaf elements whose string matches `text`, in document order"""
+        count = 0
+        for match in self._leaf_re.finditer(markup):
+            string = html.unescape(match.group(3) if match.group(2) else match.group(4))
+            if self.text.search(string):
+                yield string
+                count += 1
+                if self.limit and count >= self.limit:
+                    return
+
+    def _class_blocks(self, markup):
+        """Text of elements whose class matches `class_`, parsing from the first one on"""
+        first = next((m for m in self._class_re.finditer(markup) if self.class_.search(m.group(1))), None)
+        if first is None:
+            return []
+        soup = BeautifulSoup(markup[first.start():], 'html.parser', parse_only=self._strainer)
+        return (el.get_text() for el in soup.find_all(self.tags, class_=self.class_, limit=self.limit))
+
+    def apply(self, markup, text):
+        """Return the extracted string, or None if this rule finds nothing"""
+        if self.text is not None:
+            blocks = self._text_blocks(markup)
+        elif self.class_ is not None:
+            blocks = self._class_blocks(markup)
+        else:
+            blocks = [text]
+
+        for block in blocks:
+            found = self._candidate(block)
+            if found:
+                found = found[:self.max_len] if self.max_len else found
+                return self.transform(found) if self.transform else found
+        return None
+
+
+class HoursSpec:
+    """
+    Per-site extraction spec: a default value and rules in priority order (first hit
+    wins). Scripts, styles and comments are dropped once up front; the page is never
+    parsed into a full tree.
+    """
+
+    def __init__(self, name, default, rules, version=1):
+        self.name = name
+        self.default = default
+        self.rules = rules
+        # Part of the conditional-fetch key so stored results are re-extracted when a spec changes
+        self.fetch_name = f'{name}@v{version}'
+
+    def extract(self, markup):
+        """Run the rules over raw HTML and return the first match or the default"""
+        markup = strip_non_content(markup)
+        text = None
+        for rule in self.rules:
+            if not rule.needs_tree and text is None:
+                text = page_text(markup, stripped=True)
+            found = rule.apply(markup, text)
+            if found:
+                return found
+        return self.default
+
+    def __call__(self, response):
+        """Extractor for ConditionalFetcher.fetch"""
+        return self.extract(response.text)
+
+
+def _daily(found):
+    return found if 'daily' in found.lower() else f"Daily: {found}"
+
+
+HOURS_SPECS = {
+    # Museums
+    'met': HoursSpec('met', "Sun-Thu: 10:00 AM - 5:30 PM, Fri-Sat: 10:00 AM - 9:00 PM", [
+        Rule(['div', 'section'], class_=r'hour|time|schedule',
+             accept=lambda t: len(t) > 50 and ('AM' in t or 'PM' in t), max_len=200),
+        Rule(['p', 'div', 'span', 'li'], text=r'[Hh]ours?|[Oo]pen|[Cc]losed|10.*AM.*5.*PM',
+             accept=lambda t: '10' in t and ('AM' in t or 'am' in t) and ('PM' in t or 'pm' in t), max_len=200),
+    ]),
+    'icecream': HoursSpec('icecream', "Mon-Sun: 10:00 AM - 9:00 PM", [
+        Rule(['p', 'div', 'span'], text=r'[Oo]pen|[Hh]ours?|[Mm]on.*[Ss]un',
+             accept=lambda t: 'AM' in t or 'PM' in t, max_len=150),
+        Rule(patterns=[
+            rf'([A-Za-z]{{3,9}}[-\s]*{TIME_RANGE})',
+            rf'({TIME_RANGE})',
+            r'[Hh]ours?[:\s]*([^\n]{10,80})'
+        ]),
+    ]),
+    'ukrainian': HoursSpec('ukrainian', "Wed-Sun: 11:30 AM - 5:00 PM", [
+        Rule(['footer', 'div'], class_=r'footer|hours|visit', limit=1, max_len=100, patterns=[
+            r'[Hh]ours?[:\s]*([^\n]{10,100})',
+            r'[Oo]pen[:\s]*([^\n]{10,100})',
+            r'(\d{1,2}:\d{2}\s*[APap][Mm]\s*[-–]\s*\d{1,2}:\d{2}\s*[APap][Mm])'
+        ]),
+        Rule(max_len=100, patterns=[
+            r'[Hh]ours?[:\s]*([^\n]{10,100})',
+            r'[Oo]pen[:\s]*([^\n]{10,100})',
+            r'(\d{1,2}:\d{2}\s*[APap][Mm]\s*[-–]\s*\d{1,2}:\d{2}\s*[APap][Mm])'
+        ]),
+    ]),
+    'empire': HoursSpec('empire', "Daily: 8:00 AM - 2:00 AM", [
+        Rule(['div', 'section'], text=r'[Vv]isit|[Hh]ours?|[Oo]bservatory',
+             accept=lambda t: 'AM' in t or 'PM' in t, patterns=[
+                 rf'({TIME_RANGE})',
+                 r'[Hh]ours?[:\s]*([^\n]{10,80})',
+                 r'[Oo]pen[:\s]*([^\n]{10,80})'
+             ]),
+        Rule(accept=lambda t: 'AM' in t or 'PM' in t, transform=_daily, patterns=[
+            rf'({TIME_RANGE})',
+            r'[Hh]ours?[:\s]*([^\n]{10,80})',
+            r'[Oo]pen[:\s]*([^\n]{10,80})'
+        ]),
+    ]),
+
+    # Breakfast places
+    'jacks': HoursSpec('jacks', "Mon-Sun: 8:00 AM - 10:00 PM", [
+        Rule(['p', 'div', 'span', 'li'], text=r'[Hh]ours?|[Oo]pen|[Cc]losed|8.*AM.*10.*PM', max_len=150,
+             accept=lambda t: ('8' in t or '9' in t) and ('AM' in t or 'am' in t) and ('PM' in t or 'pm' in t)),
+    ]),
+    'shuka': HoursSpec('shuka', "Mon-Thu: 5:00 PM - 11:00 PM, Fri: 12:00 PM - 12:00 AM, Sat-Sun: 11:00 AM - 11:00 PM", [
+        Rule(['p', 'div', 'span', 'li'], text=r'[Hh]ours?|[Oo]pen|[Cc]losed|5.*PM.*11.*PM', max_len=150,
+             accept=lambda t: 'PM' in t or 'AM' in t),
+    ]),
+    'sarabeths': HoursSpec('sarabeths', "Mon-Fri: 8:00 AM - 10:00 PM, Sat-Sun: 9:00 AM - 11:00 PM", [
+        Rule(['p', 'div', 'span', 'li'], text=r'[Hh]ours?|[Oo]pen|[Cc]losed|8.*AM.*10.*PM', max_len=150,
+             accept=lambda t: ('8' in t or '9' in t) and ('AM' in t or 'am' in t)),
+    ]),
+    'bagel': HoursSpec('bagel', "Mon-Fri: 6:00 AM - 6:00 PM, Sat-Sun: 6:30 AM - 5:00 PM", [
+        Rule(['p', 'div', 'span', 'li'], text=r'[Hh]ours?|[Oo]pen|[Cc]losed|6.*AM.*6.*PM', max_len=150,
+             accept=lambda t: '6:' in t and ('AM' in t or 'am' in t)),
+    ]),
+}
@@ -0,0 +1,127 @@
+# fanout.py - Concurrent fan-out helpers shared by the scraper endpoints
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+
+# Bounded pool shared by every request so a burst of traffic can't spawn unlimited threads
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='scraper-fanout')
+# race() attempts get their own pool: a fan-out task that races URLs would otherwise wait
+# on attempts queued behind other fan-out tasks in the same pool, and a burst could
+# leave every worker blocked on work that can never start
+_race_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='scraper-race')
+
+
+def iter_fan_out(tasks, deadline):
+    """
+    Run each callable in `tasks` ({key: fn}) concurrently and yield (key, outcome)
+    as soon as each one finishes. Anything still running when `deadline` seconds
+    have passed is yielded last with timed_out=True.
+    """
+    started = time.monotonic()
+    timings = {}
+
+    def timed(key, fn):
+        timings[key] = time.monotonic()
+        try:
+            return fn()
+        finally:
+            timings[key] = time.monotonic() - timings[key]
+
+    futures = {_executor.submit(timed, key, fn): key for key, fn in tasks.items()}
+    pending = set(futures)
+
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            pending.discard(future)
+            key = futures[future]
+            outcome = {'result': None, 'error': None, 'timed_out': False,
+                       'latency_ms': round(timings.get(key, 0) * 1000, 1)}
+            try:
+                outcome['result'] = future.result()
+            except Exception as e:
+                outcome['error'] = str(e)[:100]
+            yield key, outcome
+    except FuturesTimeout:
+        pass
+
+    elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+    for future in pending:
+        # Cancel anything still queued; running scrapes finish on their own request timeout
+        future.cancel()
+        yield futures[future], {'result': None, 'error': None, 'timed_out': True, 'latency_ms': elapsed_ms}
+
+
+def fan_out(tasks, deadline):
+    """Run `tasks` concurrently and return {key: outcome} once all finish or the deadline passes"""
+    return dict(iter_fan_out(tasks, deadline))
+
+
+def race(candidates, attempt, deadline, hedge_delay=0):
+    """
+    Call `attempt(candidate, timeout)` for candidates in preference order and return
+    the first usable (truthy, non-raising) result, within `deadline` seconds in total.
+
+    The first candidate starts at once; each next one starts `hedge_delay` seconds
+    later, or as soon as every running attempt has failed (hedge_delay=0 races them
+    all together). Once there is a winner, queued attempts are cancelled and running
+    ones are ignored. Returns {'winner', 'result', 'elapsed_ms', 'attempts'}; winner
+    and result are None if nothing succeeded in time.
+    """
+    started = time.monotonic()
+    finished = queue.Queue()
+    futures = []
+    attempts = []
+    pending = 0
+    index = 0
+    next_launch = started
+
+    def run(candidate, launched):
+        try:
+            finished.put((candidate, launched, attempt(candidate, max(deadline - (launched - started), 0.1)), None))
+        except Exception as e:
+            finished.put((candidate, launched, None, e))
+
+    def outcome(winner=None, result=None):
+        for future in futures:
+            future.cancel()
+        return {
+            'winner': winner,
+            'result': result,
+            'elapsed_ms': round((time.monotonic() - started) * 1000, 1),
+            'attempts': attempts
+        }
+
+    while True:
+        now = time.monotonic()
+        remaining = deadline - (now - started)
+        if remaining <= 0:
+            break
+        if index < len(candidates) and (pending == 0 or now >= next_launch):
+            futures.append(_race_executor.submit(run, candidates[index], now))
+            index += 1
+            pending += 1
+            next_launch = now + hedge_delay
+            continue
+        if pending == 0:
+            break
+
+        wait = remaining if index >= len(candidates) else min(remaining, max(next_launch - now, 0))
+        try:
+            candidate, launched, result, error = finished.get(timeout=wait)
+        except queue.Empty:
+            continue
+        pending -= 1
+        attempts.append({
+            'candidate': candidate,
+            'ok': error is None and bool(result),
+            'error': str(error)[:100] if error else (None if result else 'no usable result'),
+            'latency_ms': round((time.monotonic() - launched) * 1000, 1)
+        })
+        if error is None and result:
+            return outcome(candidate, result)
+
+    for candidate in candidates[:index]:
+        if candidate not in [a['candidate'] for a in attempts]:
+            attempts.append({'candidate': candidate, 'ok': False, 'error': f'Timed out after {deadline:g}s',
+                             'latency_ms': None})
+    return outcome()
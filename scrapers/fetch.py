@@ -0,0 +1,117 @@
+# fetch.py - Conditional HTTP fetching that skips re-parsing unchanged pages
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+from scrapers.breaker import circuit_breaker
+from scrapers.cache import PROJECT_ROOT
+
+
+class ConditionalFetcher:
+    """
+    Fetches pages with If-None-Match / If-Modified-Since and remembers what was
+    extracted from each one. The extractor only runs when the server sends a new
+    body whose content hash differs from the last parse; a 304 or an identical
+    body returns the stored result without touching BeautifulSoup.
+    """
+
+    def __init__(self, db_path="scraper_cache.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        self.init_database()
+
+    def _conn(self):
+        """One connection per thread, opened lazily"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _session(self):
+        """Keep-alive session per thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def init_database(self):
+        """Create the validator table"""
+        self._conn().execute('''
+            CREATE TABLE IF NOT EXISTS http_validators (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                extracted TEXT,
+                fetched_at REAL,
+                parsed_at REAL
+            )
+        ''')
+
+    def fetch(self, url, extract, name=None, headers=None, timeout=10, raise_for_status=False):
+        """
+        GET `url` and return `extract(response)`, reusing the stored result when the
+        page has not changed. `name` distinguishes different extractors on one URL
+        (defaults to the extractor's `fetch_name`); the extracted value must be
+        JSON-serializable.
+        """
+        name = name or getattr(extract, 'fetch_name', 'default')
+        key = f'{name}:{url}'
+        conn = self._conn()
+        row = conn.execute(
+            'SELECT etag, last_modified, body_hash, extracted FROM http_validators WHERE key = ?', (key,)
+        ).fetchone()
+
+        request_headers = dict(headers or {})
+        if row and row[3] is not None:
+            if row[0]:
+                request_headers['If-None-Match'] = row[0]
+            if row[1]:
+                request_headers['If-Modified-Since'] = row[1]
+
+        # Fails fast with CircuitOpenError while the site's circuit is open
+        response = circuit_breaker.call(self._session().get, url, headers=request_headers, timeout=timeout)
+        now = time.time()
+
+        if response.status_code == 304 and row and row[3] is not None:
+            conn.execute('UPDATE http_validators SET fetched_at = ? WHERE key = ?', (now, key))
+            return json.loads(row[3])
+
+        if raise_for_status:
+            response.raise_for_status()
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        if row and row[2] == body_hash and row[3] is not None:
+            conn.execute(
+                'UPDATE http_validators SET etag = ?, last_modified = ?, fetched_at = ? WHERE key = ?',
+                (etag, last_modified, now, key)
+            )
+            return json.loads(row[3])
+
+        extracted = extract(response)
+        conn.execute('''
+            INSERT OR REPLACE INTO http_validators
+            (key, url, etag, last_modified, body_hash, extracted, fetched_at, parsed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (key, url, etag, last_modified, body_hash, json.dumps(extracted), now, now))
+        return extracted
+
+    def clear(self):
+        """Forget all validators so every page is fetched and parsed again"""
+        self._conn().execute('DELETE FROM http_validators')
+
+
+# Shared instance used by the scrapers
+conditional_fetcher = ConditionalFetcher(os.getenv('SCRAPER_CACHE_DB', os.path.join(PROJECT_ROOT, 'scraper_cache.db')))
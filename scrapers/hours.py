@@ -0,0 +1,299 @@
+# hours.py - Parse scraped opening-hours text into weekly schedules with fast "open now" queries
+import bisect
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+_DAY_PREFIXES = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+_DAY_GROUPS = {'daily': range(7), 'everyday': range(7), '7days': range(7), 'weekdays': range(5), 'weekends': range(5, 7)}
+
+_TIME = r'(?:noon|midnight|\d{1,2}(?::\d{2})?\s*(?:[ap]\.?\s?m\.?)?)'
+_TOKEN_RE = re.compile(
+    rf'(?P<range>{_TIME}\s*(?:-|–|—|to|until)\s*{_TIME})'
+    r'|(?P<day>\b(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?'
+    r'|\bdaily\b|\bevery\s*day\b|\b7 days\b|\bweekdays\b|\bweekends\b)'
+    r'|(?P<closed>\bclosed\b)',
+    re.IGNORECASE
+)
+_TIME_RE = re.compile(r'(noon|midnight)|(\d{1,2})(?::(\d{2}))?\s*(?:([ap])\.?\s?m\.?)?', re.IGNORECASE)
+_RANGE_SPLIT_RE = re.compile(r'\s*(?:-|–|—|\bto\b|\buntil\b)\s*', re.IGNORECASE)
+_DAY_RANGE_GAP = re.compile(r'\s*(?:-|–|—|to|through|thru)\s*', re.IGNORECASE)
+_DAY_LIST_GAP = re.compile(r'\s*(?:,|&|/|and)?\s*', re.IGNORECASE)
+
+
+def _parse_time(text):
+    """(minutes, has_meridiem, meridiem) for one side of a range, or None"""
+    match = _TIME_RE.fullmatch(text.strip())
+    if not match:
+        return None
+    if match.group(1):
+        return (12 * 60 if match.group(1).lower() == 'noon' else 0), True, None
+    hour, minute = int(match.group(2)), int(match.group(3) or 0)
+    if hour > 24 or minute > 59:
+        return None
+    meridiem = match.group(4).lower() if match.group(4) else None
+    if meridiem:
+        if hour > 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == 'p' else 0)
+    return hour * 60 + minute, meridiem is not None or match.group(3) is not None, meridiem
+
+
+def _parse_range(text):
+    """(open, close) minutes since midnight; close > open, past-midnight closes run over 1440"""
+    parts = _RANGE_SPLIT_RE.split(text.strip(), maxsplit=1)
+    if len(parts) != 2:
+        return None
+    start, end = _parse_time(parts[0]), _parse_time(parts[1])
+    if not start or not end or not end[1]:
+        return None  # e.g. "2024-2025": the close needs am/pm, noon/midnight or hh:mm
+    open_minutes, close_minutes = start[0], end[0]
+    if not start[1] and end[2]:
+        # "10-5 pm": borrow the close's meridiem unless that puts the open after the close
+        open_minutes = open_minutes % (12 * 60) + (12 * 60 if end[2] == 'p' else 0)
+        if open_minutes >= close_minutes:
+            open_minutes -= 12 * 60
+        open_minutes %= DAY_MINUTES
+    if close_minutes <= open_minutes:
+        close_minutes += DAY_MINUTES
+    return open_minutes, close_minutes
+
+
+def _day_index(token):
+    token = re.sub(r'[^a-z0-9]', '', token.lower())
+    if token in _DAY_GROUPS:
+        return list(_DAY_GROUPS[token])
+    return [_DAY_PREFIXES[token[:3]]]
+
+
+class WeeklySchedule:
+    """
+    A week of opening intervals in minutes since Monday 00:00. A minute-resolution
+    bitmap answers "open at T" in O(1); sorted interval starts answer "next opening".
+    Intervals may run past midnight (and past Sunday night into Monday).
+    """
+
+    def __init__(self, intervals):
+        self.intervals = self._merge(intervals)
+        self._open = bytearray(WEEK_MINUTES)
+        for start, end in self.intervals:
+            self._open[start:min(end, WEEK_MINUTES)] = b'\x01' * (min(end, WEEK_MINUTES) - start)
+            if end > WEEK_MINUTES:
+                self._open[:end - WEEK_MINUTES] = b'\x01' * (end - WEEK_MINUTES)
+        self._starts = [start for start, _ in self.intervals]
+
+    @staticmethod
+    def _merge(intervals):
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    @classmethod
+    def from_days(cls, days):
+        """Build from {weekday index: [(open, close), ...]} in minutes since that day's midnight"""
+        return cls([(day * DAY_MINUTES + start, day * DAY_MINUTES + end)
+                    for day, ranges in days.items() for start, end in ranges])
+
+    @staticmethod
+    def week_minute(when):
+        return when.weekday() * DAY_MINUTES + when.hour * 60 + when.minute
+
+    def is_open(self, when):
+        """True if open at datetime `when`"""
+        return bool(self._open[self.week_minute(when)])
+
+    def closes_at(self, when):
+        """When the current opening ends, or None if closed at `when`"""
+        minute = self.week_minute(when)
+        if not self._open[minute]:
+            return None
+        # Also look one week back for an interval running from Sunday night into Monday
+        for offset in (0, WEEK_MINUTES):
+            index = bisect.bisect_right(self._starts, minute + offset) - 1
+            if index >= 0 and self.intervals[index][0] <= minute + offset < self.intervals[index][1]:
+                return self._at(when, self.intervals[index][1] - minute - offset)
+        return None
+
+    def next_open(self, when):
+        """The next opening time strictly after `when`, or None if never open"""
+        if not self._starts:
+            return None
+        minute = self.week_minute(when)
+        index = bisect.bisect_right(self._starts, minute)
+        start = self._starts[index] if index < len(self._starts) else self._starts[0] + WEEK_MINUTES
+        return self._at(when, start - minute)
+
+    @staticmethod
+    def _at(when, minutes_ahead):
+        return (when + timedelta(minutes=minutes_ahead)).replace(second=0, microsecond=0)
+
+    def by_day(self):
+        """{'Monday': [['08:00', '22:00']], ...}, closes past midnight shown as e.g. '26:00'"""
+        days = {day: [] for day in DAYS}
+        for start, end in self.intervals:
+            day, offset = divmod(start, DAY_MINUTES)
+            close = offset + end - start
+            days[DAYS[day % 7]].append([f'{offset // 60:02d}:{offset % 60:02d}', f'{close // 60:02d}:{close % 60:02d}'])
+        return days
+
+
+def parse_hours(hours):
+    """
+    Parse scraped hours into a WeeklySchedule, or None if no time range is found.
+
+    Accepts free text such as 'Sun-Thu: 10:00 AM - 5:30 PM, Fri-Sat: 10:00 AM - 9:00 PM',
+    'Daily: 8:00 AM - 2:00 AM', 'Wednesday–Sunday 11:30 AM – 5:00 PM; closed Monday' or
+    'Closed Monday, Tue-Sun 10am-6pm',
+    and per-day dicts such as {'Monday': '8:00 AM - 10:00 PM', ...}. Ranges with no
+    day before them apply to every day.
+    """
+    if isinstance(hours, dict):
+        days = {}
+        for day, text in hours.items():
+            index = _day_index(day)[0]
+            days[index] = [r for r in (_parse_range(m.group('range')) for m in _TOKEN_RE.finditer(text or '')
+                                       if m.group('range')) if r]
+        schedule = WeeklySchedule.from_days(days)
+        return schedule if schedule.intervals else None
+
+    days = {}
+    closed = set()
+    # segment: where the last listed day (or day range) starts in group
+    group, group_used, group_end, closing, segment = [], False, 0, False, 0
+    for match in _TOKEN_RE.finditer(hours or ''):
+        gap = (hours or '')[group_end:match.start()]
+        if match.group('day'):
+            indexes = _day_index(match.group('day'))
+            if group and not group_used and len(indexes) == 1 and _DAY_RANGE_GAP.fullmatch(gap):
+                # "Sun-Thu": walk forward (wrapping) from the last day
+                day = group[-1]
+                while day != indexes[0]:
+                    day = (day + 1) % 7
+                    group.append(day)
+            elif group and not group_used and _DAY_LIST_GAP.fullmatch(gap):
+                segment = len(group)
+                group.extend(indexes)
+            else:
+                if closing and group and not group_used:
+                    closed.update(group)
+                    closing = False
+                group, group_used, segment = list(indexes), False, 0
+            group_end = match.end()
+        elif match.group('range'):
+            found = _parse_range(match.group('range'))
+            if closing and group and not group_used and segment:
+                # "Closed Monday, Tue-Sun 10am-6pm": the range belongs to the last listed
+                # days, the ones before them are the closed ones
+                closed.update(group[:segment])
+                group, closing = group[segment:], False
+            if found and not (closing and group and not group_used):
+                for day in (group or range(7)):
+                    days.setdefault(day, []).append(found)
+                group_used = True
+            closing = False
+            group_end = match.end()
+        else:
+            if group and not group_used and _DAY_LIST_GAP.fullmatch(gap.strip(':')):
+                closed.update(group)  # "Monday closed"
+                group_used = True
+            else:
+                closing = True
+            group_end = match.end()
+    if closing and group and not group_used:
+        closed.update(group)
+
+    for day in closed:
+        days.pop(day, None)
+    schedule = WeeklySchedule.from_days(days)
+    return schedule if schedule.intervals else None
+
+
+class HoursIndex:
+    """
+    Parsed schedules for every place, keyed by place key. Schedules are memoized on
+    the hours value, so a re-scraped but unchanged string is not parsed again and
+    per-request queries never parse at all.
+    """
+
+    def __init__(self, tz_name=None):
+        self.tz = None
+        if ZoneInfo is not None and tz_name:
+            try:
+                self.tz = ZoneInfo(tz_name)
+            except ZoneInfoNotFoundError:
+                print(f"⚠️ Unknown time zone {tz_name}; using server local time for opening hours")
+        self.places = {}
+        self._parsed = {}
+        self._lock = threading.Lock()
+
+    def now(self):
+        """Current local time where the places are (naive, like the scraped hours)"""
+        return datetime.now(self.tz).replace(tzinfo=None) if self.tz else datetime.now()
+
+    def local(self, when):
+        """Convert an aware datetime to the places' naive local time; naive ones are taken as local"""
+        if when.tzinfo is None:
+            return when
+        return when.astimezone(self.tz).replace(tzinfo=None) if self.tz else when.astimezone().replace(tzinfo=None)
+
+    def schedule(self, hours):
+        """Memoized parse_hours"""
+        memo_key = json.dumps(hours, sort_keys=True) if isinstance(hours, dict) else hours
+        if memo_key not in self._parsed:
+            with self._lock:
+                if len(self._parsed) > 1024:
+                    self._parsed.clear()
+                self._parsed[memo_key] = parse_hours(hours)
+        return self._parsed[memo_key]
+
+    def update(self, key, name, hours):
+        """Register or refresh a place's hours; returns its schedule (None if unparseable)"""
+        schedule = self.schedule(hours)
+        self.places[key] = {'name': name, 'schedule': schedule}
+        return schedule
+
+    def status(self, key, when=None):
+        """{'status': 'open'|'closed'|'unknown', 'open_now', 'closes_at', 'opens_at'} for a place"""
+        place = self.places.get(key)
+        schedule = place['schedule'] if place else None
+        if schedule is None:
+            return {'status': 'unknown', 'open_now': None, 'closes_at': None, 'opens_at': None}
+        when = when or self.now()
+        is_open = schedule.is_open(when)
+        closes_at = schedule.closes_at(when) if is_open else None
+        opens_at = schedule.next_open(when) if not is_open else None
+        return {
+            'status': 'open' if is_open else 'closed',
+            'open_now': is_open,
+            'closes_at': closes_at.isoformat() if closes_at else None,
+            'opens_at': opens_at.isoformat() if opens_at else None
+        }
+
+    def open_now(self, when=None):
+        """Keys and names of every place open at `when` (default: now)"""
+        when = when or self.now()
+        minute = WeeklySchedule.week_minute(when)
+        return [
+            {'key': key, 'name': place['name']}
+            for key, place in list(self.places.items())
+            if place['schedule'] is not None and place['schedule']._open[minute]
+        ]
+
+
+# Shared index for the NYC places the app scrapes
+hours_index = HoursIndex(os.getenv('PLACES_TZ', 'America/New_York'))
@@ -0,0 +1,147 @@
+# images.py - Fetch remote images once and serve content-addressed thumbnails
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from scrapers.breaker import circuit_breaker
+from scrapers.cache import PROJECT_ROOT
+
+
+class ImageStore:
+    """
+    Thumbnails of remote images (MET primaryImage files are often several MB) kept
+    on local disk.
+
+    Each source url is downloaded once; every size in SIZES is rendered from it with
+    Pillow on a small worker pool and written as `<digest[:2]>/<digest>-<size>.jpg`,
+    where digest is the SHA-256 of the source bytes. Files never change once written,
+    so they can be served with immutable cache headers and the digest as ETag; the
+    url -> digest map lives in SQLite so every worker finds existing thumbnails.
+    """
+
+    # Longest edge in pixels
+    SIZES = {'thumb': 160, 'card': 400, 'large': 1024}
+    QUALITY = 82
+    MAX_SOURCE_BYTES = 40 * 1024 * 1024
+
+    def __init__(self, root, db_path="scraper_cache.db", workers=4, timeout=30):
+        self.root = root
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnails')
+        self._pending = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self.init_database()
+
+    def _conn(self):
+        """One connection per thread, opened lazily"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def init_database(self):
+        """Create the url -> digest table"""
+        self._conn().execute('''
+            CREATE TABLE IF NOT EXISTS image_sources (
+                url TEXT PRIMARY KEY,
+                digest TEXT,
+                width INTEGER,
+                height INTEGER,
+                source_bytes INTEGER,
+                fetched_at REAL
+            )
+        ''')
+
+    def path(self, digest, size):
+        return os.path.join(self.root, digest[:2], f"{digest}-{size}.jpg")
+
+    def lookup(self, url):
+        """Digest of an already processed url, or None"""
+        row = self._conn().execute('SELECT digest FROM image_sources WHERE url = ?', (url,)).fetchone()
+        if row and all(os.path.exists(self.path(row[0], size)) for size in self.SIZES):
+            return row[0]
+        return None
+
+    def render(self, data, digest):
+        """Write every size of the image in `data`; returns the source (width, height)"""
+        with Image.open(io.BytesIO(data)) as image:
+            source_size = image.size
+            # Let the JPEG decoder scale down while decoding instead of inflating the full image
+            image.draft('RGB', (max(self.SIZES.values()),) * 2)
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            for size, edge in sorted(self.SIZES.items(), key=lambda item: -item[1]):
+                image.thumbnail((edge, edge), Image.LANCZOS)
+                path = self.path(digest, size)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write then rename so a concurrent reader never sees half a file
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                image.save(tmp_path, 'JPEG', quality=self.QUALITY, optimize=True, progressive=True)
+                os.replace(tmp_path, path)
+        return source_size
+
+    def process(self, url):
+        """Download `url` and render its thumbnails (a no-op if already done); returns the digest"""
+        digest = self.lookup(url)
+        if digest:
+            return digest
+
+        response = circuit_breaker.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.content
+        if len(data) > self.MAX_SOURCE_BYTES:
+            raise ValueError(f"Image too large ({len(data)} bytes): {url}")
+
+        digest = hashlib.sha256(data).hexdigest()
+        width, height = self.render(data, digest)
+        self._conn().execute('''
+            INSERT OR REPLACE INTO image_sources (url, digest, width, height, source_bytes, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (url, digest, width, height, len(data), time.time()))
+        print(f"🖼️ Thumbnails for {url[-60:]}: {len(data) // 1024} KB source")
+        return digest
+
+    def submit(self, url):
+        """Process `url` on the worker pool; concurrent calls for one url share a future"""
+        with self._lock:
+            future = self._pending.get(url)
+            if future is None:
+                future = self._pool.submit(self.process, url)
+                self._pending[url] = future
+                future.add_done_callback(lambda f, url=url: self._pending.pop(url, None))
+        return future
+
+    def get(self, url, size, timeout=None):
+        """(path, digest) of one thumbnail, processing the url first if needed"""
+        if size not in self.SIZES:
+            raise KeyError(size)
+        digest = self.lookup(url) or self.submit(url).result(timeout=timeout or self.timeout + 30)
+        return self.path(digest, size), digest
+
+    def prefetch(self, urls):
+        """Queue thumbnails for every url in the background (e.g. right after a scrape)"""
+        for url in urls:
+            if url and not self.lookup(url):
+                self.submit(url)
+
+    def stats(self):
+        row = self._conn().execute('SELECT COUNT(*), COALESCE(SUM(source_bytes), 0) FROM image_sources').fetchone()
+        return {'images': row[0], 'source_bytes': row[1], 'pending': len(self._pending)}
+
+
+# Shared instance; thumbnails live under instance/volumes unless MET_IMAGE_DIR moves them
+image_store = ImageStore(
+    os.getenv('MET_IMAGE_DIR', os.path.join(PROJECT_ROOT, 'instance', 'volumes', 'met_images')),
+    os.getenv('SCRAPER_CACHE_DB', os.path.join(PROJECT_ROOT, 'scraper_cache.db')),
+    workers=int(os.getenv('MET_IMAGE_WORKERS', 4))
+)
@@ -0,0 +1,312 @@
+# met_sync.py - Incremental, resumable sync of the MET fashion catalogue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from scrapers.breaker import CircuitOpenError
+
+
+class MetCollectionSync:
+    """
+    Keeps met_outfits in step with the MET collection at a cost proportional to
+    what is new or changed.
+
+    Every object id found by the scraper's searches is checkpointed in
+    met_sync_objects with its metadataDate and a status. A run:
+
+    1. discovers ids from the searches; unseen ids become 'pending', and so do
+       known ids the MET lists as changed since the last completed sync
+       (GET /objects?metadataDate=)
+    2. fetches pending ids in chunks through the scraper's rate-limited crawler,
+       saving each chunk and its checkpoints in one go
+
+    A run that dies (restart, deploy, crash) leaves its remaining ids 'pending',
+    so the next run simply carries on. Only one run is active across workers: a
+    run whose heartbeat is recent blocks a new one, and any worker can ask it to
+    stop after its current chunk.
+    """
+
+    CHUNK = 100
+    MAX_ATTEMPTS = 3
+    # A running run that hasn't reported progress for this long is treated as dead
+    STALE_SECONDS = 120
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.db_path = scraper.db_path
+        self.init_database()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def init_database(self):
+        """Create the checkpoint tables"""
+        conn = self._connect()
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS met_sync_objects (
+                object_id INTEGER PRIMARY KEY,
+                status TEXT DEFAULT 'pending',
+                metadata_date TEXT,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT,
+                discovered_at TEXT,
+                synced_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_met_sync_objects_status
+            ON met_sync_objects (status, object_id);
+            CREATE TABLE IF NOT EXISTS met_sync_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                status TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                heartbeat_at REAL,
+                since TEXT,
+                discovered INTEGER DEFAULT 0,
+                queued INTEGER DEFAULT 0,
+                fetched INTEGER DEFAULT 0,
+                missing INTEGER DEFAULT 0,
+                failed INTEGER DEFAULT 0,
+                error TEXT
+            );
+        ''')
+        conn.commit()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+
+    def _active_run(self, conn):
+        """The running run with a recent heartbeat, or None (stale runs are marked interrupted)"""
+        conn.execute('''
+            UPDATE met_sync_runs SET status = 'interrupted', finished_at = ?
+            WHERE status IN ('running', 'stopping') AND heartbeat_at < ?
+        ''', (datetime.now().isoformat(), time.time() - self.STALE_SECONDS))
+        return conn.execute("SELECT id FROM met_sync_runs WHERE status IN ('running', 'stopping')").fetchone()
+
+    def start(self, full=False):
+        """
+        Start a sync in a background thread. Returns (run_id, started); started is
+        False when another run is already active, whose id is returned instead.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        active = self._active_run(conn)
+        if active:
+            conn.commit()
+            conn.close()
+            return active[0], False
+
+        since = None if full else self._last_completed_date(conn)
+        run_id = conn.execute('''
+            INSERT INTO met_sync_runs (status, started_at, heartbeat_at, since)
+            VALUES ('running', ?, ?, ?)
+        ''', (datetime.now().isoformat(), time.time(), since)).lastrowid
+        conn.commit()
+        conn.close()
+
+        threading.Thread(target=self._run, args=(run_id, since, full), daemon=True,
+                         name=f'met-sync-{run_id}').start()
+        return run_id, True
+
+    def stop(self):
+        """Ask the active run (in any worker) to stop after its current chunk; returns its id or None"""
+        conn = self._connect()
+        active = self._active_run(conn)
+        if active:
+            conn.execute("UPDATE met_sync_runs SET status = 'stopping' WHERE id = ?", (active[0],))
+        conn.commit()
+        conn.close()
+        return active[0] if active else None
+
+    def _stop_requested(self, run_id):
+        conn = self._connect()
+        row = conn.execute('SELECT status FROM met_sync_runs WHERE id = ?', (run_id,)).fetchone()
+        conn.close()
+        return row is not None and row[0] != 'running'
+
+    def _last_completed_date(self, conn):
+        row = conn.execute('''
+            SELECT started_at FROM met_sync_runs WHERE status = 'done' ORDER BY id DESC LIMIT 1
+        ''').fetchone()
+        return row[0][:10] if row else None
+
+    def _update_run(self, run_id, **fields):
+        fields['heartbeat_at'] = time.time()
+        conn = self._connect()
+        conn.execute(
+            f"UPDATE met_sync_runs SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+            list(fields.values()) + [run_id]
+        )
+        conn.commit()
+        conn.close()
+
+    def _run(self, run_id, since, full):
+        try:
+            discovered, queued, changes_known = self.discover(since, full)
+            self._update_run(run_id, discovered=discovered, queued=queued)
+            print(f"🔄 MET sync {run_id}: {discovered} ids found, {queued} to fetch")
+
+            totals = {'fetched': 0, 'missing': 0, 'failed': 0}
+            stopped = False
+            while not stopped:
+                chunk = self.pending(self.CHUNK)
+                if not chunk:
+                    break
+                for name, count in self.fetch_chunk(chunk).items():
+                    totals[name] += count
+                self._update_run(run_id, **totals)
+                stopped = self._stop_requested(run_id)
+
+            # Without the change list this run may have missed updates, so the next
+            # run checks changes from the last complete run's date again
+            status = 'stopped' if stopped else ('done' if changes_known else 'incomplete')
+            self._update_run(run_id, status=status, finished_at=datetime.now().isoformat())
+            print(f"✅ MET sync {run_id} {status}: {totals['fetched']} fetched, {totals['failed']} failed")
+        except Exception as e:
+            # Circuit open or MET down: the checkpoints keep what is left for the next run
+            print(f"❌ MET sync {run_id} failed: {e}")
+            self._update_run(run_id, status='failed', finished_at=datetime.now().isoformat(), error=str(e)[:200])
+
+    # ------------------------------------------------------------------
+    # Discovery and fetching
+    # ------------------------------------------------------------------
+
+    def changed_since(self, since):
+        """Ids the MET reports as updated since `since` (YYYY-MM-DD); None if unknown"""
+        try:
+            data = self.scraper.crawler.get_json(f"{self.scraper.base_url}/objects", params={'metadataDate': since})
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ MET change list unavailable: {e}")
+            return None
+        return set((data or {}).get('objectIDs') or [])
+
+    def discover(self, since=None, full=False):
+        """
+        Queue unseen ids from the searches, plus known ids changed since `since`
+        (all known ids when `full`). Returns (ids discovered, ids now pending, whether
+        the change list was available).
+        """
+        ids = set()
+        for object_ids in self.scraper.crawler.crawl(self.scraper.SEARCH_TERMS, self.scraper.search_met):
+            ids.update(object_ids)
+        changed = self.changed_since(since) if since and not full else set()
+
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        conn.executemany('''
+            INSERT OR IGNORE INTO met_sync_objects (object_id, status, discovered_at) VALUES (?, 'pending', ?)
+        ''', [(object_id, now) for object_id in ids])
+
+        if full:
+            conn.execute("UPDATE met_sync_objects SET status = 'pending', attempts = 0 WHERE status != 'pending'")
+        elif changed:
+            known = {row[0] for row in conn.execute("SELECT object_id FROM met_sync_objects WHERE status != 'pending'")}
+            conn.executemany('''
+                UPDATE met_sync_objects SET status = 'pending', attempts = 0 WHERE object_id = ?
+            ''', [(object_id,) for object_id in known & changed])
+        # Failed ids get another round of attempts each run
+        conn.execute("UPDATE met_sync_objects SET status = 'pending', attempts = 0 WHERE status = 'failed'")
+
+        queued = conn.execute("SELECT COUNT(*) FROM met_sync_objects WHERE status = 'pending'").fetchone()[0]
+        conn.commit()
+        conn.close()
+        return len(ids), queued, changed is not None
+
+    def pending(self, limit):
+        conn = self._connect()
+        rows = conn.execute('''
+            SELECT object_id FROM met_sync_objects WHERE status = 'pending' ORDER BY object_id LIMIT ?
+        ''', (limit,)).fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+
+    def _fetch(self, object_id):
+        """(object_id, raw record or None, error)"""
+        try:
+            data = self.scraper.crawler.get_json(f"{self.scraper.base_url}/objects/{object_id}")
+            return object_id, data, None
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            return object_id, None, str(e)[:200]
+
+    def fetch_chunk(self, object_ids):
+        """Fetch and store one chunk of ids and checkpoint each of them; returns counts"""
+        results = self.scraper.crawler.crawl(object_ids, self._fetch)
+        if len(results) < len(object_ids):
+            # The circuit opened mid-chunk; what was fetched is still stored below
+            print(f"⚠️ MET sync chunk cut short ({len(results)}/{len(object_ids)})")
+
+        # save_many rather than save_batch: thumbnails stay lazy (rendered by /api/met/images
+        # on first request) instead of queueing a download of every image in the catalogue
+        outfits = [self.scraper.parse_object(object_id, data) for object_id, data, _ in results if data]
+        self.scraper.save_many([outfit for outfit in outfits if outfit.get('image_url')])
+
+        now = datetime.now().isoformat()
+        checkpoints = []
+        counts = {'fetched': 0, 'missing': 0, 'failed': 0}
+        for object_id, data, error in results:
+            if data:
+                checkpoints.append(('done', data.get('metadataDate'), None, now, object_id))
+                counts['fetched'] += 1
+            elif error:
+                checkpoints.append(('failed', None, error, None, object_id))
+                counts['failed'] += 1
+            else:
+                checkpoints.append(('missing', None, None, now, object_id))
+                counts['missing'] += 1
+
+        conn = self._connect()
+        conn.executemany('''
+            UPDATE met_sync_objects SET
+                status = CASE WHEN ?1 = 'failed' AND attempts + 1 < ?6 THEN 'pending' ELSE ?1 END,
+                metadata_date = COALESCE(?2, metadata_date),
+                last_error = ?3,
+                synced_at = COALESCE(?4, synced_at),
+                attempts = attempts + (?1 = 'failed')
+            WHERE object_id = ?5
+        ''', [checkpoint + (self.MAX_ATTEMPTS,) for checkpoint in checkpoints])
+        conn.commit()
+        conn.close()
+
+        if len(results) < len(object_ids):
+            raise CircuitOpenError("MET API unavailable")
+        return counts
+
+    # ------------------------------------------------------------------
+    # Progress
+    # ------------------------------------------------------------------
+
+    def status(self):
+        """Latest run with throughput and ETA, plus catalogue checkpoint counts"""
+        conn = self._connect()
+        self._active_run(conn)
+        conn.commit()
+        counts = dict(conn.execute('SELECT status, COUNT(*) FROM met_sync_objects GROUP BY status').fetchall())
+        row = conn.execute('''
+            SELECT id, status, started_at, finished_at, heartbeat_at, since, discovered, queued,
+                   fetched, missing, failed, error
+            FROM met_sync_runs ORDER BY id DESC LIMIT 1
+        ''').fetchone()
+        conn.close()
+
+        run = None
+        if row:
+            columns = ('id', 'status', 'started_at', 'finished_at', 'heartbeat_at', 'since', 'discovered',
+                       'queued', 'fetched', 'missing', 'failed', 'error')
+            run = dict(zip(columns, row))
+            end = datetime.fromisoformat(run['finished_at']) if run['finished_at'] else datetime.now()
+            elapsed = max((end - datetime.fromisoformat(run['started_at'])).total_seconds(), 0.001)
+            processed = run['fetched'] + run['missing'] + run['failed']
+            run['elapsed_seconds'] = round(elapsed, 1)
+            run['objects_per_second'] = round(processed / elapsed, 2)
+            run['remaining'] = counts.get('pending', 0)
+            run['eta_seconds'] = (round(run['remaining'] / run['objects_per_second'])
+                                  if run['status'] == 'running' and run['objects_per_second'] else None)
+        return {'run': run, 'objects': counts}
@@ -0,0 +1,228 @@
+# museums.py - Museum hours scraper shared by main.py, app.py and landmark.py
+import os
+from datetime import datetime
+
+from scrapers.extract import HOURS_SPECS
+from scrapers.fanout import iter_fan_out
+from scrapers.fetch import conditional_fetcher
+from scrapers.hours import hours_index
+from scrapers.registry import scrape_registry
+
+
+class MuseumScraper:
+    """Web scraper for museum hours with improved parsing"""
+    
+    # Overall time budget (seconds) for scraping every museum in /api/all
+    ALL_DEADLINE = float(os.getenv('MUSEUM_ALL_DEADLINE', 8))
+    
+    # Shared cache lifetimes (seconds): fresh, then served stale while one worker refreshes
+    CACHE_TTL = int(os.getenv('MUSEUM_CACHE_TTL', 30 * 60))
+    CACHE_STALE_TTL = int(os.getenv('MUSEUM_CACHE_STALE_TTL', 24 * 60 * 60))
+    FALLBACK_CACHE_TTL = 60
+    
+    # Known hours returned when a live scrape fails or misses the deadline
+    FALLBACKS = {
+        'met': {
+            'museum': 'MET Museum',
+            'hours': 'Sun-Thu: 10:00 AM - 5:30 PM, Fri-Sat: 10:00 AM - 9:00 PM',
+            'address': '1000 5th Ave, New York, NY 10028',
+            'phone': '(212) 535-7710'
+        },
+        'icecream': {
+            'museum': 'Museum of Ice Cream',
+            'hours': 'Mon-Sun: 10:00 AM - 9:00 PM',
+            'address': '558 Broadway, New York, NY 10012',
+            'phone': '(646) 459-3515'
+        },
+        'ukrainian': {
+            'museum': 'Ukrainian Museum',
+            'hours': 'Wed-Sun: 11:30 AM - 5:00 PM',
+            'address': '222 East 6th Street, New York, NY 10003',
+            'phone': '(212) 228-0110'
+        },
+        'empire': {
+            'museum': 'Empire State Building',
+            'hours': 'Daily: 8:00 AM - 2:00 AM',
+            'address': '20 W 34th St, New York, NY 10001',
+            'phone': '(212) 736-3100'
+        }
+    }
+    
+    def __init__(self):
+        # One registry source per museum, shared by every entry point
+        for key in self.scrapers():
+            scrape_registry.register(
+                f'museum:{key}',
+                lambda key=key: self.load_hours(key),
+                ttl=self.cache_ttl,
+                stale_ttl=self.CACHE_STALE_TTL,
+                refresh_interval=self.CACHE_TTL / 2
+            )
+    
+    def fallback_data(self, key, error):
+        """Build the fallback payload for a museum"""
+        data = dict(self.FALLBACKS[key])
+        data.update({
+            'last_updated': datetime.now().strftime("%I:%M %p"),
+            'error': str(error)[:100],
+            'source': 'fallback'
+        })
+        return data
+    
+    def scrape_met_museum(self):
+        """Scrape MET Museum hours"""
+        try:
+            url = "https://www.metmuseum.org/visit/plan-your-visit/metropolitan-museum-of-art"
+            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+            
+            hours = conditional_fetcher.fetch(url, HOURS_SPECS['met'], headers=headers, timeout=10)
+            
+            return {
+                'museum': 'MET Museum',
+                'hours': hours,
+                'address': '1000 5th Ave, New York, NY 10028',
+                'phone': '(212) 535-7710',
+                'last_updated': datetime.now().strftime("%I:%M %p"),
+                'source': 'metmuseum.org'
+            }
+            
+        except Exception as e:
+            return self.fallback_data('met', e)
+    
+    def scrape_ice_cream_museum(self):
+        """Scrape Museum of Ice Cream hours"""
+        try:
+            url = "https://www.museumoficecream.com/new-york"
+            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+            
+            hours = conditional_fetcher.fetch(url, HOURS_SPECS['icecream'], headers=headers, timeout=10)
+            
+            return {
+                'museum': 'Museum of Ice Cream',
+                'hours': hours,
+                'address': '558 Broadway, New York, NY 10012',
+                'phone': '(646) 459-3515',
+                'last_updated': datetime.now().strftime("%I:%M %p"),
+                'source': 'museumoficecream.com'
+            }
+            
+        except Exception as e:
+            return self.fallback_data('icecream', e)
+    
+    def scrape_ukrainian_museum(self):
+        """Scrape Ukrainian Museum hours"""
+        try:
+            url = "https://www.ukrainianmuseum.org/"
+            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+            
+            hours = conditional_fetcher.fetch(url, HOURS_SPECS['ukrainian'], headers=headers, timeout=10)
+            
+            return {
+                'museum': 'Ukrainian Museum',
+                'hours': hours,
+                'address': '222 East 6th Street, New York, NY 10003',
+                'phone': '(212) 228-0110',
+                'last_updated': datetime.now().strftime("%I:%M %p"),
+                'source': 'ukrainianmuseum.org'
+            }
+            
+        except Exception as e:
+            return self.fallback_data('ukrainian', e)
+    
+    def scrape_empire_state(self):
+        """Scrape Empire State Building hours"""
+        try:
+            url = "https://www.esbnyc.com/"
+            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+            
+            hours = conditional_fetcher.fetch(url, HOURS_SPECS['empire'], headers=headers, timeout=10)
+            
+            return {
+                'museum': 'Empire State Building',
+                'hours': hours,
+                'address': '20 W 34th St, New York, NY 10001',
+                'phone': '(212) 736-3100',
+                'last_updated': datetime.now().strftime("%I:%M %p"),
+                'source': 'esbnyc.com'
+            }
+            
+        except Exception as e:
+            return self.fallback_data('empire', e)
+
+    def scrapers(self):
+        """Map of museum key to its live scrape method"""
+        return {
+            'met': self.scrape_met_museum,
+            'icecream': self.scrape_ice_cream_museum,
+            'ukrainian': self.scrape_ukrainian_museum,
+            'empire': self.scrape_empire_state
+        }
+    
+    def cache_ttl(self, data):
+        """Keep fallback results briefly so a recovered site is picked up quickly"""
+        return self.FALLBACK_CACHE_TTL if data.get('source') == 'fallback' else self.CACHE_TTL
+    
+    def load_hours(self, key):
+        """Scrape a museum and attach its parsed weekly schedule (cache loader)"""
+        data = self.scrapers()[key]()
+        schedule = hours_index.schedule(data.get('hours'))
+        data['schedule'] = schedule.by_day() if schedule else None
+        return data
+    
+    def with_open_status(self, key, data):
+        """Copy of a snapshot with open/closed status for right now, from its parsed schedule"""
+        schedule = hours_index.update(f'museum:{key}', data.get('museum'), data.get('hours'))
+        data = dict(data)
+        data.update(hours_index.status(f'museum:{key}'))
+        if 'schedule' not in data:
+            data['schedule'] = schedule.by_day() if schedule else None
+        return data
+    
+    def get_hours(self, key):
+        """Get museum hours from the shared registry snapshot"""
+        return self.with_open_status(key, scrape_registry.get(f'museum:{key}'))
+    
+    def refresh_hours(self, key):
+        """Scrape a museum now and store the snapshot (scheduler job)"""
+        scrape_registry.refresh(f'museum:{key}')
+    
+    def iter_all(self, deadline=None):
+        """
+        Yield (key, data, latency_ms) for every museum as soon as each one finishes,
+        within an overall deadline. Sites that fail or miss the deadline yield their
+        fallback payload.
+        """
+        if not deadline or deadline <= 0:
+            deadline = self.ALL_DEADLINE
+        tasks = {key: (lambda key=key: self.get_hours(key)) for key in self.scrapers()}
+        
+        for key, outcome in iter_fan_out(tasks, deadline):
+            if outcome['timed_out']:
+                data = self.with_open_status(key, self.fallback_data(key, f'Timed out after {deadline:g}s'))
+            elif outcome['error']:
+                data = self.with_open_status(key, self.fallback_data(key, outcome['error']))
+            else:
+                data = outcome['result']
+            yield key, data, outcome['latency_ms']
+    
+    def scrape_all(self, deadline=None):
+        """
+        Get every museum concurrently within an overall deadline.
+        Sites that miss the deadline return their fallback payload.
+        """
+        if not deadline or deadline <= 0:
+            deadline = self.ALL_DEADLINE
+        
+        data = {}
+        latency = {}
+        for key, result, latency_ms in self.iter_all(deadline):
+            data[key] = result
+            latency[key] = latency_ms
+        
+        data['latency_ms'] = latency
+        data['deadline_s'] = deadline
+        return data
+
+
+# Shared instance; registers the museum:* sources
+museum_scraper = MuseumScraper()
@@ -0,0 +1,18 @@
+# prices.py - Parse scraped ticket price text into numbers
+import re
+
+_PRICE_RE = re.compile(r'\$\s*(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{1,2}))?')
+
+
+def parse_price_range(text):
+    """
+    'from $79.00 - $299.00' -> (79.0, 299.0). A single price gives (p, p); text with
+    no dollar amount gives (None, None).
+    """
+    prices = [
+        float(whole.replace(',', '') + '.' + (cents or '0'))
+        for whole, cents in _PRICE_RE.findall(text or '')
+    ]
+    if not prices:
+        return None, None
+    return min(prices), max(prices)
@@ -0,0 +1,59 @@
+# registry.py - One registry of scrape sources backed by the shared result store
+from scrapers.cache import scrape_cache
+
+
+class ScraperRegistry:
+    """
+    Named scrape sources ('museum:met', 'met:visit', ...) backed by one shared store.
+    main.py, app.py, landmark.py and the NY day service all read snapshots through
+    the registry, so a refresh in any process serves every entry point.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.sources = {}
+
+    def register(self, key, loader, ttl, stale_ttl=0, refresh_interval=None):
+        """
+        Add a source. `ttl` may be a callable of the loaded value; `refresh_interval`
+        (seconds between scheduled refreshes) defaults to half of a numeric `ttl`.
+        """
+        if refresh_interval is None:
+            refresh_interval = ttl / 2 if not callable(ttl) else 15 * 60
+        self.sources[key] = {
+            'loader': loader,
+            'ttl': ttl,
+            'stale_ttl': stale_ttl,
+            'refresh_interval': refresh_interval
+        }
+
+    def get(self, key):
+        """Latest snapshot for a source, loading it only if no process has one cached"""
+        source = self.sources[key]
+        return self.store.get(key, source['loader'], ttl=source['ttl'], stale_ttl=source['stale_ttl'])
+
+    def refresh(self, key):
+        """Load a source now and store the snapshot for every process"""
+        source = self.sources[key]
+        return self.store.refresh(key, source['loader'], ttl=source['ttl'], stale_ttl=source['stale_ttl'])
+
+    def refresh_if_idle(self, key):
+        """refresh() unless another worker is already refreshing the source; None if skipped"""
+        source = self.sources[key]
+        return self.store.refresh_if_idle(key, source['loader'], ttl=source['ttl'], stale_ttl=source['stale_ttl'])
+
+    def peek(self, key):
+        """Last stored snapshot for a source however old, or None; never scrapes"""
+        return self.store.peek(key)
+
+    def keys(self, prefix=''):
+        return [key for key in self.sources if key.startswith(prefix)]
+
+    def schedule(self, scheduler, prefix=''):
+        """Add a refresh job to `scheduler` for every source whose key starts with `prefix`"""
+        for key in self.keys(prefix):
+            scheduler.add_job(key, lambda key=key: self.refresh_if_idle(key), interval=self.sources[key]['refresh_interval'])
+
+
+# Shared registry for every entry point
+scrape_registry = ScraperRegistry(scrape_cache)
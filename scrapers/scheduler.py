@@ -0,0 +1,140 @@
+# scheduler.py - Background scrape scheduler with single-leader election across workers
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from scrapers.cache import PROJECT_ROOT
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, every process runs its own jobs
+    fcntl = None
+
+
+class ScrapeScheduler:
+    """
+    Runs registered scrape jobs on their own intervals (with jitter) in a daemon thread.
+
+    Every gunicorn worker starts a scheduler, but only the worker holding an exclusive
+    lock on `lock_path` runs jobs. If the leader exits the lock is released by the OS
+    and another worker takes over on its next tick. A relative `lock_path` is taken
+    from the project root, so entry points started from any directory share the lock.
+    """
+
+    def __init__(self, lock_path="scraper_scheduler.lock", tick=1.0, max_workers=4):
+        self.lock_path = os.path.join(PROJECT_ROOT, lock_path)
+        self.tick = tick
+        self.jobs = {}
+        self.is_leader = False
+        self._lock_file = None
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape-job')
+
+    def add_job(self, name, fn, interval, jitter=0.1, run_at_start=True):
+        """Register `fn` to run every `interval` seconds, +/- `jitter` (fraction of interval)"""
+        self.jobs[name] = {
+            'fn': fn,
+            'interval': interval,
+            'jitter': jitter,
+            'next_run': time.time() if run_at_start else self._next_time(interval, jitter),
+            'running': False,
+            'last_run': None,
+            'last_duration': None,
+            'last_error': None,
+            'runs': 0
+        }
+
+    def _next_time(self, interval, jitter):
+        return time.time() + interval * (1 + random.uniform(-jitter, jitter))
+
+    def _try_become_leader(self):
+        """Take the exclusive file lock without blocking"""
+        if fcntl is None:
+            return True
+        try:
+            if self._lock_file is None:
+                self._lock_file = open(self.lock_path, 'a+')
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self._lock_file.seek(0)
+            self._lock_file.truncate()
+            self._lock_file.write(str(os.getpid()))
+            self._lock_file.flush()
+            return True
+        except OSError:
+            return False
+
+    def _run_job(self, name, job):
+        started = time.time()
+        try:
+            job['fn']()
+            job['last_error'] = None
+        except Exception as e:
+            job['last_error'] = str(e)[:200]
+            print(f"⚠️ Scheduled job {name} failed: {e}")
+        finally:
+            job['last_run'] = datetime.now().isoformat()
+            job['last_duration'] = round(time.time() - started, 3)
+            job['runs'] += 1
+            job['next_run'] = self._next_time(job['interval'], job['jitter'])
+            job['running'] = False
+
+    def _loop(self):
+        last_attempt = 0
+        while True:
+            now = time.time()
+            if not self.is_leader and now - last_attempt >= 5:
+                last_attempt = now
+                self.is_leader = self._try_become_leader()
+                if self.is_leader:
+                    print(f"⏰ Scrape scheduler leader is pid {os.getpid()}")
+            if self.is_leader:
+                for name, job in self.jobs.items():
+                    if not job['running'] and job['next_run'] <= now:
+                        job['running'] = True
+                        self._executor.submit(self._run_job, name, job)
+            time.sleep(self.tick)
+
+    def start(self):
+        """Start the scheduler thread once per process"""
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            thread = threading.Thread(target=self._loop, name='scrape-scheduler', daemon=True)
+            thread.start()
+            self._started = True
+
+    def run_now(self, name):
+        """Run a job immediately in the calling thread"""
+        job = self.jobs[name]
+        job['running'] = True
+        self._run_job(name, job)
+
+    def status(self):
+        """Snapshot of scheduler state for status endpoints"""
+        return {
+            'pid': os.getpid(),
+            'is_leader': self.is_leader,
+            'started': self._started,
+            'jobs': {
+                name: {
+                    'interval': job['interval'],
+                    'running': job['running'],
+                    'runs': job['runs'],
+                    'last_run': job['last_run'],
+                    'last_duration': job['last_duration'],
+                    'last_error': job['last_error'],
+                    'next_run_in': round(max(job['next_run'] - time.time(), 0), 1)
+                }
+                for name, job in self.jobs.items()
+            }
+        }
+
+
+# Shared instance for the main app
+scrape_scheduler = ScrapeScheduler(os.getenv('SCRAPER_LEADER_LOCK', 'scraper_scheduler.lock'))
@@ -0,0 +1,108 @@
+# sqlite_pool.py - Per-thread pooled SQLite connections shared by the raw-sqlite managers
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    A connection owned by the pool. close() hands it back instead of closing it,
+    rolling back anything left uncommitted, so code written as connect / commit /
+    close keeps working unchanged while the connection (and its prepared statement
+    cache) outlives each call.
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+        pool, idle = getattr(self, '_pool', None), getattr(self, '_idle', None)
+        if idle is None or self in idle:
+            return
+        if len(idle) < pool.max_idle:
+            self.row_factory = None
+            idle.append(self)
+        else:
+            self.discard()
+
+    def discard(self):
+        """Really close the connection"""
+        self._idle = None
+        super().close()
+
+
+class SQLitePool:
+    """
+    Idle connections are kept per thread per database file, so a request reuses
+    the connection (and prepared statements) the last request on that thread
+    opened. Each connection is set up once with:
+
+    - WAL, so readers never block the writer and the writer never blocks readers
+    - busy_timeout, so a second writer waits for the lock instead of failing with
+      "database is locked"
+    - isolation_level IMMEDIATE, so the implicit transaction before an INSERT,
+      UPDATE or DELETE takes the write lock up front; a deferred transaction that
+      reads, then tries to write while another worker commits, fails at once
+    - synchronous=NORMAL (safe with WAL), a larger page cache, in-memory temp
+      tables, and a statement cache so repeated queries skip re-preparing
+
+    Nested connect() calls get separate connections, as sqlite3.connect() did.
+    """
+
+    PRAGMAS = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA cache_size=-16000',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA mmap_size=67108864',
+    )
+
+    def __init__(self, busy_timeout=15, cached_statements=256, max_idle=2):
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self.max_idle = max_idle
+        self._local = threading.local()
+
+    def _idle(self, db_path):
+        idle = getattr(self._local, 'idle', None)
+        if idle is None:
+            idle = self._local.idle = {}
+        return idle.setdefault(db_path, [])
+
+    def connect(self, db_path):
+        """A connection to `db_path` for this thread; close() returns it to the pool"""
+        idle = self._idle(db_path)
+        if idle:
+            return idle.pop()
+
+        conn = sqlite3.connect(db_path, timeout=self.busy_timeout, isolation_level='IMMEDIATE',
+                               cached_statements=self.cached_statements, factory=PooledConnection)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        conn._pool = self
+        conn._idle = idle
+        return conn
+
+    @contextmanager
+    def transaction(self, db_path):
+        """
+        BEGIN IMMEDIATE ... COMMIT on a pooled connection, rolled back if the block
+        raises. Don't nest transactions on one file: the inner one would wait on
+        the outer one's write lock.
+        """
+        conn = self.connect(db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def close_all(self):
+        """Close this thread's idle connections"""
+        for idle in getattr(self._local, 'idle', {}).values():
+            while idle:
+                idle.pop().discard()
+
+
+# Shared pool for main.py's managers and the scrapers that write through it
+db_pool = SQLitePool()
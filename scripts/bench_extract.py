@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+""" bench_extract.py
+Benchmarks opening-hours extraction for each scraped site: the original
+whole-document parse (BeautifulSoup tree + get_text() + uncompiled regex scans)
+versus the targeted HOURS_SPECS in scrapers/extract.py.
+
+Usage: Run from the root of the project:
+> scripts/bench_extract.py
+> scripts/bench_extract.py --pages path/to/pages --repeat 20
+
+Pages come from the recorded fixture corpus in testing/pages (see
+scripts/record_pages.py). Sites with no recording are benchmarked on the replay
+server's synthetic page of similar size and shape.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import warnings
+
+from bs4 import BeautifulSoup
+
+# Add the directory containing main.py to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrapers.extract import HOURS_SPECS
+from testing.replay_server import PAGES_DIR, load_corpus
+
+# The baseline below is the original code verbatim, including bs4's deprecated text= argument
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+
+# ----------------------------------------------------------------------------
+# Baseline: the extractors as they were before HOURS_SPECS
+# ----------------------------------------------------------------------------
+
+def legacy_met(markup):
+    """Find MET Museum hours in the page"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    hours = "Sun-Thu: 10:00 AM - 5:30 PM, Fri-Sat: 10:00 AM - 9:00 PM"
+    
+    # Look for hours in MET page with multiple strategies
+    hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
+                                 text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|10.*AM.*5.*PM', re.IGNORECASE))
+    
+    for section in hour_sections:
+        text = section.get_text().strip()
+        if '10' in text and ('AM' in text or 'am' in text) and ('PM' in text or 'pm' in text):
+            hours = text[:200]
+            break
+    
+    # Also check for structured hours data
+    hour_divs = soup.find_all(['div', 'section'], class_=re.compile(r'hour|time|schedule', re.IGNORECASE))
+    for div in hour_divs:
+        text = div.get_text().strip()
+        if len(text) > 50 and ('AM' in text or 'PM' in text):
+            hours = text[:200]
+            break
+    
+    return hours
+
+
+def legacy_icecream(markup):
+    """Find Museum of Ice Cream hours in the page"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    # Look for hours with multiple patterns
+    hours = "Mon-Sun: 10:00 AM - 9:00 PM"
+    all_text = soup.get_text()
+    
+    # Pattern 1: Direct hour patterns
+    hour_patterns = [
+        r'([A-Za-z]{3,9}[-\s]*\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm])',
+        r'(\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm])',
+        r'[Hh]ours?[:\s]*([^\n]{10,80})'
+    ]
+    
+    for pattern in hour_patterns:
+        match = re.search(pattern, all_text)
+        if match:
+            hours = match.group(1).strip()
+            break
+    
+    # Pattern 2: Look for opening hours sections
+    hour_sections = soup.find_all(['p', 'div', 'span'], 
+                                 text=re.compile(r'[Oo]pen|[Hh]ours?|[Mm]on.*[Ss]un', re.IGNORECASE))
+    for section in hour_sections:
+        text = section.get_text().strip()
+        if 'AM' in text or 'PM' in text:
+            hours = text[:150]
+            break
+    
+    return hours
+
+
+def legacy_ukrainian(markup):
+    """Find Ukrainian Museum hours in the page"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    hours = "Wed-Sun: 11:30 AM - 5:00 PM"
+    
+    # Multiple search strategies
+    patterns = [
+        r'[Hh]ours?[:\s]*([^\n]{10,100})',
+        r'[Oo]pen[:\s]*([^\n]{10,100})',
+        r'(\d{1,2}:\d{2}\s*[APap][Mm]\s*[-–]\s*\d{1,2}:\d{2}\s*[APap][Mm])'
+    ]
+    
+    all_text = soup.get_text()
+    for pattern in patterns:
+        match = re.search(pattern, all_text)
+        if match:
+            hours = match.group(1).strip()[:100]
+            break
+    
+    # Also search in footer or specific sections
+    footer = soup.find(['footer', 'div'], class_=re.compile(r'footer|hours|visit', re.IGNORECASE))
+    if footer:
+        footer_text = footer.get_text()
+        for pattern in patterns:
+            match = re.search(pattern, footer_text)
+            if match:
+                hours = match.group(1).strip()[:100]
+                break
+    
+    return hours
+
+
+def legacy_empire(markup):
+    """Find Empire State Building hours in the page"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    hours = "Daily: 8:00 AM - 2:00 AM"
+    
+    # Multiple search strategies
+    hour_text = soup.get_text()
+    
+    # Pattern 1: Direct time patterns
+    hour_patterns = [
+        r'(\d{1,2}(?::\d{2})?\s*[APap][Mm]\s*[-–]\s*\d{1,2}(?::\d{2})?\s*[APap][Mm])',
+        r'[Hh]ours?[:\s]*([^\n]{10,80})',
+        r'[Oo]pen[:\s]*([^\n]{10,80})'
+    ]
+    
+    for pattern in hour_patterns:
+        match = re.search(pattern, hour_text)
+        if match:
+            found = match.group(1).strip()
+            if 'AM' in found or 'PM' in found:
+                hours = f"Daily: {found}" if 'daily' not in found.lower() else found
+                break
+    
+    # Pattern 2: Look in specific sections
+    visit_sections = soup.find_all(['div', 'section'], 
+                                  text=re.compile(r'[Vv]isit|[Hh]ours?|[Oo]bservatory', re.IGNORECASE))
+    for section in visit_sections:
+        text = section.get_text()
+        for pattern in hour_patterns:
+            match = re.search(pattern, text)
+            if match:
+                found = match.group(1).strip()
+                if 'AM' in found or 'PM' in found:
+                    hours = found
+                    break
+    
+    return hours
+
+
+def legacy_jacks(markup):
+    """Find Jack's Wife Freda hours in the page"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    # Try to find hours - these selectors might need adjustment
+    hours = "Mon-Sun: 8:00 AM - 10:00 PM"
+    
+    # Search for hour patterns
+    hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
+                                 text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|8.*AM.*10.*PM', re.IGNORECASE))
+    
+    for section in hour_sections:
+        text = section.get_text().strip()
+        if ('8' in text or '9' in text) and ('AM' in text or 'am' in text) and ('PM' in text or 'pm' in text):
+            hours = text[:150]
+            break
+    
+    return hours
+
+
+def legacy_shuka(markup):
+    """Find Shuka hours in the page"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    hours = "Mon-Thu: 5:00 PM - 11:00 PM, Fri: 12:00 PM - 12:00 AM, Sat-Sun: 11:00 AM - 11:00 PM"
+    
+    hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
+                                 text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|5.*PM.*11.*PM', re.IGNORECASE))
+    
+    for section in hour_sections:
+        text = section.get_text().strip()
+        if 'PM' in text or 'AM' in text:
+            hours = text[:150]
+            break
+    
+    return hours
+
+
+def legacy_sarabeths(markup):
+    """Find Sarabeth's hours in the page"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    hours = "Mon-Fri: 8:00 AM - 10:00 PM, Sat-Sun: 9:00 AM - 11:00 PM"
+    
+    hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
+                                 text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|8.*AM.*10.*PM', re.IGNORECASE))
+    
+    for section in hour_sections:
+        text = section.get_text().strip()
+        if ('8' in text or '9' in text) and ('AM' in text or 'am' in text):
+            hours = text[:150]
+            break
+    
+    return hours
+
+
+def legacy_bagel(markup):
+    """Find Ess-a-Bagel hours in the page"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    
+    hours = "Mon-Fri: 6:00 AM - 6:00 PM, Sat-Sun: 6:30 AM - 5:00 PM"
+    
+    hour_sections = soup.find_all(['p', 'div', 'span', 'li'], 
+                                 text=re.compile(r'[Hh]ours?|[Oo]pen|[Cc]losed|6.*AM.*6.*PM', re.IGNORECASE))
+    
+    for section in hour_sections:
+        text = section.get_text().strip()
+        if '6:' in text and ('AM' in text or 'am' in text):
+            hours = text[:150]
+            break
+    
+    return hours
+
+
+LEGACY = {
+    'met': legacy_met,
+    'icecream': legacy_icecream,
+    'ukrainian': legacy_ukrainian,
+    'empire': legacy_empire,
+    'jacks': legacy_jacks,
+    'shuka': legacy_shuka,
+    'sarabeths': legacy_sarabeths,
+    'bagel': legacy_bagel
+}
+
+def time_it(fn, markup, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(markup)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hours extraction per site')
+    parser.add_argument('--pages', default=PAGES_DIR, help='fixture directory (see scripts/record_pages.py)')
+    parser.add_argument('--repeat', type=int, default=10, help='runs per site (best time is reported)')
+    args = parser.parse_args()
+
+    pages = {fixture['name']: fixture for fixture in load_corpus(args.pages).values()}
+    print(f"{'site':<10} {'page':<9} {'KB':>6} {'before ms':>10} {'after ms':>9} {'speedup':>8}  same result")
+    for site, spec in HOURS_SPECS.items():
+        markup = pages[site]['body'].decode('utf-8', errors='replace')
+        kind = 'synthetic' if pages[site]['synthetic'] else 'recorded'
+
+        before_ms, before = time_it(LEGACY[site], markup, args.repeat)
+        after_ms, after = time_it(spec.extract, markup, args.repeat)
+        print(f"{site:<10} {kind:<9} {len(markup) / 1024:>6.0f} {before_ms:>10.2f} {after_ms:>9.2f} "
+              f"{before_ms / after_ms:>7.1f}x  {'yes' if before == after else 'no: ' + repr(after)[:60]}")
+
+
+if __name__ == '__main__':
+    main()
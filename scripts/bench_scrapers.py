@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+""" bench_scrapers.py
+Offline benchmark suite for the scrapers, run against testing/replay_server.py:
+
+1. Per scraper: fetch, parse and persist time (median over --repeat cold runs) for
+   main.py (shared with app.py and landmark.py via scrapers/museums.py), breakfast.py
+   and scrapers/met_visit.py.
+2. End to end: latency of the scraper endpoints served by main.app at several
+   concurrency levels, starting each level with empty caches.
+
+Usage: Run from the root of the project:
+> scripts/bench_scrapers.py
+> scripts/bench_scrapers.py --latency 200 --jitter 50 --error-rate 0.1 --concurrency 1,8,32
+
+Databases and caches are written to a temporary directory, so the project's .db
+files are never touched.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Add the directory containing main.py to the Python path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+from testing.replay_server import PAGES_DIR, ReplayServer, install
+
+ENDPOINTS = ['/api/met', '/api/empire', '/api/all', '/api/breakfast', '/api/breakfast/jacks', '/api/broadway']
+
+
+class PhaseTimer:
+    """Accumulates wall time spent inside wrapped callables, per phase"""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+
+    def wrap(self, owner, attr, phase):
+        original = getattr(owner, attr)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.totals[phase] += time.perf_counter() - started
+
+        setattr(owner, attr, timed)
+
+    def reset(self):
+        self.totals.clear()
+
+
+def load_scrapers(timer):
+    """Import every scraper module and wrap its fetch/persist points; returns (label, fn) pairs"""
+    import main
+    import breakfast
+    from scrapers import met_visit
+
+    timer.wrap(requests.Session, 'request', 'fetch')
+    timer.wrap(main.BreakfastScraper, 'save_to_database', 'persist')
+    timer.wrap(main.BroadwayScraper, 'save_shows', 'persist')
+    timer.wrap(breakfast.BreakfastScraper, 'save_to_database', 'persist')
+    timer.wrap(met_visit, 'save_to_json', 'persist')
+
+    return [
+        ('MuseumScraper met', main.scraper.scrape_met_museum),
+        ('MuseumScraper icecream', main.scraper.scrape_ice_cream_museum),
+        ('MuseumScraper ukrainian', main.scraper.scrape_ukrainian_museum),
+        ('MuseumScraper empire', main.scraper.scrape_empire_state),
+        ('main BreakfastScraper jacks', main.breakfast_scraper.scrape_jacks_wife_freda),
+        ('main BreakfastScraper shuka', main.breakfast_scraper.scrape_shuka),
+        ('main BreakfastScraper sarabeths', main.breakfast_scraper.scrape_sarabeths),
+        ('main BreakfastScraper bagel', main.breakfast_scraper.scrape_ess_a_bagel),
+        ('main BroadwayScraper', main.broadway_scraper.scrape_broadway_availability),
+        ('breakfast.py jacks', breakfast.breakfast_scraper.scrape_jacks_wife_freda),
+        ('breakfast.py shuka', breakfast.breakfast_scraper.scrape_shuka),
+        ('breakfast.py sarabeths', breakfast.breakfast_scraper.scrape_sarabeths),
+        ('breakfast.py bagel', breakfast.breakfast_scraper.scrape_ess_a_bagel),
+        ('met_visit scrape_met_hours', met_visit.scrape_met_hours),
+    ]
+
+
+def reset_caches():
+    """Empty the shared result store and conditional-fetch validators"""
+    from scrapers.cache import scrape_cache
+    from scrapers.fetch import conditional_fetcher
+    scrape_cache.clear()
+    conditional_fetcher.clear()
+
+
+def quiet(fn, *args):
+    """Run fn with the scrapers' progress prints discarded"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        return fn(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def bench_scrapers(scrapers, timer, repeat):
+    print(f"\n{'scraper':<34} {'total ms':>9} {'fetch':>8} {'parse':>8} {'persist':>8}")
+    for label, fn in scrapers:
+        rows = []
+        for _ in range(repeat):
+            reset_caches()
+            timer.reset()
+            started = time.perf_counter()
+            quiet(fn)
+            total = time.perf_counter() - started
+            fetch, persist = timer.totals['fetch'], timer.totals['persist']
+            rows.append((total, fetch, max(total - fetch - persist, 0), persist))
+        total, fetch, parse, persist = (statistics.median(column) * 1000 for column in zip(*rows))
+        print(f"{label:<34} {total:>9.1f} {fetch:>8.1f} {parse:>8.1f} {persist:>8.1f}")
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def bench_endpoints(endpoints, levels, count):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import main
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, main.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    def hit(path):
+        started = time.perf_counter()
+        try:
+            ok = requests.get(base_url + path, timeout=60).status_code == 200
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    print(f"\n{'endpoint':<24} {'conc':>5} {'cold ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'req/s':>8} {'errors':>7}")
+    for path in endpoints:
+        for level in levels:
+            reset_caches()
+            cold, _ = quiet(hit, path)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                results = quiet(lambda: list(pool.map(lambda _: hit(path), range(count))))
+            elapsed = time.perf_counter() - started
+            latencies = [latency * 1000 for latency, _ in results]
+            errors = sum(1 for _, ok in results if not ok)
+            print(f"{path:<24} {level:>5} {cold * 1000:>9.1f} {percentile(latencies, 50):>8.1f} "
+                  f"{percentile(latencies, 95):>8.1f} {max(latencies):>8.1f} {count / elapsed:>8.1f} {errors:>7}")
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scrapers and scraper endpoints offline')
+    parser.add_argument('--pages', default=PAGES_DIR, help='fixture directory (see scripts/record_pages.py)')
+    parser.add_argument('--latency', type=float, default=50, help='replay latency per request (ms)')
+    parser.add_argument('--jitter', type=float, default=10, help='replay latency jitter (ms, +/-)')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of replayed requests answered 503')
+    parser.add_argument('--timeout-rate', type=float, default=0, help='fraction of replayed requests that hang')
+    parser.add_argument('--repeat', type=int, default=5, help='cold runs per scraper (median is reported)')
+    parser.add_argument('--concurrency', default='1,4,16', help='comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=50, help='requests per endpoint and level')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help='comma-separated endpoint paths')
+    parser.add_argument('--skip-endpoints', action='store_true', help='only run the per-scraper benchmark')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-scrapers-')
+    os.environ.setdefault('SCRAPER_SCHEDULER', 'off')
+    os.environ['SCRAPER_CACHE_DB'] = os.path.join(workdir, 'scraper_cache.db')
+    os.environ['SCRAPER_LEADER_LOCK'] = os.path.join(workdir, 'scraper_scheduler.lock')
+    os.chdir(workdir)
+
+    replay = ReplayServer(args.pages, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                          error_rate=args.error_rate, timeout_rate=args.timeout_rate, hang=20, seed=1)
+    install(replay.start())
+    synthetic = sorted(f['name'] for f in replay.corpus.values() if f['synthetic'])
+    print(f"🎬 Replaying {len(replay.corpus)} pages from {args.pages} on {replay.base_url} "
+          f"(latency {args.latency:.0f}±{args.jitter:.0f} ms, errors {args.error_rate:.0%}, timeouts {args.timeout_rate:.0%})")
+    if synthetic:
+        print(f"⚠️ No recording for {', '.join(synthetic)}; using synthetic pages")
+
+    timer = PhaseTimer()
+    scrapers = quiet(load_scrapers, timer)
+    bench_scrapers(scrapers, timer, args.repeat)
+    if not args.skip_endpoints:
+        levels = [int(level) for level in args.concurrency.split(',')]
+        bench_endpoints(args.endpoints.split(','), levels, args.requests)
+    replay.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+""" record_pages.py
+Records every page our scrapers fetch into the fixture corpus (testing/pages) used
+by testing/replay_server.py and the benchmarks, so they can run without network.
+
+Usage: Run from the root of the project:
+> scripts/record_pages.py
+> scripts/record_pages.py met empire      # re-record only these targets
+
+Each target is saved as <name>.html and indexed in manifest.json with its URL,
+status, content type, size and recording time. Failed fetches keep the previous
+recording.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+import requests
+
+# Add the directory containing main.py to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from testing.replay_server import MANIFEST, PAGES_DIR, TARGETS
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5'
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record scraper target pages for offline replay')
+    parser.add_argument('names', nargs='*', help=f"targets to record (default: all of {', '.join(TARGETS)})")
+    parser.add_argument('--pages', default=PAGES_DIR, help='fixture directory')
+    args = parser.parse_args()
+
+    unknown = set(args.names) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+
+    os.makedirs(args.pages, exist_ok=True)
+    manifest_path = os.path.join(args.pages, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    for name in args.names or TARGETS:
+        url = TARGETS[name]
+        try:
+            response = requests.get(url, headers=HEADERS, timeout=20)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"❌ {name}: {e}")
+            continue
+
+        filename = f'{name}.html'
+        with open(os.path.join(args.pages, filename), 'wb') as f:
+            f.write(response.content)
+        manifest[name] = {
+            'url': url,
+            'file': filename,
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type', 'text/html; charset=utf-8'),
+            'bytes': len(response.content),
+            'recorded_at': datetime.now().isoformat()
+        }
+        print(f"✅ {name}: {len(response.content) / 1024:.0f} KB")
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"💾 Manifest written to {manifest_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+""" replay_server.py
+Local HTTP stand-in for the sites our scrapers hit. Pages recorded with
+scripts/record_pages.py are served from testing/pages/, with configurable latency,
+error and timeout injection, so scrapers can be measured and tested offline.
+
+Requests are addressed as http://<replay>/<host>/<path>; install() rewrites the
+scrapers' real https:// URLs to that form in-process.
+
+Usage: Run from the root of the project:
+> testing/replay_server.py --port 8765 --latency 200 --error-rate 0.1
+
+Targets with no recording are served a synthetic page of similar size and shape,
+marked with an X-Replay-Synthetic: 1 response header.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+MANIFEST = 'manifest.json'
+
+# Every page a scraper fetches, by fixture name
+TARGETS = {
+    # scrapers/museums.py MuseumScraper, scrapers.extract.HOURS_SPECS keys
+    'met': 'https://www.metmuseum.org/visit/plan-your-visit/metropolitan-museum-of-art',
+    'icecream': 'https://www.museumoficecream.com/new-york',
+    'ukrainian': 'https://www.ukrainianmuseum.org/',
+    'empire': 'https://www.esbnyc.com/',
+    # main.py / breakfast.py BreakfastScraper
+    'jacks': 'https://jackswifefreda.com/',
+    'shuka': 'https://www.shukanewyork.com/',
+    'sarabeths': 'https://sarabethsrestaurants.com/',
+    'bagel': 'https://www.ess-a-bagel.com/',
+    # main.py BroadwayScraper (query strings are ignored when matching)
+    'broadway-tickets': 'https://www.broadway.com/shows/tickets/',
+    'broadway-shows': 'https://www.broadway.com/shows/',
+    'broadway-home': 'https://www.broadway.com/',
+    'broadway-find-by-date': 'https://www.broadway.com/shows/find-by-date/',
+    # scrapers/met_visit.py
+    'met-visit': 'https://www.metmuseum.org/visit',
+    'met-exhibitions': 'https://www.metmuseum.org/exhibitions',
+}
+
+SYNTHETIC_CONTENT = {
+    'met': '<div class="visit-hours-schedule">Open today: Sunday–Thursday 10:00 AM – 5:00 PM; Friday and Saturday 10:00 AM – 9:00 PM</div>',
+    'icecream': '<p>Open Mon-Sun 10:00 AM - 9:00 PM</p>',
+    'ukrainian': '<footer class="site-footer"><p>Hours: Wednesday–Sunday 11:30 AM – 5:00 PM</p></footer>',
+    'empire': '<section>Observatory hours 8:00 AM - 2:00 AM</section>',
+    'jacks': '<li>Hours 8:30 AM - 10:00 PM</li>',
+    'shuka': '<span>Open 5:00 PM - 11:00 PM</span>',
+    'sarabeths': '<p>Hours: 8:00 AM - 10:00 PM</p>',
+    'bagel': '<p>Open daily 6:00 AM - 6:00 PM</p>',
+    'met-visit': '<div class="hours"><h2>Hours</h2><p>Sunday–Tuesday and Thursday: 10 am–5 pm</p>'
+                 '<p>Friday and Saturday: 10 am–9 pm</p><p>Closed Wednesday</p></div>'
+                 '<div class="admission"><h2>Admission</h2><p>Adults $30</p><p>Seniors $22</p><p>Students $17</p></div>',
+}
+
+_SHOWS = ["Hamilton", "The Lion King", "Wicked", "Hadestown", "Moulin Rouge", "Six", "Chicago", "Aladdin"]
+
+
+def synthetic_page(name, cards=400):
+    """Build a page shaped like a typical marketing site: nav, scripts, card grid, footer"""
+    parts = ['<html><head><title>Visit</title>']
+    parts += ['<script>window.__DATA__ = {"k": "%s"};</script>' % ('x' * 2000) for _ in range(5)]
+    parts.append('<style>.card{display:flex}</style></head><body><nav><ul>')
+    parts += [f'<li><a href="/page/{i}">Section {i}</a></li>' for i in range(60)]
+    parts.append('</ul></nav><main>')
+    if name.startswith('broadway'):
+        for i, show in enumerate(_SHOWS):
+            parts.append(
+                f'<div class="show-card"><h3 class="show-title">{show}</h3>'
+                f'<span class="price">from ${79 + i * 10}.00 - ${249 + i * 10}.00</span></div>'
+            )
+    for i in range(cards):
+        parts.append(
+            f'<div class="card card-{i}"><div class="card-body"><h3>Exhibit {i}</h3>'
+            f'<p>Discover item {i} in our collection of art &amp; design.</p>'
+            f'<a class="btn" href="/exhibits/{i}">Learn more</a></div></div>'
+        )
+    parts.append(SYNTHETIC_CONTENT.get(name, ''))
+    parts.append('</main></body></html>')
+    return ''.join(parts)
+
+
+def load_corpus(pages_dir=PAGES_DIR):
+    """
+    Map (host, path) -> fixture for every target: the recorded page when there is one,
+    otherwise a synthetic page. Each fixture has name, url, body, content_type, synthetic.
+    """
+    manifest = {}
+    manifest_path = os.path.join(pages_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    corpus = {}
+    for name, url in TARGETS.items():
+        entry = manifest.get(name, {})
+        path = os.path.join(pages_dir, entry.get('file', f'{name}.html'))
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                body = f.read()
+            synthetic = False
+        else:
+            body = synthetic_page(name).encode('utf-8')
+            synthetic = True
+        parts = urlsplit(url)
+        corpus[(parts.netloc, parts.path or '/')] = {
+            'name': name,
+            'url': url,
+            'body': body,
+            'etag': '"%s"' % hashlib.sha256(body).hexdigest()[:16],
+            'content_type': entry.get('content_type', 'text/html; charset=utf-8'),
+            'synthetic': synthetic
+        }
+    return corpus
+
+
+class ReplayServer:
+    """
+    Threaded HTTP server replaying the corpus. Each request first waits `latency`
+    (+/- `jitter`) seconds; then a fraction `error_rate` get a 503 and a fraction
+    `timeout_rate` hang for `hang` seconds before answering. ETags are honoured.
+    """
+
+    def __init__(self, pages_dir=PAGES_DIR, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, timeout_rate=0.0, hang=30.0, seed=None):
+        self.corpus = load_corpus(pages_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang = hang
+        self.random = random.Random(seed)
+        self.hits = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def handle(self, handler):
+        """Serve one request addressed as /<host>/<path>"""
+        host, _, path = handler.path.lstrip('/').partition('/')
+        fixture = self.corpus.get((host, '/' + path.split('?', 1)[0]))
+        with self._lock:
+            roll = self.random.random()
+            delay = max(self.latency + self.random.uniform(-self.jitter, self.jitter), 0)
+            key = fixture['name'] if fixture else 'unknown'
+            self.hits[key] = self.hits.get(key, 0) + 1
+
+        time.sleep(delay)
+        if fixture is None:
+            return self._send(handler, 404, b'Not recorded', 'text/plain')
+        if roll < self.error_rate:
+            return self._send(handler, 503, b'Injected error', 'text/plain')
+        if roll < self.error_rate + self.timeout_rate:
+            time.sleep(self.hang)
+
+        headers = {'ETag': fixture['etag'], 'X-Replay-Synthetic': '1' if fixture['synthetic'] else '0'}
+        if handler.headers.get('If-None-Match') == fixture['etag']:
+            return self._send(handler, 304, b'', None, headers)
+        return self._send(handler, 200, fixture['body'], fixture['content_type'], headers)
+
+    def _send(self, handler, status, body, content_type, headers=None):
+        try:
+            handler.send_response(status)
+            if content_type:
+                handler.send_header('Content-Type', content_type)
+            handler.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            handler.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (timeout injection)
+
+    def start(self):
+        """Serve in a daemon thread and return the base URL"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def install(base_url):
+    """
+    Route every outgoing `requests` call for a non-local host to the replay server,
+    e.g. https://www.esbnyc.com/ -> <base_url>/www.esbnyc.com/. Returns an uninstall function.
+    """
+    original = requests.Session.request
+
+    def request(self, method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        if parts.hostname not in (None, 'localhost', '127.0.0.1') and not url.startswith(base_url):
+            url = f"{base_url}/{parts.netloc}{parts.path or '/'}" + (f'?{parts.query}' if parts.query else '')
+        return original(self, method, url, *args, **kwargs)
+
+    requests.Session.request = request
+
+    def uninstall():
+        requests.Session.request = original
+
+    return uninstall
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded scraper pages over HTTP')
+    parser.add_argument('--pages', default=PAGES_DIR, help='fixture directory')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0, help='added latency per request (ms)')
+    parser.add_argument('--jitter', type=float, default=0, help='latency jitter (ms, +/-)')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests answered 503')
+    parser.add_argument('--timeout-rate', type=float, default=0, help='fraction of requests that hang')
+    parser.add_argument('--hang', type=float, default=30, help='seconds a hanging request waits')
+    args = parser.parse_args()
+
+    server = ReplayServer(args.pages, port=args.port, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                          error_rate=args.error_rate, timeout_rate=args.timeout_rate, hang=args.hang)
+    for fixture in server.corpus.values():
+        kind = 'synthetic' if fixture['synthetic'] else 'recorded'
+        print(f"  {fixture['name']:<22} {kind:<9} {server.base_url}/{urlsplit(fixture['url']).netloc}{urlsplit(fixture['url']).path}")
+    print(f"🚀 Replaying {len(server.corpus)} pages on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()